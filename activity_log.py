@@ -0,0 +1,169 @@
+import os
+import atexit
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+import numpy as np
+from dotenv import load_dotenv
+
+from db import get_db
+
+load_dotenv()
+
+ACTIVITY_FLUSH_SECONDS = float(os.getenv('ACTIVITY_FLUSH_SECONDS', '1'))
+ACTIVITY_BATCH_SIZE = int(os.getenv('ACTIVITY_BATCH_SIZE', '200'))
+ACTIVITY_QUEUE_SIZE = int(os.getenv('ACTIVITY_QUEUE_SIZE', '10000'))
+# What record() does when the queue is full: 'drop' the new event, or 'block' the caller
+# for up to ACTIVITY_BLOCK_SECONDS waiting for a flush and drop it only if there is still no room
+ACTIVITY_QUEUE_POLICY = os.getenv('ACTIVITY_QUEUE_POLICY', 'drop')
+ACTIVITY_BLOCK_SECONDS = float(os.getenv('ACTIVITY_BLOCK_SECONDS', '2'))
+# Recent flushes kept for the latency percentiles in stats()
+ACTIVITY_LATENCY_WINDOW = 200
+
+QUEUE_POLICIES = ('drop', 'block')
+
+
+class ActivityLogWriter:
+    """
+    Write-behind buffer for the 'activity_logs' collection.
+    record() only appends to a bounded in-memory queue; a background thread writes the queue
+    with insert_many once it holds batch_size events or every flush_seconds, whichever comes first.
+    """
+    def __init__(self, flush_seconds=ACTIVITY_FLUSH_SECONDS, batch_size=ACTIVITY_BATCH_SIZE,
+                 max_queue=ACTIVITY_QUEUE_SIZE, policy=ACTIVITY_QUEUE_POLICY, block_seconds=ACTIVITY_BLOCK_SECONDS):
+        if policy not in QUEUE_POLICIES:
+            print(f"[WARNING] Unknown ACTIVITY_QUEUE_POLICY '{policy}', using 'drop'")
+            policy = 'drop'
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.policy = policy
+        self.block_seconds = block_seconds
+        self._queue = deque()
+        self._changed = threading.Condition()
+        self._flush_lock = threading.Lock()  # One insert_many at a time keeps batches in order
+        self._thread = None
+        self._closed = False
+        self._pending_users = Counter()  # Queued events per str(user_id)
+        self._latencies = deque(maxlen=ACTIVITY_LATENCY_WINDOW)
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_at = None
+
+    def record(self, doc):
+        """Queue one activity document. Returns False if it was dropped because the queue is full."""
+        return self.record_many([doc]) == 1
+
+    def record_many(self, docs):
+        """Queue several activity documents; returns how many were accepted"""
+        accepted = 0
+        with self._changed:
+            if self._closed:
+                self.dropped += len(docs)
+                print(f"[WARNING] Activity log writer closed, dropped {len(docs)} event(s)")
+                return 0
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+                self._thread.start()
+            for doc in docs:
+                if len(self._queue) >= self.max_queue and self.policy == 'block' and not self._closed:
+                    self._changed.notify_all()
+                    self._changed.wait_for(lambda: len(self._queue) < self.max_queue, self.block_seconds)
+                if len(self._queue) >= self.max_queue:
+                    self.dropped += 1
+                    continue
+                self._queue.append(doc)
+                self._pending_users[str(doc.get('user_id'))] += 1
+                accepted += 1
+            self.enqueued += accepted
+            if len(self._queue) >= self.batch_size:
+                self._changed.notify_all()
+        if accepted < len(docs):
+            print(f"[WARNING] Activity log queue full, dropped {len(docs) - accepted} event(s)")
+        return accepted
+
+    def _run(self):
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: len(self._queue) >= self.batch_size or self._closed,
+                                       self.flush_seconds)
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self, user_id=None):
+        """
+        Write queued events to MongoDB; returns how many were written.
+        With user_id, stops after the batch holding that user's last queued event.
+        """
+        with self._flush_lock:
+            written = 0
+            while True:
+                with self._changed:
+                    if user_id is not None and not self._pending_users[str(user_id)]:
+                        return written
+                    docs = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                    for doc in docs:
+                        key = str(doc.get('user_id'))
+                        self._pending_users[key] -= 1
+                        if not self._pending_users[key]:
+                            del self._pending_users[key]
+                    # Wake callers blocked on a full queue
+                    self._changed.notify_all()
+                if not docs:
+                    return written
+                db = get_db()
+                if db is None:
+                    self.failed += len(docs)
+                    print(f"[ERROR] Failed to write {len(docs)} activity log event(s): Database not connected")
+                    continue
+                started = time.monotonic()
+                try:
+                    db.activity_logs.insert_many(docs, ordered=False)
+                    self.written += len(docs)
+                    written += len(docs)
+                except Exception as e:
+                    self.failed += len(docs)
+                    print(f"[ERROR] Failed to write {len(docs)} activity log event(s): {e}")
+                self._latencies.append((time.monotonic() - started) * 1000)
+                self.flushes += 1
+                self.last_flush_at = datetime.utcnow()
+
+    def close(self):
+        """Stop the writer thread and write whatever is still queued"""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        self.flush()
+
+    def stats(self):
+        with self._changed:
+            depth = len(self._queue)
+        latencies = list(self._latencies)
+        if latencies:
+            p50, p95 = np.percentile(latencies, [50, 95])
+            flush_latency = {'p50': round(float(p50), 1), 'p95': round(float(p95), 1),
+                             'max': round(max(latencies), 1)}
+        else:
+            flush_latency = {'p50': None, 'p95': None, 'max': None}
+        return {
+            'queue_depth': depth,
+            'max_queue': self.max_queue,
+            'policy': self.policy,
+            'batch_size': self.batch_size,
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'flushes': self.flushes,
+            'flush_latency_ms': flush_latency,
+            'last_flush_at': self.last_flush_at.isoformat() if self.last_flush_at else None
+        }
+
+
+activity_log_writer = ActivityLogWriter()
+atexit.register(activity_log_writer.close)
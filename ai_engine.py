@@ -1,30 +1,117 @@
 import os
 import json
-import requests
-import urllib.parse
 import random
-from groq import Groq
+import itertools
+import time
+import asyncio
+import functools
+import hashlib
+import textwrap
+import threading
+import httpx
+import numpy as np
+from groq import AsyncGroq, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
 
+from cache import generation_cache, make_cache_key
+from streaming import JsonSectionScanner
+from image_store import get_image_store, image_url_for
+from image_cache import image_cache, image_pool, normalize_image_prompt, IMAGE_POOL_ENABLED
+from http_client import async_provider_http, HTTP_ASYNC_MAX_CONNECTIONS
+from singleflight import single_flight
+from circuit_breaker import huggingface_breaker, CircuitOpenError
+from provider_router import ProviderRouter, GroqBackend, PollinationsBackend, LLMReply, parse_backend_spec
+from template_tier import render_campaign, render_pitch
+from usage import llm_usage, SUCCESS, PARTIAL, PARSE_ERROR, FALLBACK
+from output_parser import (parse_json_object, validate_sections, get_section, CAMPAIGN_SCHEMA, CAMPAIGN_ANALYSIS_SCHEMA,
+                           CAMPAIGN_PLATFORM_SCHEMA, PITCH_SCHEMA, PITCH_VARIANTS_SCHEMA, LEAD_SCORE_SCHEMA,
+                           LEAD_BATCH_SCHEMA, SOCIAL_POST_SCHEMA)
+
 load_dotenv()
 
 # Pollinations AI is used as a free alternative to OpenAI
-POLLINATIONS_TEXT_URL = "https://text.pollinations.ai/"
 POLLINATIONS_IMAGE_URL = "https://image.pollinations.ai/prompt/"
 HF_IMAGE_MODEL = "https://api-inference.huggingface.co/models/runwayml/stable-diffusion-v1-5"
 HF_API_KEY = os.getenv('HUGGING_FACE_API_KEY')
 
-# Initialize Groq client safely
+# Per-call read timeout (seconds) for image generation; connect timeouts and
+# retries come from the shared provider HTTP layer (http_client.py)
+HF_IMAGE_TIMEOUT = float(os.getenv('HF_IMAGE_TIMEOUT', '60'))
+
+# The connection pool scans every connection on each request, so the async connections
+# (HTTP_ASYNC_MAX_CONNECTIONS in total) are split across several smaller clients used in turn
+GROQ_ASYNC_CLIENTS = int(os.getenv('GROQ_ASYNC_CLIENTS', '8'))
+
+# Initialize the async Groq clients safely; every generator, streaming included, uses them through the router
 try:
-    client = Groq(api_key=os.getenv('GROQ_API_KEY'))
+    _connections_per_client = max(1, HTTP_ASYNC_MAX_CONNECTIONS // GROQ_ASYNC_CLIENTS)
+    async_clients = [
+        AsyncGroq(
+            api_key=os.getenv('GROQ_API_KEY'),
+            http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(
+                max_connections=_connections_per_client, max_keepalive_connections=_connections_per_client
+            ))
+        )
+        for _ in range(GROQ_ASYNC_CLIENTS)
+    ]
     MODEL = os.getenv('GROQ_MODEL', 'llama-3.1-70b-versatile')
     GROQ_AVAILABLE = True
 except Exception as e:
     print(f"[WARNING] Groq initialization error: {e}")
-    client = None
+    async_clients = []
     MODEL = None
     GROQ_AVAILABLE = False
 
+# Generators whose LLM calls go through the provider router. LLM_BACKENDS lists the default
+# backends (e.g. "groq:llama-3.1-70b-versatile,groq:llama-3.1-8b-instant,pollinations:openai");
+# LLM_BACKENDS_<GENERATOR> overrides it for one generator
+ROUTED_GENERATORS = ('campaign', 'campaign_analysis', 'campaign_platform', 'campaign_section', 'pitch', 'pitch_section',
+                     'pitch_variants', 'pitch_translation', 'lead', 'lead_batch', 'social_post')
+# Social posts fail over from the openai model to the service's default model, as the GET text API used to
+DEFAULT_GENERATOR_BACKENDS = {'social_post': 'pollinations:openai,pollinations:'}
+
+
+def _build_router():
+    """Build the provider router from LLM_BACKENDS (default: the Groq model) and per-generator overrides"""
+    backends = {}
+
+    def resolve(spec):
+        resolved = []
+        for provider, model in parse_backend_spec(spec):
+            key = f"{provider}/{model}"
+            if key not in backends:
+                if provider == 'groq':
+                    if not GROQ_AVAILABLE:
+                        continue
+                    backends[key] = GroqBackend(model or MODEL, async_clients)
+                elif provider == 'pollinations':
+                    backends[key] = PollinationsBackend(model or None)
+                else:
+                    print(f"[WARNING] Unknown LLM backend '{provider}' ignored")
+                    continue
+            resolved.append(backends[key])
+        return resolved
+
+    routes = {'*': resolve(os.getenv('LLM_BACKENDS') or f"groq:{MODEL}")}
+    for generator in ROUTED_GENERATORS:
+        spec = os.getenv(f'LLM_BACKENDS_{generator.upper()}', DEFAULT_GENERATOR_BACKENDS.get(generator))
+        if spec:
+            # Follow-up requests for missing sections use the generator's own backends
+            routes[generator] = routes[f"{generator}_sections"] = resolve(spec)
+    return ProviderRouter(routes)
+
+
+router = _build_router()
+
+
+def router_status():
+    """Routes, latency percentiles and hedging counters of the provider router"""
+    return router.status()
+
+# Batch lead scoring: leads packed into one prompt, and prompts in flight at once
+LEAD_BATCH_SIZE = int(os.getenv('LEAD_BATCH_SIZE', '8'))
+LEAD_BATCH_CONCURRENCY = int(os.getenv('LEAD_BATCH_CONCURRENCY', '4'))
+
 # Industry tone mappings for dynamic adaptation
 INDUSTRY_TONES = {
     'SaaS': 'professional, data-driven, growth-focused, technical',
@@ -34,15 +121,179 @@ INDUSTRY_TONES = {
     'FinTech': 'secure, compliant, ROI-focused, sophisticated'
 }
 
-def generate_campaign(product_desc, audience, platform, industry):
+# Provider I/O for the generators runs on one engine event loop per process, so a single
+# worker can keep hundreds of LLM calls in flight. Async callers (asgi.py) await the a*
+# coroutines; the sync functions are thin wrappers that run them on the loop and wait.
+_engine_loop = None
+_engine_loop_lock = threading.Lock()
+
+
+def _get_engine_loop():
+    """Start the engine event loop thread on first use"""
+    global _engine_loop
+    with _engine_loop_lock:
+        if _engine_loop is None:
+            _engine_loop = asyncio.new_event_loop()
+            threading.Thread(target=_engine_loop.run_forever, name='ai-engine-loop', daemon=True).start()
+        return _engine_loop
+
+
+def _run_sync(coro):
+    """Run a coroutine on the engine loop and block until it finishes"""
+    loop = _get_engine_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Blocking engine call made from the engine loop; await the async variant instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+_END = object()
+
+
+async def _next_item(agen):
+    """Next item of an async generator, or _END once it is exhausted"""
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+
+def _iterate_sync(agen):
+    """Iterate an async generator on the engine loop from blocking code (the SSE views)"""
+    try:
+        while True:
+            item = _run_sync(_next_item(agen))
+            if item is _END:
+                return
+            yield item
+    finally:
+        # Also runs when the consumer stops early, e.g. a streaming client disconnected
+        _run_sync(agen.aclose())
+
+
+def _engine_coroutine(fn):
+    """Make a coroutine function always run on the engine loop, whichever event loop awaits it"""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        loop = _get_engine_loop()
+        coro = fn(*args, **kwargs)
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    return wrapper
+
+
+async def _llm_json(generator, schema=None, **params):
     """
-    Generate marketing campaign using Groq AI with explainability.
-    Returns campaign data with AI reasoning.
+    Send a chat completion through the provider router and return the reply's JSON object.
+    Every call is recorded in the LLM usage log with its backend, routing decision, tokens,
+    latency and outcome (partial when sections of schema are missing).
+    Raises without a network call when no backend is configured or every circuit is open,
+    so callers drop straight into their fallback.
     """
+    call = llm_usage.start(generator, None, params.get('max_tokens'))
+    route = {}
+    call.set_route(route)
+    try:
+        reply = await router.complete(generator, route, **params)
+    except Exception as e:
+        call.finish(FALLBACK, e)
+        raise
+    
+    call.set_response(reply.usage, reply.finish_reason)
+    try:
+        ai_data = parse_json_object(reply.text)
+    except Exception as e:
+        call.finish(PARSE_ERROR, e)
+        raise
+    missing = validate_sections(ai_data, schema) if schema else []
+    if missing:
+        call.finish(PARTIAL, f"Missing sections: {', '.join(missing)}")
+    else:
+        call.finish(SUCCESS)
+    return ai_data
+
+
+async def _llm_sections(generator, schema, prompt, fallback_sections, **params):
+    """
+    Generate a JSON document and make sure every section of schema is present.
+    Sections missing from the reply (typically a completion cut off at max_tokens) are
+    re-requested in one follow-up call instead of discarding the whole reply; any still
+    missing are taken from fallback_sections(), the generator's intelligent fallback.
+    Returns (document, complete) where complete is False if fallback sections were used.
+    """
+    messages = [{"role": "user", "content": prompt}]
+    ai_data = await _llm_json(generator, schema, messages=messages, **params)
+    missing = validate_sections(ai_data, schema)
+    if not missing:
+        return ai_data, True
     
+    print(f"[WARNING] {generator} reply is missing {', '.join(missing)}; requesting only those sections")
+    try:
+        sections = await _llm_json(f"{generator}_sections", messages=messages + [
+            {"role": "assistant", "content": json.dumps(ai_data, ensure_ascii=False)},
+            {"role": "user", "content": f"Your JSON is missing these sections: {', '.join(missing)}. "
+                                        f"Return ONLY a JSON object with exactly these keys, "
+                                        f"in the structure specified above, nothing else."}
+        ], **params)
+        for key in missing:
+            if key in sections:
+                ai_data[key] = sections[key]
+    except Exception as e:
+        print(f"[FALLBACK] {generator} section request error: {e}")
+    
+    missing = validate_sections(ai_data, schema)
+    if not missing:
+        return ai_data, True
+    
+    print(f"[FALLBACK] Using fallback sections for {generator}: {', '.join(missing)}")
+    fallback = fallback_sections()
+    for key in missing:
+        ai_data[key] = fallback[key]
+    return ai_data, False
+
+
+# JSON structure of the campaign sections, shared by the single- and multi-platform prompts
+CAMPAIGN_PLATFORM_SECTIONS = """  "campaign_ideas": [
+    {"title": "Campaign Idea 1", "description": "2-3 lines describing the campaign idea"},
+    {"title": "Campaign Idea 2", "description": "2-3 lines describing the campaign idea"},
+    {"title": "Campaign Idea 3", "description": "2-3 lines describing the campaign idea"},
+    {"title": "Campaign Idea 4", "description": "2-3 lines describing the campaign idea"},
+    {"title": "Campaign Idea 5", "description": "2-3 lines describing the campaign idea"}
+  ],
+  "cta_suggestions": [
+    {"cta_text": "Call to Action 1", "description": "When and why to use this CTA"},
+    {"cta_text": "Call to Action 2", "description": "When and why to use this CTA"},
+    {"cta_text": "Call to Action 3", "description": "When and why to use this CTA"},
+    {"cta_text": "Call to Action 4", "description": "When and why to use this CTA"},
+    {"cta_text": "Call to Action 5", "description": "When and why to use this CTA"}
+  ],
+  "content_calendar": [
+    {"day": 1, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "9 AM"},
+    {"day": 2, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "12 PM"},
+    {"day": 3, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "3 PM"},
+    {"day": 4, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "10 AM"},
+    {"day": 5, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "1 PM"},
+    {"day": 6, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "11 AM"},
+    {"day": 7, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "2 PM"}
+  ]"""
+
+COMPETITOR_ANALYSIS_SECTION = """  "competitor_analysis": {
+    "common_strategies": ["Strategy 1 competitors use", "Strategy 2 competitors use", "Strategy 3 competitors use"],
+    "gaps_opportunities": ["Gap 1 you can exploit", "Gap 2 you can exploit", "Gap 3 you can exploit"],
+    "differentiation_tactics": ["How to stand out 1", "How to stand out 2", "How to stand out 3"]
+  }"""
+
+
+def _build_campaign_prompt(product_desc, audience, platform, industry):
+    """Build the campaign generation prompt"""
     tone = INDUSTRY_TONES.get(industry, 'professional and engaging')
     
-    prompt = f"""You are an expert AI Marketing Strategist specialized in digital campaigns.
+    return f"""You are an expert AI Marketing Strategist specialized in digital campaigns.
 
 Generate a marketing campaign plan for {platform} platform.
 
@@ -54,34 +305,8 @@ Platform: {platform}
 
 Return ONLY valid JSON (no markdown, no code blocks) with this exact structure:
 {{
-  "campaign_ideas": [
-    {{"title": "Campaign Idea 1", "description": "2-3 lines describing the campaign idea"}},
-    {{"title": "Campaign Idea 2", "description": "2-3 lines describing the campaign idea"}},
-    {{"title": "Campaign Idea 3", "description": "2-3 lines describing the campaign idea"}},
-    {{"title": "Campaign Idea 4", "description": "2-3 lines describing the campaign idea"}},
-    {{"title": "Campaign Idea 5", "description": "2-3 lines describing the campaign idea"}}
-  ],
-  "cta_suggestions": [
-    {{"cta_text": "Call to Action 1", "description": "When and why to use this CTA"}},
-    {{"cta_text": "Call to Action 2", "description": "When and why to use this CTA"}},
-    {{"cta_text": "Call to Action 3", "description": "When and why to use this CTA"}},
-    {{"cta_text": "Call to Action 4", "description": "When and why to use this CTA"}},
-    {{"cta_text": "Call to Action 5", "description": "When and why to use this CTA"}}
-  ],
-  "content_calendar": [
-    {{"day": 1, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "9 AM"}},
-    {{"day": 2, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "12 PM"}},
-    {{"day": 3, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "3 PM"}},
-    {{"day": 4, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "10 AM"}},
-    {{"day": 5, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "1 PM"}},
-    {{"day": 6, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "11 AM"}},
-    {{"day": 7, "post_type": "Educational/Promotional/Engagement", "content_idea": "Specific post idea", "best_time": "2 PM"}}
-  ],
-  "competitor_analysis": {{
-    "common_strategies": ["Strategy 1 competitors use", "Strategy 2 competitors use", "Strategy 3 competitors use"],
-    "gaps_opportunities": ["Gap 1 you can exploit", "Gap 2 you can exploit", "Gap 3 you can exploit"],
-    "differentiation_tactics": ["How to stand out 1", "How to stand out 2", "How to stand out 3"]
-  }}
+{CAMPAIGN_PLATFORM_SECTIONS},
+{COMPETITOR_ANALYSIS_SECTION}
 }}
 
 IMPORTANT:
@@ -93,25 +318,54 @@ IMPORTANT:
 
 CRITICAL: Return ONLY the JSON object, nothing else."""
 
+
+def generate_campaign(product_desc, audience, platform, industry, fresh=False):
+    """
+    Generate marketing campaign using Groq AI with explainability.
+    Returns campaign data with AI reasoning.
+    Blocking wrapper around agenerate_campaign.
+    """
+    return _run_sync(agenerate_campaign(product_desc, audience, platform, industry, fresh))
+
+
+@_engine_coroutine
+async def agenerate_campaign(product_desc, audience, platform, industry, fresh=False):
+    """
+    Async campaign generation.
+    Results are cached per normalized inputs and model; pass fresh=True to bypass the lookup.
+    Identical requests already in flight share one upstream call.
+    """
+    cache_key = make_cache_key('campaign', MODEL, product_desc, audience, platform, industry)
+    if fresh:
+        generation_cache.record_bypass('campaign')
+    else:
+        cached = await asyncio.to_thread(generation_cache.get, 'campaign', cache_key)
+        if cached is not None:
+            return {
+                'status': 'success',
+                'campaign': cached,
+                'ai_model': MODEL,
+                'cached': True
+            }
+    
+    return await single_flight.do(
+        'campaign', cache_key,
+        lambda: _request_campaign(product_desc, audience, platform, industry, cache_key)
+    )
+
+
+async def _request_campaign(product_desc, audience, platform, industry, cache_key):
+    """Make one upstream campaign generation call and cache its result"""
+    prompt = _build_campaign_prompt(product_desc, audience, platform, industry)
+
     try:
-        if not GROQ_AVAILABLE:
-            raise Exception("Groq client not available")
-            
-        message = client.chat.completions.create(
-            model=MODEL,
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
+        ai_data, complete = await _llm_sections(
+            'campaign', CAMPAIGN_SCHEMA, prompt,
+            lambda: _intelligent_campaign_fallback(product_desc, audience, platform, industry)['campaign'],
+            max_tokens=4000
         )
-        
-        response_text = message.choices[0].message.content.strip()
-        
-        # Remove markdown if present
-        if response_text.startswith('```'):
-            response_text = response_text.split('```')[1]
-            if response_text.startswith('json'):
-                response_text = response_text[4:]
-        
-        ai_data = json.loads(response_text)
+        if complete:
+            await asyncio.to_thread(generation_cache.set, 'campaign', cache_key, ai_data)
         
         return {
             'status': 'success',
@@ -124,15 +378,312 @@ CRITICAL: Return ONLY the JSON object, nothing else."""
         return _intelligent_campaign_fallback(product_desc, audience, platform, industry)
 
 
-def generate_pitch(product, description, persona, industry, customer_type, budget_preference, language='English'):
+def _build_campaign_analysis_prompt(product_desc, audience, industry):
+    """Build the platform-independent product analysis prompt shared by multi-platform campaigns"""
+    return f"""You are an expert AI Marketing Strategist specialized in digital campaigns.
+
+Analyze this product before campaigns are planned for several platforms.
+
+INPUT DETAILS:
+Product/Service: {product_desc}
+Industry: {industry}
+Target Audience: {audience}
+
+Return ONLY valid JSON (no markdown, no code blocks) with this exact structure:
+{{
+  "product_analysis": {{
+    "core_value": "One sentence on the value the product delivers",
+    "key_benefits": ["Benefit 1", "Benefit 2", "Benefit 3"],
+    "audience_pain_points": ["Pain point 1", "Pain point 2", "Pain point 3"],
+    "positioning": "How the product should be positioned for this audience"
+  }},
+{COMPETITOR_ANALYSIS_SECTION}
+}}
+
+IMPORTANT:
+- Competitor analysis based on {industry} standards
+- Keep every item short and specific to this product
+
+CRITICAL: Return ONLY the JSON object, nothing else."""
+
+
+def _build_platform_campaign_prompt(product_desc, audience, platform, industry, product_analysis):
+    """Build the platform-specific campaign prompt on top of a shared product analysis"""
+    tone = INDUSTRY_TONES.get(industry, 'professional and engaging')
+
+    return f"""You are an expert AI Marketing Strategist specialized in digital campaigns.
+
+Generate a marketing campaign plan for {platform} platform.
+
+INPUT DETAILS:
+Product/Service: {product_desc}
+Industry: {industry}
+Target Audience: {audience}
+Platform: {platform}
+Tone: {tone}
+
+PRODUCT ANALYSIS (already done, build on it):
+{json.dumps(product_analysis, ensure_ascii=False)}
+
+Return ONLY valid JSON (no markdown, no code blocks) with this exact structure:
+{{
+{CAMPAIGN_PLATFORM_SECTIONS}
+}}
+
+IMPORTANT:
+- Campaign ideas specific to {platform}
+- CTAs action-oriented
+- Hashtags relevant to {industry} and trending on {platform}
+- Content calendar with 7 days (can be repeated for 30 days)
+
+CRITICAL: Return ONLY the JSON object, nothing else."""
+
+
+def generate_campaigns(product_desc, audience, platforms, industry, fresh=False):
+    """
+    Generate one campaign per platform in a single request.
+    Blocking wrapper around agenerate_campaigns.
+    """
+    return _run_sync(agenerate_campaigns(product_desc, audience, platforms, industry, fresh))
+
+
+@_engine_coroutine
+async def agenerate_campaigns(product_desc, audience, platforms, industry, fresh=False):
+    """
+    Async multi-platform campaign generation.
+    The platform-independent product and competitor analysis is generated (or read from the
+    cache) once, then the platform-specific sections of every platform are requested in
+    parallel on top of it. Each platform's campaign shares the single-platform cache entry,
+    so platforms generated before are served from the cache.
+    Returns results in the same order as platforms.
+    """
+    results = {}
+    pending = []
+    for platform in platforms:
+        cache_key = make_cache_key('campaign', MODEL, product_desc, audience, platform, industry)
+        if fresh:
+            generation_cache.record_bypass('campaign')
+            cached = None
+        else:
+            cached = await asyncio.to_thread(generation_cache.get, 'campaign', cache_key)
+        if cached is None:
+            pending.append((platform, cache_key))
+        else:
+            results[platform] = {'campaign': cached, 'ai_model': MODEL, 'cached': True}
+
+    if pending:
+        analysis = await _campaign_analysis(product_desc, audience, industry, fresh)
+        generated = await asyncio.gather(*[
+            single_flight.do(
+                'campaign', cache_key,
+                functools.partial(_request_platform_campaign, product_desc, audience, platform, industry,
+                                  analysis, cache_key)
+            )
+            for platform, cache_key in pending
+        ])
+        for (platform, _), result in zip(pending, generated):
+            results[platform] = {'campaign': result['campaign'], 'ai_model': result['ai_model'], 'cached': False}
+
+    return {
+        'status': 'success',
+        'results': [dict(results[platform], platform=platform) for platform in platforms]
+    }
+
+
+async def _campaign_analysis(product_desc, audience, industry, fresh):
+    """Shared product analysis for multi-platform campaigns, cached per product, audience and industry"""
+    cache_key = make_cache_key('campaign_analysis', MODEL, product_desc, audience, industry)
+    if fresh:
+        generation_cache.record_bypass('campaign_analysis')
+    else:
+        cached = await asyncio.to_thread(generation_cache.get, 'campaign_analysis', cache_key)
+        if cached is not None:
+            return {'sections': cached, 'complete': True}
+
+    return await single_flight.do(
+        'campaign_analysis', cache_key,
+        lambda: _request_campaign_analysis(product_desc, audience, industry, cache_key)
+    )
+
+
+async def _request_campaign_analysis(product_desc, audience, industry, cache_key):
+    """Make one upstream product analysis call and cache its result"""
+    def fallback_sections():
+        return {
+            'product_analysis': {'core_value': product_desc, 'audience': audience, 'industry': industry},
+            'competitor_analysis': _intelligent_campaign_fallback(product_desc, audience, '', industry)['campaign']['competitor_analysis']
+        }
+
+    prompt = _build_campaign_analysis_prompt(product_desc, audience, industry)
+    try:
+        sections, complete = await _llm_sections(
+            'campaign_analysis', CAMPAIGN_ANALYSIS_SCHEMA, prompt, fallback_sections,
+            max_tokens=1200
+        )
+    except Exception as e:
+        print(f"[FALLBACK] Campaign analysis error: {e}")
+        return {'sections': fallback_sections(), 'complete': False}
+
+    if complete:
+        await asyncio.to_thread(generation_cache.set, 'campaign_analysis', cache_key, sections)
+    return {'sections': sections, 'complete': complete}
+
+
+async def _request_platform_campaign(product_desc, audience, platform, industry, analysis, cache_key):
+    """Make one upstream call for a platform's campaign sections and cache the assembled campaign"""
+    prompt = _build_platform_campaign_prompt(product_desc, audience, platform, industry,
+                                             analysis['sections']['product_analysis'])
+
+    try:
+        sections, complete = await _llm_sections(
+            'campaign_platform', CAMPAIGN_PLATFORM_SCHEMA, prompt,
+            lambda: _intelligent_campaign_fallback(product_desc, audience, platform, industry)['campaign'],
+            max_tokens=3000
+        )
+    except Exception as e:
+        print(f"[FALLBACK] Campaign generation error for {platform}: {e}")
+        return _intelligent_campaign_fallback(product_desc, audience, platform, industry)
+
+    campaign = {key: sections[key] for key in CAMPAIGN_PLATFORM_SCHEMA}
+    campaign['competitor_analysis'] = analysis['sections']['competitor_analysis']
+    if complete and analysis['complete']:
+        await asyncio.to_thread(generation_cache.set, 'campaign', cache_key, campaign)
+
+    return {
+        'status': 'success',
+        'campaign': campaign,
+        'ai_model': MODEL
+    }
+
+
+def _pitch_sections(language):
+    """JSON structure of the pitch sections, shared by the single-pitch and variants prompts"""
+    return f"""  "elevator_pitch": "Compelling 1-minute+ pitch in {language} (150-180 words)",
+  "value_proposition": "Clear value statement in {language}",
+  "key_differentiators": [
+    "Differentiator 1 in {language}",
+    "Differentiator 2 in {language}",
+    "Differentiator 3 in {language}"
+  ],
+  "personalized_cta": "Call-to-action in {language}",
+  "deal_confidence_score": 75,
+  "confidence_breakdown": {{
+    "budget_alignment": "Analysis in {language}",
+    "pain_point_fit": "Analysis in {language}",
+    "authority_match": "Analysis in {language}",
+    "timeline_fit": "Analysis in {language}"
+  }},
+  "reasoning": {{
+    "why_this_pitch": "Reasoning in {language}",
+    "industry_nuances": "Analysis in {language}",
+    "size_considerations": "Analysis in {language}",
+    "objection_handling": "Handling in {language}"
+  }},
+  "recommended_next_actions": [
+    "Action 1 in {language}",
+    "Action 2 in {language}",
+    "Action 3 in {language}"
+  ]"""
+
+
+def _build_pitch_prompt(product, description, persona, industry, customer_type, budget_preference, language):
+    """Build the sales pitch generation prompt"""
+    tone = INDUSTRY_TONES.get(industry, 'professional')
+    
+    return f"""You are a master sales strategist. Create a personalized sales pitch.
+
+INPUTS:
+- Product Name: {product}
+- Product Description: {description}
+- Customer Persona: {persona}
+- Industry: {industry}
+- Customer Type: {customer_type}
+- Budget Preference: {budget_preference}
+- Tone: {tone}
+- Language: {language}
+
+IMPORTANT: Generate the ENTIRE pitch in {language} language. 
+CRITICAL: Use native scripts for the output (e.g., Devanagari for Hindi, Telugu script for Telugu). Do NOT use Romanized script (English letters).
+
+Return ONLY valid JSON (no markdown, no code blocks):
+{{
+{_pitch_sections(language)}
+}}
+
+CRITICAL: Return ONLY the JSON object, nothing else."""
+
+
+def generate_pitch(product, description, persona, industry, customer_type, budget_preference, language='English', fresh=False):
     """
     Generate personalized sales pitch using Groq AI with explainability.
     Returns pitch data with confidence scoring.
+    Blocking wrapper around agenerate_pitch.
+    """
+    return _run_sync(agenerate_pitch(product, description, persona, industry, customer_type, budget_preference,
+                                     language, fresh))
+
+
+@_engine_coroutine
+async def agenerate_pitch(product, description, persona, industry, customer_type, budget_preference, language='English', fresh=False):
+    """
+    Async pitch generation.
+    Results are cached per normalized inputs and model; pass fresh=True to bypass the lookup.
+    Identical requests already in flight share one upstream call.
     """
+    cache_key = make_cache_key('pitch', MODEL, product, description, persona, industry,
+                               customer_type, budget_preference, language)
+    if fresh:
+        generation_cache.record_bypass('pitch')
+    else:
+        cached = await asyncio.to_thread(generation_cache.get, 'pitch', cache_key)
+        if cached is not None:
+            return {
+                'status': 'success',
+                'pitch': cached,
+                'ai_model': MODEL,
+                'cached': True
+            }
+    
+    return await single_flight.do(
+        'pitch', cache_key,
+        lambda: _request_pitch(product, description, persona, industry, customer_type, budget_preference,
+                               language, cache_key)
+    )
+
+
+async def _request_pitch(product, description, persona, industry, customer_type, budget_preference, language, cache_key):
+    """Make one upstream pitch generation call and cache its result"""
+    prompt = _build_pitch_prompt(product, description, persona, industry, customer_type, budget_preference, language)
+
+    try:
+        ai_data, complete = await _llm_sections(
+            'pitch', PITCH_SCHEMA, prompt,
+            lambda: _intelligent_pitch_fallback(product, description, persona, industry, customer_type,
+                                                budget_preference, language)['pitch'],
+            max_tokens=3000,
+            temperature=0.7
+        )
+        if complete:
+            await asyncio.to_thread(generation_cache.set, 'pitch', cache_key, ai_data)
+        
+        return {
+            'status': 'success',
+            'pitch': ai_data,
+            'ai_model': MODEL
+        }
     
+    except Exception as e:
+        print(f"[FALLBACK] Pitch generation error: {e}")
+        return _intelligent_pitch_fallback(product, description, persona, industry, customer_type, budget_preference, language)
+
+
+def _build_pitch_variants_prompt(product, description, persona, industry, customer_type, budget_preference, language,
+                                 count, used_angles=()):
+    """Build one prompt that asks for count distinct pitch variants, each with its own angle"""
     tone = INDUSTRY_TONES.get(industry, 'professional')
+    avoid = f"\n- Do NOT reuse these angles, they are already taken: {', '.join(used_angles)}" if used_angles else ""
     
-    prompt = f"""You are a master sales strategist. Create a personalized sales pitch.
+    return f"""You are a master sales strategist. Create {count} distinct variants of a personalized sales pitch for A/B testing.
 
 INPUTS:
 - Product Name: {product}
@@ -144,85 +695,453 @@ INPUTS:
 - Tone: {tone}
 - Language: {language}
 
-IMPORTANT: Generate the ENTIRE pitch in {language} language. 
-CRITICAL: Use native scripts for the output (e.g., Devanagari for Hindi, Telugu script for Telugu). Do NOT use Romanized script (English letters).
+IMPORTANT: Generate EVERY variant entirely in {language} language. 
+CRITICAL: Use native scripts for the output (e.g., Devanagari for Hindi, Telugu script for Telugu). Do NOT use Romanized script (English letters).
+
+Return ONLY valid JSON (no markdown, no code blocks):
+{{
+  "variants": [
+    {{
+      "angle": "Short name of this variant's approach (e.g. ROI-led, pain-point-led, social proof)",
+{textwrap.indent(_pitch_sections(language), '    ')}
+    }}
+  ]
+}}
+
+IMPORTANT:
+- Return exactly {count} objects in "variants"
+- Each variant takes a clearly different angle, with its own wording and CTA; do not repeat sentences across variants{avoid}
+
+CRITICAL: Return ONLY the JSON object, nothing else."""
+
+
+def generate_pitch_variants(product, description, persona, industry, customer_type, budget_preference, count,
+                            language='English', fresh=False):
+    """
+    Generate count alternative pitches for A/B testing.
+    Blocking wrapper around agenerate_pitch_variants.
+    """
+    return _run_sync(agenerate_pitch_variants(product, description, persona, industry, customer_type,
+                                              budget_preference, count, language, fresh))
+
+
+@_engine_coroutine
+async def agenerate_pitch_variants(product, description, persona, industry, customer_type, budget_preference, count,
+                                   language='English', fresh=False):
+    """
+    Async multi-variant pitch generation.
+    All variants come from one combined prompt, so the inputs and instructions are sent once
+    instead of once per variant; returns variants with ids v1..v<count>.
+    Cached and coalesced like agenerate_pitch, keyed by the inputs and the variant count.
+    """
+    cache_key = make_cache_key('pitch_variants', MODEL, product, description, persona, industry,
+                               customer_type, budget_preference, language, count)
+    if fresh:
+        generation_cache.record_bypass('pitch_variants')
+    else:
+        cached = await asyncio.to_thread(generation_cache.get, 'pitch_variants', cache_key)
+        if cached is not None:
+            return {
+                'status': 'success',
+                'variants': cached,
+                'ai_model': MODEL,
+                'cached': True
+            }
+    
+    return await single_flight.do(
+        'pitch_variants', cache_key,
+        lambda: _request_pitch_variants(product, description, persona, industry, customer_type, budget_preference,
+                                        language, count, cache_key)
+    )
+
+
+async def _request_pitch_variants(product, description, persona, industry, customer_type, budget_preference,
+                                  language, count, cache_key):
+    """
+    Request the variants in one call. If the model returns fewer than count usable variants,
+    one follow-up call asks for the rest with new angles; any still missing are the template pitch.
+    """
+    fallback = _intelligent_pitch_fallback(product, description, persona, industry, customer_type,
+                                           budget_preference, language)
+    variants = []
+    for _ in range(2):
+        remaining = count - len(variants)
+        if remaining <= 0:
+            break
+        prompt = _build_pitch_variants_prompt(product, description, persona, industry, customer_type,
+                                              budget_preference, language, remaining,
+                                              [variant['angle'] for variant in variants])
+        try:
+            ai_data = await _llm_json(
+                'pitch_variants', PITCH_VARIANTS_SCHEMA,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=min(8000, 1500 * remaining),
+                temperature=0.9
+            )
+        except Exception as e:
+            print(f"[FALLBACK] Pitch variants generation error: {e}")
+            break
+        
+        # A variant needs at least its elevator pitch; other missing sections come from the template
+        items = ai_data.get('variants')
+        for item in (items if isinstance(items, list) else [])[:remaining]:
+            if not isinstance(item, dict):
+                continue
+            angle = item.pop('angle', None)
+            missing = validate_sections(item, PITCH_SCHEMA)
+            if 'elevator_pitch' in missing:
+                continue
+            for key in missing:
+                item[key] = fallback['pitch'][key]
+            variants.append({'angle': angle if isinstance(angle, str) and angle else f"Variant {len(variants) + 1}",
+                             'pitch': item})
+    
+    generated = len(variants)
+    if generated < count:
+        print(f"[FALLBACK] Using the template pitch for {count - generated} of {count} variants")
+        variants += [{'angle': 'Template',
+                      'pitch': _intelligent_pitch_fallback(product, description, persona, industry, customer_type,
+                                                           budget_preference, language)['pitch']}
+                     for _ in range(count - generated)]
+    for i, variant in enumerate(variants, 1):
+        variant['variant_id'] = f"v{i}"
+    
+    if generated == count:
+        await asyncio.to_thread(generation_cache.set, 'pitch_variants', cache_key, variants)
+    
+    return {
+        'status': 'success',
+        'variants': variants,
+        'ai_model': MODEL if generated else fallback['ai_model']
+    }
+
+
+def _section_digest(value):
+    """Content hash of one pitch section; an unchanged section always maps to the same translation"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _same_shape(source, translated):
+    """True if a translated section kept the structure of its source (keys, list lengths, numbers)"""
+    if isinstance(source, dict):
+        return isinstance(translated, dict) and translated.keys() == source.keys() and \
+            all(_same_shape(value, translated[key]) for key, value in source.items())
+    if isinstance(source, list):
+        return isinstance(translated, list) and len(translated) == len(source) and \
+            all(map(_same_shape, source, translated))
+    if isinstance(source, str):
+        return isinstance(translated, str) and bool(translated.strip())
+    return translated == source
+
+
+def _build_pitch_translation_prompt(sections, language):
+    """Build the translation-only prompt for some sections of a finished pitch"""
+    return f"""Translate the text values of this sales pitch JSON into {language}.
+
+RULES:
+- Keep every key, the structure and all numbers exactly as they are; translate only the text
+- Keep product and brand names unchanged
+- Keep the persuasive sales tone of the original
+- Use native scripts (e.g., Devanagari for Hindi, Telugu script for Telugu). Do NOT use Romanized script (English letters).
+
+JSON:
+{json.dumps(sections, ensure_ascii=False, indent=2)}
+
+CRITICAL: Return ONLY the translated JSON object, nothing else."""
+
+
+def generate_pitch_languages(product, description, persona, industry, customer_type, budget_preference, languages,
+                             fresh=False):
+    """
+    Generate one pitch in several languages.
+    Blocking wrapper around agenerate_pitch_languages.
+    """
+    return _run_sync(agenerate_pitch_languages(product, description, persona, industry, customer_type,
+                                               budget_preference, languages, fresh))
+
+
+@_engine_coroutine
+async def agenerate_pitch_languages(product, description, persona, industry, customer_type, budget_preference,
+                                    languages, fresh=False):
+    """
+    Async multi-language pitch generation.
+    The pitch is generated once in languages[0] (the canonical pitch, cached like agenerate_pitch)
+    and translated into the other languages in parallel with translation-only prompts.
+    Returns the canonical pitch, a translations map {language: pitch} and, per language, any
+    sections left untranslated because the translation failed.
+    """
+    canonical = await agenerate_pitch(product, description, persona, industry, customer_type, budget_preference,
+                                      languages[0], fresh)
+    if canonical['status'] != 'success':
+        return canonical
+    
+    translated = await asyncio.gather(*(_translate_pitch(canonical['pitch'], language) for language in languages[1:]))
+    return {
+        'status': 'success',
+        'pitch': canonical['pitch'],
+        'language': languages[0],
+        'translations': {language: pitch for language, (pitch, _) in zip(languages[1:], translated)},
+        'untranslated': {language: missing for language, (_, missing) in zip(languages[1:], translated) if missing},
+        'ai_model': canonical['ai_model'],
+        'cached': canonical.get('cached', False)
+    }
+
+
+async def _translate_pitch(pitch, language):
+    """
+    Translate a pitch into language section by section.
+    Translated sections are cached under the hash of their source content, so only sections not
+    translated before are sent, together in one call; numbers are copied as they are.
+    Returns (translated pitch, names of sections that could not be translated).
+    """
+    keys = {key: make_cache_key('pitch_translation', MODEL, language, _section_digest(value))
+            for key, value in pitch.items() if isinstance(value, (str, list, dict))}
+    
+    def lookup():
+        return {key: generation_cache.get('pitch_translation', cache_key) for key, cache_key in keys.items()}
+    
+    translated = dict(pitch)
+    pending = {}
+    for key, value in (await asyncio.to_thread(lookup)).items():
+        if value is None:
+            pending[key] = pitch[key]
+        else:
+            translated[key] = value
+    if not pending:
+        return translated, []
+    
+    sections = await single_flight.do(
+        'pitch_translation', make_cache_key('pitch_translation', MODEL, language, *sorted(keys[key] for key in pending)),
+        lambda: _request_pitch_translation(pending, language, {key: keys[key] for key in pending})
+    )
+    translated.update(sections)
+    return translated, [key for key in pending if key not in sections]
+
+
+async def _request_pitch_translation(sections, language, cache_keys):
+    """Translate the given sections in one call and cache each one that kept its structure"""
+    source = json.dumps(sections, ensure_ascii=False)
+    try:
+        ai_data = await _llm_json(
+            'pitch_translation', {key: type(value) for key, value in sections.items()},
+            messages=[{"role": "user", "content": _build_pitch_translation_prompt(sections, language)}],
+            # Native scripts take several tokens per character, so budget by source length
+            max_tokens=min(6000, max(600, len(source))),
+            temperature=0.3
+        )
+    except Exception as e:
+        print(f"[FALLBACK] Pitch translation to {language} error: {e}")
+        return {}
+    
+    translated = {key: ai_data[key] for key, value in sections.items() if _same_shape(value, ai_data.get(key))}
+    if len(translated) < len(sections):
+        print(f"[FALLBACK] Keeping untranslated {language} sections: "
+              f"{', '.join(key for key in sections if key not in translated)}")
+    
+    def store():
+        for key, value in translated.items():
+            generation_cache.set('pitch_translation', cache_keys[key], value)
+    await asyncio.to_thread(store)
+    return translated
+
+
+async def _astream_generation(generator, result_key, schema, prompt, max_tokens, temperature, cache_key, fresh,
+                              fallback):
+    """
+    Stream a completion through the provider router, yielding ('token', text) for each delta and
+    ('section', {'key', 'value'}) whenever a top-level JSON section completes.
+    Always finishes with a single ('result', result_dict) event. The call is recorded in the LLM
+    usage log like _llm_json calls, with the streamed route.
+    """
+    if fresh:
+        generation_cache.record_bypass(generator)
+    else:
+        cached = await asyncio.to_thread(generation_cache.get, generator, cache_key)
+        if cached is not None:
+            for key, value in cached.items():
+                yield 'section', {'key': key, 'value': value}
+            yield 'result', {'status': 'success', result_key: cached, 'ai_model': MODEL, 'cached': True}
+            return
+
+    call = llm_usage.start(generator, None, max_tokens)
+    route = {}
+    call.set_route(route)
+    try:
+        params = {'max_tokens': max_tokens}
+        if temperature is not None:
+            params['temperature'] = temperature
+
+        scanner = JsonSectionScanner()
+        reply = None
+        async for item in router.stream(generator, route, [{"role": "user", "content": prompt}], **params):
+            if isinstance(item, LLMReply):
+                reply = item
+                continue
+            yield 'token', item
+            for key, value in scanner.feed(item):
+                yield 'section', {'key': key, 'value': value}
+
+        call.set_response(reply.usage, reply.finish_reason)
+        try:
+            ai_data = parse_json_object(reply.text)
+        except Exception as e:
+            call.finish(PARSE_ERROR, e)
+            raise
+        
+        # Sections the stream did not deliver come from the fallback; the result is then not cached
+        missing = validate_sections(ai_data, schema)
+        if missing:
+            call.finish(PARTIAL, f"Missing sections: {', '.join(missing)}")
+            print(f"[FALLBACK] Using fallback sections for streamed {generator}: {', '.join(missing)}")
+            fallback_data = fallback()[result_key]
+            for key in missing:
+                ai_data[key] = fallback_data[key]
+                yield 'section', {'key': key, 'value': ai_data[key]}
+        else:
+            call.finish(SUCCESS)
+            await asyncio.to_thread(generation_cache.set, generator, cache_key, ai_data)
+
+        yield 'result', {'status': 'success', result_key: ai_data, 'ai_model': MODEL}
+
+    except Exception as e:
+        call.finish(FALLBACK, e)
+        print(f"[FALLBACK] Streaming {generator} generation error: {e}")
+        result = fallback()
+        for key, value in result.get(result_key, {}).items():
+            yield 'section', {'key': key, 'value': value}
+        yield 'result', result
+
+
+def stream_campaign(product_desc, audience, platform, industry, fresh=False):
+    """
+    Streaming variant of generate_campaign.
+    Yields (event, payload) tuples; see _astream_generation.
+    """
+    cache_key = make_cache_key('campaign', MODEL, product_desc, audience, platform, industry)
+    prompt = _build_campaign_prompt(product_desc, audience, platform, industry)
+    return _iterate_sync(_astream_generation(
+        'campaign', 'campaign', CAMPAIGN_SCHEMA, prompt, 4000, None, cache_key, fresh,
+        lambda: _intelligent_campaign_fallback(product_desc, audience, platform, industry)
+    ))
+
+
+def stream_pitch(product, description, persona, industry, customer_type, budget_preference, language='English', fresh=False):
+    """
+    Streaming variant of generate_pitch.
+    Yields (event, payload) tuples; see _astream_generation.
+    """
+    cache_key = make_cache_key('pitch', MODEL, product, description, persona, industry,
+                               customer_type, budget_preference, language)
+    prompt = _build_pitch_prompt(product, description, persona, industry, customer_type, budget_preference, language)
+    return _iterate_sync(_astream_generation(
+        'pitch', 'pitch', PITCH_SCHEMA, prompt, 3000, 0.7, cache_key, fresh,
+        lambda: _intelligent_pitch_fallback(product, description, persona, industry, customer_type, budget_preference, language)
+    ))
+
+
+SECTION_ROLES = {
+    'campaign': 'an expert AI Marketing Strategist specialized in digital campaigns',
+    'pitch': 'a master sales strategist'
+}
+
 
-Return ONLY valid JSON (no markdown, no code blocks):
-{{
-  "elevator_pitch": "Compelling 1-minute+ pitch in {language} (150-180 words)",
-  "value_proposition": "Clear value statement in {language}",
-  "key_differentiators": [
-    "Differentiator 1 in {language}",
-    "Differentiator 2 in {language}",
-    "Differentiator 3 in {language}"
-  ],
-  "personalized_cta": "Call-to-action in {language}",
-  "deal_confidence_score": 75,
-  "confidence_breakdown": {{
-    "budget_alignment": "Analysis in {language}",
-    "pain_point_fit": "Analysis in {language}",
-    "authority_match": "Analysis in {language}",
-    "timeline_fit": "Analysis in {language}"
-  }},
-  "reasoning": {{
-    "why_this_pitch": "Reasoning in {language}",
-    "industry_nuances": "Analysis in {language}",
-    "size_considerations": "Analysis in {language}",
-    "objection_handling": "Handling in {language}"
-  }},
-  "recommended_next_actions": [
-    "Action 1 in {language}",
-    "Action 2 in {language}",
-    "Action 3 in {language}"
-  ]
-}}
+def _build_section_prompt(item_type, inputs, ai_output, path, current, instructions):
+    """Build the prompt that rewrites one section of a stored campaign or pitch"""
+    details = "\n".join(f"{key.replace('_', ' ').title()}: {value}" for key, value in inputs.items())
+    feedback = f"\nUSER FEEDBACK ON THE CURRENT VERSION:\n{instructions}\n" if instructions else ""
+
+    return f"""You are {SECTION_ROLES[item_type]}.
+
+You previously generated this {item_type}:
+
+INPUT DETAILS:
+{details}
+
+FULL {item_type.upper()} (JSON):
+{json.dumps(ai_output, ensure_ascii=False)}
+
+Rewrite ONLY the section "{path}". Its current value is:
+{json.dumps(current, ensure_ascii=False)}
+{feedback}
+Return ONLY valid JSON (no markdown, no code blocks) of the form:
+{{"value": <the new section, with exactly the same structure and type as the current value>}}
+
+IMPORTANT:
+- Make it clearly different from and better than the current value
+- Keep it consistent with the rest of the {item_type}
+- Write in the same language and script as the current value
 
 CRITICAL: Return ONLY the JSON object, nothing else."""
 
-    try:
-        if not GROQ_AVAILABLE:
-            raise Exception("Groq client not available")
 
-        message = client.chat.completions.create(
-            model=MODEL,
-            max_tokens=3000,
-            temperature=0.7,
+def regenerate_section(item_type, inputs, ai_output, path, instructions=None):
+    """
+    Regenerate one section of a stored campaign or pitch.
+    Blocking wrapper around aregenerate_section.
+    """
+    return _run_sync(aregenerate_section(item_type, inputs, ai_output, path, instructions))
+
+
+@_engine_coroutine
+async def aregenerate_section(item_type, inputs, ai_output, path, instructions=None):
+    """
+    Async section regeneration: a small prompt with the stored inputs and document asks for
+    a new value of the section at path only, so its completion is a fraction of a full one.
+    Not cached; each call asks for a new version. There is no template fallback, since the
+    stored section is better than a generic one.
+    """
+    current = get_section(ai_output, path)
+    expected_type = int if isinstance(current, int) and not isinstance(current, bool) else type(current)
+    schema = {'value': expected_type}
+    prompt = _build_section_prompt(item_type, inputs, ai_output, path, current, instructions)
+    # Roughly 4 characters per token, with room for a somewhat longer rewrite
+    max_tokens = min(4000, max(300, len(json.dumps(current, ensure_ascii=False)) // 2))
+
+    try:
+        reply = await _llm_json(
+            f"{item_type}_section", schema,
+            max_tokens=max_tokens,
+            temperature=0.8,
             messages=[{"role": "user", "content": prompt}]
         )
-        
-        response_text = message.choices[0].message.content.strip()
-        
-        # Remove markdown if present
-        if response_text.startswith('```'):
-            lines = response_text.split('\n')
-            response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
-            if response_text.startswith('json'):
-                response_text = response_text[4:].strip()
-        
-        # Clean up response
-        response_text = response_text.strip()
-        if response_text.endswith('```'):
-            response_text = response_text[:-3].strip()
-        
-        ai_data = json.loads(response_text)
-        
-        return {
-            'status': 'success',
-            'pitch': ai_data,
-            'ai_model': MODEL
-        }
-    
     except Exception as e:
-        print(f"[FALLBACK] Pitch generation error: {e}")
-        return _intelligent_pitch_fallback(product, description, persona, industry, customer_type, budget_preference, language)
+        print(f"[ERROR] {item_type} section regeneration error: {e}")
+        return {'status': 'error', 'error': 'Section regeneration is unavailable right now'}
+
+    if validate_sections(reply, schema):
+        return {'status': 'error', 'error': 'The model returned an invalid section'}
+
+    return {
+        'status': 'success',
+        'value': reply['value'],
+        'ai_model': MODEL
+    }
 
 
 def score_lead(budget, business_need, urgency, authority, industry):
     """
     Score and categorize leads using Groq AI with detailed reasoning.
     Returns lead score (0-100) with reasoning, varying based on BANT factors.
+    Blocking wrapper around ascore_lead.
     """
-    
+    return _run_sync(ascore_lead(budget, business_need, urgency, authority, industry))
+
+
+@_engine_coroutine
+async def ascore_lead(budget, business_need, urgency, authority, industry):
+    """
+    Async lead scoring.
+    Identical leads already being scored share one upstream call.
+    """
+    key = make_cache_key('lead', MODEL, budget, business_need, urgency, authority, industry)
+    return await single_flight.do(
+        'lead', key,
+        lambda: _request_lead_score(budget, business_need, urgency, authority, industry)
+    )
+
+
+async def _request_lead_score(budget, business_need, urgency, authority, industry):
+    """Make one upstream lead scoring call"""
     # Enhanced prompt that emphasizes dynamic scoring
     prompt = f"""You are an expert B2B lead scoring analyst. Analyze this specific lead and provide a detailed, BANT-based score.
 
@@ -293,25 +1212,12 @@ IMPORTANT:
 - Return ONLY the JSON, nothing else"""
 
     try:
-        if not GROQ_AVAILABLE:
-            raise Exception("Groq client not available")
-            
-        message = client.chat.completions.create(
-            model=MODEL,
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
+        ai_data, _ = await _llm_sections(
+            'lead', LEAD_SCORE_SCHEMA, prompt,
+            lambda: _intelligent_lead_score_fallback(budget, business_need, urgency, authority, industry)['lead_score'],
+            max_tokens=2000
         )
         
-        response_text = message.choices[0].message.content.strip()
-        
-        # Remove markdown if present
-        if response_text.startswith('```'):
-            response_text = response_text.split('```')[1]
-            if response_text.startswith('json'):
-                response_text = response_text[4:]
-        
-        ai_data = json.loads(response_text)
-        
         return {
             'status': 'success',
             'lead_score': ai_data,
@@ -323,10 +1229,154 @@ IMPORTANT:
         return _intelligent_lead_score_fallback(budget, business_need, urgency, authority, industry)
 
 
+async def _score_lead_chunk(leads):
+    """
+    Score several leads with a single LLM call.
+    Returns a dict mapping the lead's position in the chunk to its score document.
+    """
+    profiles = "\n".join(
+        f"[{i}] Budget: {lead['budget']} | Business Need: {lead['business_need']} | "
+        f"Urgency (Timeline): {lead['urgency']} | Authority Level: {lead['authority']} | Industry: {lead['industry']}"
+        for i, lead in enumerate(leads)
+    )
+    
+    prompt = f"""You are an expert B2B lead scoring analyst. Score EACH of the following leads independently using BANT
+(Budget, Authority, Need, Timeline).
+
+LEADS:
+{profiles}
+
+Return ONLY valid JSON (no markdown) of the form:
+{{
+  "leads": [
+    {{
+      "index": <the [number] of the lead>,
+      "lead_score": <integer 1-100>,
+      "lead_category": <"Hot" if 70-100, "Warm" if 40-69, "Cold" if below 40>,
+      "conversion_probability": <integer 1-100>,
+      "detailed_reasoning": {{"budget_analysis": "...", "need_alignment": "...", "urgency_signal": "...", "authority_assessment": "...", "industry_context": "...", "bant_summary": "..."}},
+      "score_breakdown": {{"budget_fit": {{"score": <0-100>, "reasoning": "..."}}, "need_clarity": {{"score": <0-100>, "reasoning": "..."}}, "urgency_level": {{"score": <0-100>, "reasoning": "..."}}, "authority_level": {{"score": <0-100>, "reasoning": "..."}}, "industry_fit": {{"score": <0-100>, "reasoning": "..."}}}},
+      "priority_recommendation": "<A/B/C tier with action timeline>",
+      "sales_strategy": "<strategy based on BANT alignment>",
+      "risk_level": "<Low, Medium, or High>",
+      "next_actions": ["<tactic 1>", "<tactic 2>", "<tactic 3>"],
+      "risk_factors": ["<risk 1>", "<risk 2>"]
+    }}
+  ]
+}}
+
+IMPORTANT:
+- Return exactly one entry per lead, keeping its index
+- Generate DIFFERENT scores for different leads based on their specific BANT inputs
+- Return ONLY the JSON, nothing else"""
+    
+    ai_data = await _llm_json(
+        'lead_batch', LEAD_BATCH_SCHEMA,
+        max_tokens=min(8000, 900 * len(leads)),
+        messages=[{"role": "user", "content": prompt}]
+    )
+    if validate_sections(ai_data, LEAD_BATCH_SCHEMA):
+        raise ValueError("Batch lead scoring reply has no leads array")
+    
+    # A lead needs at least its score; other missing sections come from the BANT fallback
+    scored = {}
+    for item in ai_data['leads']:
+        if not isinstance(item, dict):
+            continue
+        index = item.pop('index', None)
+        if not isinstance(index, int) or not 0 <= index < len(leads):
+            continue
+        missing = validate_sections(item, LEAD_SCORE_SCHEMA)
+        if 'lead_score' in missing:
+            continue
+        if missing:
+            lead = leads[index]
+            fallback = _intelligent_lead_score_fallback(lead['budget'], lead['business_need'], lead['urgency'],
+                                                        lead['authority'], lead['industry'])['lead_score']
+            for key in missing:
+                item[key] = fallback[key]
+        scored[index] = item
+    return scored
+
+
+def score_leads_batch(leads):
+    """
+    Score many leads at once.
+    Blocking wrapper around ascore_leads_batch.
+    """
+    return _run_sync(ascore_leads_batch(leads))
+
+
+@_engine_coroutine
+async def ascore_leads_batch(leads):
+    """
+    Async batch lead scoring.
+    With an LLM backend, leads are packed LEAD_BATCH_SIZE per prompt with at most LEAD_BATCH_CONCURRENCY
+    prompts in flight; any lead the model does not return (or every lead, without a backend) is
+    answered from LEAD_SCORE_TABLE when its dropdown values are canonical, and by the
+    vectorized BANT fallback otherwise.
+    Returns results in the same order as the input leads.
+    """
+    results = [None] * len(leads)
+    
+    if router.ranked('lead_batch'):
+        semaphore = asyncio.Semaphore(LEAD_BATCH_CONCURRENCY)
+        
+        async def score_chunk(start, chunk_leads):
+            async with semaphore:
+                try:
+                    return start, await _score_lead_chunk(chunk_leads)
+                except Exception as e:
+                    print(f"[FALLBACK] Batch lead scoring error: {e}")
+                    return start, {}
+        
+        chunks = [score_chunk(start, leads[start:start + LEAD_BATCH_SIZE])
+                  for start in range(0, len(leads), LEAD_BATCH_SIZE)]
+        for start, scored in await asyncio.gather(*chunks):
+            for offset, ai_data in scored.items():
+                results[start + offset] = {'lead_score': ai_data, 'ai_model': MODEL}
+    
+    missing = []
+    for i, result in enumerate(results):
+        if result is not None:
+            continue
+        lead = leads[i]
+        ai_data = LEAD_SCORE_TABLE.lookup(lead['budget'], lead['business_need'], lead['urgency'],
+                                          lead['authority'], lead['industry'])
+        if ai_data is None:
+            missing.append(i)
+        else:
+            results[i] = {'lead_score': ai_data, 'ai_model': 'Intelligent Fallback (BANT-based)'}
+    
+    if missing:
+        fallback_scores = _vectorized_lead_score_fallback([leads[i] for i in missing])
+        for i, ai_data in zip(missing, fallback_scores):
+            results[i] = {'lead_score': ai_data, 'ai_model': 'Intelligent Fallback (BANT-based)'}
+    
+    return {
+        'status': 'success',
+        'results': results
+    }
+
+
 def _intelligent_lead_score_fallback(budget, business_need, urgency, authority, industry):
     """
     Fallback scoring when Groq is unavailable. Still generates dynamic scores based on BANT factors.
+    Combinations of canonical dropdown values are answered from the precomputed LEAD_SCORE_TABLE.
     """
+    lead_score = LEAD_SCORE_TABLE.lookup(budget, business_need, urgency, authority, industry)
+    if lead_score is None:
+        lead_score = _compute_fallback_lead_score(budget, business_need, urgency, authority, industry)
+    
+    return {
+        'status': 'success',
+        'lead_score': lead_score,
+        'ai_model': 'Intelligent Fallback (BANT-based)'
+    }
+
+
+def _compute_fallback_lead_score(budget, business_need, urgency, authority, industry):
+    """Score a lead from scratch with the BANT rules (used for free-text values)"""
     # Calculate score components based on inputs
     budget_score = _calculate_budget_score(budget)
     urgency_score = _calculate_urgency_score(urgency)
@@ -336,9 +1386,52 @@ def _intelligent_lead_score_fallback(budget, business_need, urgency, authority,
     
     # Weighted BANT calculation
     lead_score = int((budget_score * 0.3 + urgency_score * 0.3 + authority_score * 0.2 + need_score * 0.2))
+    
+    return _build_fallback_lead_score(
+        budget, business_need, urgency, authority, industry,
+        budget_score, urgency_score, authority_score, need_score, industry_score, lead_score
+    )
+
+
+def _build_fallback_lead_score(budget, business_need, urgency, authority, industry,
+                               budget_score, urgency_score, authority_score, need_score, industry_score, lead_score):
+    """Assemble the fallback lead score document from precomputed BANT components"""
     conversion_prob = int(lead_score * 0.9)
+    category, priority_recommendation = _categorize_lead_score(lead_score)
     
-    # Determine category
+    budget_analysis = _get_budget_analysis(budget)
+    need_alignment = _get_need_alignment(business_need)
+    urgency_analysis = _get_urgency_analysis(urgency)
+    authority_analysis = _get_authority_analysis(authority)
+    industry_analysis = _get_industry_analysis(industry)
+    
+    return {
+        'lead_score': lead_score,
+        'lead_category': category,
+        'conversion_probability': conversion_prob,
+        'detailed_reasoning': {
+            'budget_analysis': f"Budget: {budget}. Assessment: {budget_analysis}",
+            'need_alignment': f"Need: {business_need}. Clarity: {need_alignment}",
+            'urgency_signal': f"Urgency: {urgency}. Readiness: {urgency_analysis}",
+            'authority_assessment': f"Authority: {authority}. Capability: {authority_analysis}",
+            'industry_context': f"Industry: {industry}. Fit: {industry_analysis}",
+            'bant_summary': f"BANT Alignment: Budget {budget_score}/100, Authority {authority_score}/100, Need {need_score}/100, Timeline {urgency_score}/100"
+        },
+        'score_breakdown': {
+            'budget_fit': {'score': budget_score, 'reasoning': budget_analysis},
+            'need_clarity': {'score': need_score, 'reasoning': need_alignment},
+            'urgency_level': {'score': urgency_score, 'reasoning': urgency_analysis},
+            'authority_level': {'score': authority_score, 'reasoning': authority_analysis},
+            'industry_fit': {'score': industry_score, 'reasoning': industry_analysis}
+        },
+        'priority_recommendation': priority_recommendation,
+        'next_actions': _get_next_actions(category, authority, business_need),
+        'risk_factors': _get_risk_factors(budget, authority, urgency, business_need)
+    }
+
+
+def _categorize_lead_score(lead_score):
+    """Map a lead score to its category and priority recommendation"""
     if lead_score >= 70:
         category = "Hot"
         priority = "A-Tier"
@@ -352,33 +1445,71 @@ def _intelligent_lead_score_fallback(budget, business_need, urgency, authority,
         priority = "C-Tier"
         timeline = "nurture sequence"
     
-    return {
-        'status': 'success',
-        'lead_score': {
-            'lead_score': lead_score,
-            'lead_category': category,
-            'conversion_probability': conversion_prob,
-            'detailed_reasoning': {
-                'budget_analysis': f"Budget: {budget}. Assessment: {_get_budget_analysis(budget)}",
-                'need_alignment': f"Need: {business_need}. Clarity: {_get_need_alignment(business_need)}",
-                'urgency_signal': f"Urgency: {urgency}. Readiness: {_get_urgency_analysis(urgency)}",
-                'authority_assessment': f"Authority: {authority}. Capability: {_get_authority_analysis(authority)}",
-                'industry_context': f"Industry: {industry}. Fit: {_get_industry_analysis(industry)}",
-                'bant_summary': f"BANT Alignment: Budget {budget_score}/100, Authority {authority_score}/100, Need {need_score}/100, Timeline {urgency_score}/100"
-            },
-            'score_breakdown': {
-                'budget_fit': {'score': budget_score, 'reasoning': _get_budget_analysis(budget)},
-                'need_clarity': {'score': need_score, 'reasoning': _get_need_alignment(business_need)},
-                'urgency_level': {'score': urgency_score, 'reasoning': _get_urgency_analysis(urgency)},
-                'authority_level': {'score': authority_score, 'reasoning': _get_authority_analysis(authority)},
-                'industry_fit': {'score': industry_score, 'reasoning': _get_industry_analysis(industry)}
-            },
-            'priority_recommendation': f"PRIORITY: {priority} Tier. Contact {timeline}. {'Immediate action recommended.' if category == 'Hot' else 'Strong opportunity.' if category == 'Warm' else 'Monitor and nurture.'}",
-            'next_actions': _get_next_actions(category, authority, business_need),
-            'risk_factors': _get_risk_factors(budget, authority, urgency, business_need)
-        },
-        'ai_model': 'Intelligent Fallback (BANT-based)'
-    }
+    recommendation = f"PRIORITY: {priority} Tier. Contact {timeline}. {'Immediate action recommended.' if category == 'Hot' else 'Strong opportunity.' if category == 'Warm' else 'Monitor and nurture.'}"
+    return category, recommendation
+
+
+def _contains_any(values, *needles):
+    """Vectorized substring test: True where any needle occurs in the (lowercased) values"""
+    found = np.zeros(values.shape, dtype=bool)
+    for needle in needles:
+        found |= np.char.find(values, needle) >= 0
+    return found
+
+
+def _vectorized_lead_score_fallback(leads):
+    """
+    BANT fallback for a whole batch of leads at once.
+    Computes every _calculate_*_score component as NumPy array operations and
+    returns the same lead score documents as _intelligent_lead_score_fallback.
+    """
+    if not leads:
+        return []
+    
+    budgets = np.char.lower(np.array([lead['budget'] for lead in leads], dtype=str))
+    urgencies = np.char.lower(np.array([lead['urgency'] for lead in leads], dtype=str))
+    authorities = np.char.lower(np.array([lead['authority'] for lead in leads], dtype=str))
+    needs_raw = np.array([lead['business_need'] for lead in leads], dtype=str)
+    needs = np.char.lower(needs_raw)
+    industries = np.char.lower(np.array([lead['industry'] for lead in leads], dtype=str))
+    
+    budget_scores = np.select(
+        [_contains_any(budgets, 'over $1m'), _contains_any(budgets, '$500k - $1m'),
+         _contains_any(budgets, '$150k - $500k'), _contains_any(budgets, '$50k - $150k'),
+         _contains_any(budgets, 'under $50k')],
+        [100, 95, 85, 70, 50], default=40
+    )
+    urgency_scores = np.select(
+        [_contains_any(urgencies, 'immediately', 'high'), _contains_any(urgencies, '3 months', 'medium'),
+         _contains_any(urgencies, '6+ months', 'low'), _contains_any(urgencies, 'exploring')],
+        [100, 80, 50, 40], default=60
+    )
+    authority_scores = np.select(
+        [_contains_any(authorities, 'primary decision maker'), _contains_any(authorities, 'budget approver'),
+         _contains_any(authorities, 'technical influencer', 'influencer'), _contains_any(authorities, 'end user')],
+        [100, 90, 70, 50], default=60
+    )
+    
+    specificity_words = ['crm', 'marketing', 'sales', 'automation', 'analytics', 'inventory', 'platform', 'system', 'management']
+    matched_words = sum((np.char.find(needs, word) >= 0).astype(int) for word in specificity_words)
+    need_scores = np.where(np.char.str_len(needs_raw) > 10, np.minimum(100, 40 + matched_words * 12), 30)
+    
+    industry_table = {'saas': 90, 'healthcare': 80, 'fintech': 85, 'edtech': 75, 'retail': 70, 'other': 50}
+    industry_scores = np.select([industries == name for name in industry_table], list(industry_table.values()), default=50)
+    
+    # Weighted BANT calculation, same term order as the scalar path so the floats match exactly
+    lead_scores = np.floor(budget_scores * 0.3 + urgency_scores * 0.3 + authority_scores * 0.2 + need_scores * 0.2).astype(int)
+    
+    columns = zip(budget_scores.tolist(), urgency_scores.tolist(), authority_scores.tolist(),
+                  need_scores.tolist(), industry_scores.tolist(), lead_scores.tolist())
+    return [
+        _build_fallback_lead_score(
+            lead['budget'], lead['business_need'], lead['urgency'], lead['authority'], lead['industry'],
+            budget_score, urgency_score, authority_score, need_score, industry_score, lead_score
+        )
+        for lead, (budget_score, urgency_score, authority_score, need_score, industry_score, lead_score)
+        in zip(leads, columns)
+    ]
 
 
 def _calculate_budget_score(budget):
@@ -525,101 +1656,152 @@ def _get_risk_factors(budget, authority, urgency, business_need):
     return risks if risks else ["No significant identified risks"]
 
 
+# Canonical option values offered by the dropdowns in templates/lead.html,
+# plus the USD budget bands the budget rules above recognize
+LEAD_BUDGET_OPTIONS = [
+    'Under ₹10L', '₹10L – ₹50L', '₹50L – ₹2Cr', '₹2Cr – ₹5Cr', 'Over ₹5Cr',
+    'Under $50K', '$50K - $150K', '$150K - $500K', '$500K - $1M', 'Over $1M'
+]
+LEAD_URGENCY_OPTIONS = ['High - Need immediately', 'Medium - Within 3 months', 'Low - 6+ months', 'Exploring options']
+LEAD_AUTHORITY_OPTIONS = ['Primary Decision Maker', 'Budget Approver', 'Technical Influencer', 'End User']
+LEAD_INDUSTRY_OPTIONS = ['SaaS', 'Healthcare', 'EdTech', 'Retail', 'FinTech', 'Other']
+
+# Every value _calculate_need_score can produce
+_NEED_SCORE_VALUES = sorted({30} | {min(100, 40 + matched * 12) for matched in range(10)})
+
+
+class LeadScoreTable:
+    """
+    Precomputed fallback lead scores for the full cross product of canonical
+    budget/urgency/authority/industry values. Scores, categories, reasoning strings
+    and risk factors are built once; a lookup only evaluates the free-text business need.
+    """
+    def __init__(self, budgets, urgencies, authorities, industries):
+        self._entries = {}
+        for budget, urgency, authority, industry in itertools.product(budgets, urgencies, authorities, industries):
+            self._entries[(budget, urgency, authority, industry)] = self._build_entry(budget, urgency, authority, industry)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    @staticmethod
+    def _build_entry(budget, urgency, authority, industry):
+        budget_score = _calculate_budget_score(budget)
+        urgency_score = _calculate_urgency_score(urgency)
+        authority_score = _calculate_authority_score(authority)
+        industry_score = _calculate_industry_score(industry)
+        
+        # Same evaluation order as _compute_fallback_lead_score so the float sums match exactly
+        partial_score = budget_score * 0.3 + urgency_score * 0.3 + authority_score * 0.2
+        
+        outcomes = {}
+        for need_score in _NEED_SCORE_VALUES:
+            lead_score = int((partial_score + need_score * 0.2))
+            category, priority_recommendation = _categorize_lead_score(lead_score)
+            outcomes[need_score] = {
+                'lead_score': lead_score,
+                'conversion_probability': int(lead_score * 0.9),
+                'lead_category': category,
+                'priority_recommendation': priority_recommendation,
+                'closing_action': _get_next_actions(category, authority, '')[2],
+                'bant_summary': f"BANT Alignment: Budget {budget_score}/100, Authority {authority_score}/100, Need {need_score}/100, Timeline {urgency_score}/100"
+            }
+        
+        budget_analysis = _get_budget_analysis(budget)
+        urgency_analysis = _get_urgency_analysis(urgency)
+        authority_analysis = _get_authority_analysis(authority)
+        industry_analysis = _get_industry_analysis(industry)
+        
+        return {
+            'budget_score': budget_score,
+            'urgency_score': urgency_score,
+            'authority_score': authority_score,
+            'industry_score': industry_score,
+            'budget_analysis': budget_analysis,
+            'urgency_analysis': urgency_analysis,
+            'authority_analysis': authority_analysis,
+            'industry_analysis': industry_analysis,
+            'budget_reasoning': f"Budget: {budget}. Assessment: {budget_analysis}",
+            'urgency_reasoning': f"Urgency: {urgency}. Readiness: {urgency_analysis}",
+            'authority_reasoning': f"Authority: {authority}. Capability: {authority_analysis}",
+            'industry_reasoning': f"Industry: {industry}. Fit: {industry_analysis}",
+            'opening_action': _get_next_actions('Cold', authority, '')[0],
+            # Risks from the fixed inputs; the business-need risk is appended per lookup
+            'risk_factors': [risk for risk in _get_risk_factors(budget, authority, urgency, 'x' * 20)
+                             if risk != "No significant identified risks"],
+            'outcomes': outcomes
+        }
+    
+    def lookup(self, budget, business_need, urgency, authority, industry):
+        """Return the fallback lead score document, or None if any dropdown value is not canonical"""
+        entry = self._entries.get((budget, urgency, authority, industry))
+        if entry is None:
+            return None
+        
+        need_score = _calculate_need_score(business_need)
+        need_alignment = _get_need_alignment(business_need)
+        outcome = entry['outcomes'][need_score]
+        
+        risk_factors = list(entry['risk_factors'])
+        if len(business_need) < 20:
+            risk_factors.append("Business need clarity needs refinement")
+        
+        return {
+            'lead_score': outcome['lead_score'],
+            'lead_category': outcome['lead_category'],
+            'conversion_probability': outcome['conversion_probability'],
+            'detailed_reasoning': {
+                'budget_analysis': entry['budget_reasoning'],
+                'need_alignment': f"Need: {business_need}. Clarity: {need_alignment}",
+                'urgency_signal': entry['urgency_reasoning'],
+                'authority_assessment': entry['authority_reasoning'],
+                'industry_context': entry['industry_reasoning'],
+                'bant_summary': outcome['bant_summary']
+            },
+            'score_breakdown': {
+                'budget_fit': {'score': entry['budget_score'], 'reasoning': entry['budget_analysis']},
+                'need_clarity': {'score': need_score, 'reasoning': need_alignment},
+                'urgency_level': {'score': entry['urgency_score'], 'reasoning': entry['urgency_analysis']},
+                'authority_level': {'score': entry['authority_score'], 'reasoning': entry['authority_analysis']},
+                'industry_fit': {'score': entry['industry_score'], 'reasoning': entry['industry_analysis']}
+            },
+            'priority_recommendation': outcome['priority_recommendation'],
+            'next_actions': [
+                entry['opening_action'],
+                f"Prepare business case addressing: {business_need[:50]}",
+                outcome['closing_action']
+            ],
+            'risk_factors': risk_factors or ["No significant identified risks"]
+        }
+
+
+LEAD_SCORE_TABLE = LeadScoreTable(LEAD_BUDGET_OPTIONS, LEAD_URGENCY_OPTIONS, LEAD_AUTHORITY_OPTIONS, LEAD_INDUSTRY_OPTIONS)
+
+
 def _intelligent_campaign_fallback(product_desc, audience, platform, industry):
-    """Fallback campaign generation when Groq is unavailable."""
+    """Fallback campaign generation when Groq is unavailable, rendered by the template tier."""
     return {
         "status": "success",
-        "campaign": {
-            "campaign_ideas": [
-                {"title": f"{industry} Growth Accelerator", "description": f"A data-driven campaign targeting {audience} on {platform} focusing on the unique benefits of {product_desc[:30]}..."},
-                {"title": "Problem-Solver Spotlight", "description": "Showcase how your solution directly addresses the core pain points of the industry."},
-                {"title": "Customer Success Stories", "description": "Highlight transformations achieved by similar companies in the sector."},
-                {"title": "Expert Insights Series", "description": "Educational content providing value and establishing authority."},
-                {"title": "Limited-Time Offer Launch", "description": f"Urgency-based campaign for {platform} users."}
-            ],
-            "cta_suggestions": [
-                {"cta_text": "Start Your Free Trial", "description": "Best for educational content to lower barrier to entry."},
-                {"cta_text": "Download the Whitepaper", "description": "Perfect for B2B lead generation and authority building."},
-                {"cta_text": "Schedule a Demo", "description": "Used for high-intent prospects nearing decision phase."},
-                {"cta_text": "Get a Custom Quote", "description": "Effective for personalized/enterprise solutions."},
-                {"cta_text": "Learn More", "description": "Generalized CTA for awareness-stage content."}
-            ],
-            "content_calendar": [
-                {"day": 1, "post_type": "Educational", "content_idea": f"The future of {industry} and why {product_desc[:20]} matters.", "best_time": "9 AM"},
-                {"day": 2, "post_type": "Engagement", "content_idea": "Poll: What is your biggest challenge in this industry?", "best_time": "12 PM"},
-                {"day": 3, "post_type": "Promotional", "content_idea": f"Deep dive into a key feature of {product_desc[:20]}.", "best_time": "3 PM"},
-                {"day": 4, "post_type": "Educational", "content_idea": "3 pitfalls to avoid in current market conditions.", "best_time": "10 AM"},
-                {"day": 5, "post_type": "Social Proof", "content_idea": "Client testimonial and ROI results.", "best_time": "1 PM"},
-                {"day": 6, "post_type": "Educational", "content_idea": "How-to guide for optimizing your current workflow.", "best_time": "11 AM"},
-                {"day": 7, "post_type": "Promotional", "content_idea": "Last call for the weekly specialized session.", "best_time": "2 PM"}
-            ],
-            "competitor_analysis": {
-                "common_strategies": ["Heavy emphasis on pricing", "Generic feature-based marketing", "Broad audience targeting"],
-                "gaps_opportunities": ["Lack of personalized support", "Unclear ROI metrics", "Missing specific integration features"],
-                "differentiation_tactics": ["Emphasize explainable AI", "Focus on niche expertise", "Provide superior implementation support"]
-            }
-        },
+        "campaign": render_campaign(product_desc, audience, platform, industry),
         "ai_model": "Intelligent Fallback (Strategy-based)"
     }
 
 
 def _intelligent_pitch_fallback(product, description, persona, industry, customer_type, budget_preference, language):
-    """Fallback pitch generation when Groq is unavailable."""
-    # Basic English templates for fallback
-    pitch_templates = {
-        "elevator_pitch": f"We help {persona} in the {industry} sector achieve better results through {product}. In a market where {description[:40]}... is critical, our solution ensures you stand out by addressing your specific {customer_type} needs while respecting your {budget_preference} requirements.",
-        "value_proposition": f"The most efficient way for {industry} professionals to scale operations without complexity.",
-        "personalized_cta": f"Would you like to see how {product} can transform your {industry} strategy?"
-    }
-    
-    # Mock language support for key Indian languages (simplified)
-    if language == "Hindi":
-        pitch_templates["elevator_pitch"] = f"हम {industry} क्षेत्र में {persona} को {product} के माध्यम से अपने लक्ष्यों को प्राप्त करने में मदद करते हैं। एक ऐसे बाजार में जहां {description[:30]}... महत्वपूर्ण है, हमारा समाधान आपकी विशिष्ट आवश्यकताओं को पूरा करता है।"
-        pitch_templates["value_proposition"] = "बेहतर व्यवसाय विकास के लिए एआई-संचालित समाधान।"
-        pitch_templates["personalized_cta"] = "आज ही अपना डेमो बुक करें।"
-    elif language == "Telugu":
-        pitch_templates["elevator_pitch"] = f"మేము {industry} రంగంలో {persona} కి {product} ద్వారా మెరుగైన ఫలితాలను సాధించడంలో సహాయపడతాము. {description[:30]}... కీలకమైన ఈ మార్కెట్‌లో, మా పరిష్కారం మీ అవసరాలను తీరుస్తుంది."
-        pitch_templates["value_proposition"] = "మీ వ్యాపారాన్ని AI తో వృద్ధి చేద్దాం."
-        pitch_templates["personalized_cta"] = "మరిన్ని వివరాల కోసం ఈరోజే సంప్రదించండి."
-    
+    """Fallback pitch generation when Groq is unavailable, rendered by the template tier."""
     return {
         "status": "success",
-        "pitch": {
-            "elevator_pitch": pitch_templates["elevator_pitch"],
-            "value_proposition": pitch_templates["value_proposition"],
-            "key_differentiators": [
-                "Proprietary AI Engine optimized for results",
-                f"Deep {industry} expertise built-in",
-                "Zero-friction implementation process"
-            ],
-            "personalized_cta": pitch_templates["personalized_cta"],
-            "deal_confidence_score": 80,
-            "confidence_breakdown": {
-                "budget_alignment": "Strong fit for specified range",
-                "pain_point_fit": "Directly addresses core needs",
-                "authority_match": f"Tailored for {persona}",
-                "timeline_fit": "High readiness detected"
-            },
-            "reasoning": {
-                "why_this_pitch": "Focuses on value over features",
-                "industry_nuances": f"Addresses {industry} challenges",
-                "size_considerations": f"Scaled for {customer_type}",
-                "objection_handling": "Pre-emptively addresses ROI concerns"
-            },
-            "recommended_next_actions": [
-                "Send personalized proposal",
-                "Book a 15-minute discovery call",
-                "Share relevant case studies"
-            ]
-        },
+        "pitch": render_pitch(product, description, persona, industry, customer_type, budget_preference, language),
         "ai_model": f"Intelligent Fallback ({language} Template)"
     }
 
-def generate_huggingface_image(prompt):
-    """
-    Generate image using HuggingFace Inference API.
-    Returns base64 encoded image string.
-    """
+# Generic poster background; social posts append product context, the pool appends an industry theme
+SOCIAL_BACKGROUND_PROMPT = "Modern professional SaaS marketing poster background, abstract tech gradient, minimal clean layout, dark or soft gradient theme, space for headline and call-to-action text, suitable for professional promotion, corporate style, high quality background, no text"
+POOL_INDUSTRIES = list(INDUSTRY_TONES.keys()) + ['General']
+
+
+async def _request_huggingface_image(prompt):
+    """Call the HuggingFace Inference API and return the raw image bytes, or None"""
     if not HF_API_KEY:
         print("[WARNING] HUGGING_FACE_API_KEY missing. Image generation skipped.")
         return None
@@ -628,27 +1810,145 @@ def generate_huggingface_image(prompt):
         headers = {"Authorization": f"Bearer {HF_API_KEY}"}
         payload = {"inputs": prompt, "options": {"wait_for_model": True}}
         
-        response = requests.post(HF_IMAGE_MODEL, headers=headers, json=payload)
+        with huggingface_breaker.guard() as call:
+            response = await async_provider_http.post(HF_IMAGE_MODEL, headers=headers, json=payload,
+                                                      timeout=HF_IMAGE_TIMEOUT)
+            if response.status_code >= 500 or response.status_code == 429:
+                call.failed()
         
         if response.status_code == 200:
-            import base64
-            img_base64 = base64.b64encode(response.content).decode('utf-8')
-            return f"data:image/jpeg;base64,{img_base64}"
+            return response.content
         else:
             print(f"[ERROR] HF API Error: {response.status_code} - {response.text}")
             return None
+    except CircuitOpenError as e:
+        print(f"[WARNING] {e}. Image generation skipped.")
+        return None
     except Exception as e:
         print(f"[ERROR] HF Image generation failed: {e}")
         return None
 
 
-def generate_social_post(product, dept, description, contact, others):
+async def _generate_image_digest(prompt):
+    """Return the stored image digest for a prompt, generating it only on an image cache miss"""
+    digest = image_cache.get(prompt)
+    if digest is not None:
+        return digest
+    return await _generate_new_image_digest(prompt)
+
+
+async def _generate_new_image_digest(prompt):
+    """Generate an image, store it and remember it in the image cache"""
+    return await single_flight.do('image', normalize_image_prompt(prompt), lambda: _store_new_image(prompt))
+
+
+async def _store_new_image(prompt):
+    data = await _request_huggingface_image(prompt)
+    if data is None:
+        return None
+    
+    digest = await asyncio.to_thread(lambda: get_image_store().put(data))
+    image_cache.put(prompt, digest, data)
+    return digest
+
+
+def generate_huggingface_image(prompt):
+    """
+    Generate image using HuggingFace Inference API.
+    Blocking wrapper around agenerate_huggingface_image.
+    """
+    return _run_sync(agenerate_huggingface_image(prompt))
+
+
+@_engine_coroutine
+async def agenerate_huggingface_image(prompt):
+    """
+    Async image generation.
+    Stores the bytes in the content-addressed image store and returns its URL.
+    Prompts already generated (after normalization) are served from the image cache.
+    """
+    digest = await _generate_image_digest(prompt)
+    return image_url_for(digest) if digest else None
+
+
+def _infer_industry(*texts):
+    """Pick the pool industry mentioned in free-text post inputs"""
+    combined = ' '.join(t for t in texts if t).lower()
+    for industry in INDUSTRY_TONES:
+        if industry.lower() in combined:
+            return industry
+    return 'General'
+
+
+def start_image_pool_warmer():
+    """Start filling the pre-warmed background pool (IMAGE_POOL_ENABLED)"""
+    if not IMAGE_POOL_ENABLED or not HF_API_KEY:
+        return
+    image_pool.start(
+        POOL_INDUSTRIES,
+        lambda industry, variant: _run_sync(_generate_new_image_digest(
+            f"{SOCIAL_BACKGROUND_PROMPT}, {industry} industry theme, variation {variant + 1}"
+        ))
+    )
+
+
+def generate_social_post(product, dept, description, contact, others, progress=None, industry=None):
     """
     Generate post creation content using Pollinations AI.
     Focuses on high-quality text generation for CSS-based posters.
+    progress, if given, is called as progress(percent, stage) as each step starts.
+    When the product-specific background is not cached and a pooled background exists for
+    the industry, the pooled one is used and 'pending_image_prompt' is returned so the caller
+    can generate the specific image lazily (see refresh_social_post_image).
+    Blocking wrapper around agenerate_social_post.
+    """
+    return _run_sync(agenerate_social_post(product, dept, description, contact, others, progress, industry))
+
+
+@_engine_coroutine
+async def agenerate_social_post(product, dept, description, contact, others, progress=None, industry=None):
     """
+    Async social post generation.
+    progress is a blocking callable; it is run off the engine loop.
+    Identical requests already in flight share one upstream call; only the first caller's
+    progress callback is reported to.
+    """
+    key = make_cache_key('social_post', 'pollinations', product, dept, description, contact, others, industry)
+    return await single_flight.do(
+        'social_post', key,
+        lambda: _request_social_post(product, dept, description, contact, others, progress, industry)
+    )
+
+
+async def _request_social_post(product, dept, description, contact, others, progress, industry):
+    """Make one upstream social post generation (captions plus background image)"""
+    async def report(percent, stage):
+        if progress is not None:
+            await asyncio.to_thread(progress, percent, stage)
+    
     try:
-        # 1. Generate Captions and Tagline using Pollinations Text API
+        # 1. Start the Background Image on HuggingFace; it does not depend on the captions
+        image_prompt = SOCIAL_BACKGROUND_PROMPT
+        
+        # Enrich prompt with product context
+        if product and description:
+            image_prompt += f", inspired by {product} ({description[:50]})"
+        
+        pending_image_prompt = None
+        image_task = None
+        cached_digest = image_cache.get(image_prompt)
+        pooled_digest = None
+        if cached_digest is None and IMAGE_POOL_ENABLED:
+            pooled_digest = image_pool.pick(industry or _infer_industry(dept, description, others))
+        
+        if cached_digest is None and pooled_digest is None:
+            image_deadline = time.monotonic() + HF_IMAGE_TIMEOUT
+            image_task = asyncio.create_task(_generate_new_image_digest(image_prompt))
+        elif pooled_digest is not None:
+            pending_image_prompt = image_prompt
+        
+        # 2. Generate Captions and Tagline (Pollinations text by default), concurrently with the image
+        await report(10, 'Writing captions and generating background image')
         system_msg = "You are a professional marketing agency director. You must return ONLY valid JSON."
         user_msg = f"""Create a multi-platform sales campaign.
 
@@ -676,56 +1976,94 @@ Return ONLY valid JSON:
 }}
 """
         
-        full_prompt = f"System: {system_msg}\nUser: {user_msg}"
-        encoded_prompt = urllib.parse.quote(full_prompt)
-        
-        text_response = requests.get(f"{POLLINATIONS_TEXT_URL}{encoded_prompt}?json=true&model=openai")
-        
-        if text_response.status_code != 200:
-            text_response = requests.get(f"{POLLINATIONS_TEXT_URL}{encoded_prompt}?json=true")
-            
-        if text_response.status_code != 200:
-            return {'status': 'error', 'message': 'Pollinations Text API failed'}
-            
+        call = llm_usage.start('social_post', None)
+        route = {}
+        call.set_route(route)
         try:
-            content = text_response.text
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
+            reply = await router.complete('social_post', route, messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_msg}
+            ])
+            content = reply.text
+        except CircuitOpenError as e:
+            # Skip the network call and use the template captions below
+            print(f"[FALLBACK] {e}. Using template captions.")
+            call.finish(FALLBACK, e)
+            content = ''
+        except Exception as e:
+            call.finish(FALLBACK, e)
+            print(f"[ERROR] Caption generation failed: {e}")
+            if image_task is not None:
+                image_task.cancel()
+            return {'status': 'error', 'message': 'Text API failed'}
             
-            gpt_data = json.loads(content)
-        except:
-            gpt_data = {
-                "tagline": f"Premium {product} for your needs",
-                "captions": {
-                    "LinkedIn": f"🚀 Boost your sales with {product} from {dept}! {description} \n\n📞 Contact: {contact}",
-                    "Instagram": f"Transform your workflow with {product}! ✨ #Innovation {dept} #BusinessSuccess",
-                    "Twitter": f"Experience excellence with {product}. Get in touch today! 📞 {contact}"
-                }
+        template_data = {
+            "tagline": f"Premium {product} for your needs",
+            "captions": {
+                "LinkedIn": f"🚀 Boost your sales with {product} from {dept}! {description} \n\n📞 Contact: {contact}",
+                "Instagram": f"Transform your workflow with {product}! ✨ #Innovation {dept} #BusinessSuccess",
+                "Twitter": f"Experience excellence with {product}. Get in touch today! 📞 {contact}"
             }
+        }
+        try:
+            gpt_data = parse_json_object(content)
+        except Exception as e:
+            call.finish(PARSE_ERROR, e)
+            gpt_data = template_data
+        
+        # Keep whatever the model did return; only missing sections use the template
+        missing = validate_sections(gpt_data, SOCIAL_POST_SCHEMA)
+        if missing:
+            call.finish(PARTIAL, f"Missing sections: {', '.join(missing)}")
+            for key in missing:
+                gpt_data[key] = template_data[key]
+        else:
+            call.finish(SUCCESS)
 
         tagline = gpt_data.get('tagline', "")
         captions = gpt_data.get('captions', {})
 
-        # 2. Generate Background Image using HuggingFace
-        image_prompt = f"Modern professional SaaS marketing poster background, abstract tech gradient, minimal clean layout, dark or soft gradient theme, space for headline and call-to-action text, suitable for professional promotion, corporate style, high quality background, no text"
-        
-        # Enrich prompt with product context
-        if product and description:
-            image_prompt += f", inspired by {product} ({description[:50]})"
-            
-        bg_image_url = generate_huggingface_image(image_prompt)
+        # 3. Collect the Background Image; a failed or late image degrades to no image
+        if image_task is None:
+            bg_image_url = image_url_for(cached_digest or pooled_digest)
+        else:
+            await report(60, 'Finishing background image')
+            try:
+                # wait_for cancels the task on timeout
+                digest = await asyncio.wait_for(image_task, timeout=max(0, image_deadline - time.monotonic()))
+                bg_image_url = image_url_for(digest) if digest else None
+            except asyncio.TimeoutError:
+                print("[WARNING] HF Image generation timed out. Continuing without background image.")
+                bg_image_url = None
+            except Exception as e:
+                print(f"[ERROR] HF Image generation failed: {e}")
+                bg_image_url = None
 
         return {
             'status': 'success',
             'post': {
                 'captions': captions,
                 'tagline': tagline,
-                'image_url': bg_image_url
-            }
+                'image_url': bg_image_url,
+                'image_pending': pending_image_prompt is not None
+            },
+            'pending_image_prompt': pending_image_prompt
         }
 
     except Exception as e:
         print(f"[ERROR] Social post generation error: {e}")
         return {'status': 'error', 'message': str(e)}
+
+
+def refresh_social_post_image(image_prompt, on_ready):
+    """
+    Generate the product-specific background in the background and call
+    on_ready(image_url) once it is stored. Used after a post was served a pooled image.
+    Returns a concurrent.futures.Future; on_ready is blocking and runs off the engine loop.
+    """
+    async def run():
+        image_url = await agenerate_huggingface_image(image_prompt)
+        if image_url:
+            await asyncio.to_thread(on_ready, image_url)
+    
+    return asyncio.run_coroutine_threadsafe(run(), _get_engine_loop())
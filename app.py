@@ -1,5 +1,6 @@
 import os
-from flask import Flask, render_template, request, jsonify
+import traceback
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context, abort
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
 from dotenv import load_dotenv
@@ -7,16 +8,43 @@ from bson.objectid import ObjectId
 
 import auth
 import db
-from ai_engine import generate_campaign, generate_pitch, score_lead, generate_social_post
+from ai_engine import (
+    generate_social_post, stream_campaign, stream_pitch, refresh_social_post_image, start_image_pool_warmer,
+    router_status, regenerate_section, _run_sync
+)
+from generation_routes import (
+    generate_campaign_route, generate_pitch_route, score_lead_route, score_leads_batch_route, is_fresh
+)
+from cache import generation_cache
+from output_parser import get_section
+from circuit_breaker import breaker_status
+from singleflight import single_flight
+from usage import llm_usage
+from activity_log import activity_log_writer
+from jobs import job_queue
+from image_store import get_image_store, sniff_content_type, DIGEST_PATTERN
+from image_cache import image_cache, image_pool
+from streaming import sse_event
 from utils import (
-    save_campaign_to_db, save_pitch_to_db, save_lead_to_db, save_social_post_to_db,
+    save_campaign_to_db, save_pitch_to_db, save_social_post_to_db,
     get_user_campaigns, get_user_pitches, get_user_leads, get_user_social_posts,
     get_campaign_by_id, get_pitch_by_id, get_lead_by_id, get_social_post_by_id,
-    get_user_activity, save_feedback_to_db, delete_pitch_from_db, delete_social_post_from_db
+    get_user_activity, save_feedback_to_db, delete_pitch_from_db, delete_social_post_from_db,
+    update_social_post_image, replace_section_in_db, pitch_has_variant, save_feedbacks_to_db, pitch_variant_ids,
+    get_feedback_stats, get_item_feedback_stats, FEEDBACK_ROLLUP_SCOPES
 )
 
 load_dotenv()
 
+MAX_FEEDBACK_BATCH = int(os.getenv('MAX_FEEDBACK_BATCH', '200'))
+# Largest page_size accepted by the history list endpoints
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '100'))
+# Longest window /api/engine/usage summarizes (llm_calls is capped, so older calls may be gone anyway)
+MAX_USAGE_HOURS = float(os.getenv('MAX_USAGE_HOURS', str(30 * 24)))
+# Stored inputs sent back to the model when one section is regenerated
+CAMPAIGN_INPUT_FIELDS = ('product', 'audience', 'platform', 'industry')
+PITCH_INPUT_FIELDS = ('product', 'description', 'persona', 'industry', 'customer_type', 'budget_preference')
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')
@@ -28,6 +56,104 @@ jwt = JWTManager(app)
 db.init_db()
 
 
+def _generation_response(handler):
+    """Run a generation_routes handler on the engine loop and turn its (status, payload) into a response"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Invalid JSON body'}), 400
+        status, payload = _run_sync(handler(get_jwt_identity(), data, request.args))
+    except Exception as e:
+        print(f"[ERROR] {request.path} failed: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+    return jsonify(payload), status
+
+
+def _history_page(fetch, key, default_page_size, projections=True):
+    """
+    One page of a user's history list as { <key>: [...], count, next_cursor }.
+    Reads page_size (capped at MAX_PAGE_SIZE) and the opaque cursor of the previous page
+    from the query string; next_cursor is null on the last page. Lists with projections
+    return summary rows unless fields=full is given.
+    """
+    options = {}
+    if projections:
+        options['fields'] = request.args.get('fields', 'summary')
+        if options['fields'] not in ('summary', 'full'):
+            return jsonify({'error': 'fields must be summary or full'}), 400
+    
+    try:
+        page_size = int(request.args.get('page_size', default_page_size))
+    except ValueError:
+        return jsonify({'error': 'page_size must be a number'}), 400
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'page_size must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    
+    try:
+        items, next_cursor = fetch(get_jwt_identity(), page_size, request.args.get('cursor') or None, **options)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        key: items,
+        'count': len(items),
+        'next_cursor': next_cursor
+    }), 200
+
+
+def _regenerate_section(item_type, item, user_id, data, input_fields):
+    """Regenerate one section of a stored campaign or pitch and keep the old value as a version"""
+    if not item:
+        return jsonify({'error': f'{item_type.title()} not found'}), 404
+    
+    if str(item['user_id']) != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    path = data.get('section')
+    if not isinstance(path, str) or not path.strip():
+        return jsonify({'error': 'section is required, e.g. "reasoning.objection_handling" or "campaign_ideas.2"'}), 400
+    path = path.strip()
+    
+    try:
+        previous = get_section(item['ai_output'], path)
+    except KeyError:
+        return jsonify({'error': f'Unknown section: {path}'}), 400
+    
+    inputs = {field: item[field] for field in input_fields if item.get(field)}
+    ai_result = regenerate_section(item_type, inputs, item['ai_output'], path, data.get('instructions'))
+    
+    if ai_result['status'] != 'success':
+        return jsonify(ai_result), 503
+    
+    has_translations = bool(item.get('translations'))
+    if not replace_section_in_db(item_type, item['_id'], user_id, path, previous, ai_result['value'],
+                                 ai_result['ai_model'], has_variants=bool(item.get('variants')),
+                                 has_translations=has_translations):
+        return jsonify({'error': 'The section was changed by another request. Please try again.'}), 409
+    
+    response = {
+        f'{item_type}_id': item['_id'],
+        'section': path,
+        'value': ai_result['value'],
+        'revision': item.get('revision', 0) + 1,
+        'message': 'Section regenerated successfully'
+    }
+    if has_translations:
+        # The translations still hold the previous text of this section
+        response['stale_translations'] = sorted(set(item.get('stale_translations') or []) | {path})
+    return jsonify(response), 200
+
+
+def _sse_response(events):
+    """Wrap an SSE event generator in an unbuffered streaming response"""
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 # ============= AUTHENTICATION ROUTES =============
 
 @app.route('/api/auth/register', methods=['POST'])
@@ -73,60 +199,63 @@ def get_user():
 @app.route('/api/campaigns/generate', methods=['POST'])
 @jwt_required()
 def generate_campaign_handler():
-    """Generate marketing campaign"""
-    try:
-        user_id = get_jwt_identity()
-        data = request.get_json()
-        
-        product = data.get('product')
-        audience = data.get('audience')
-        platform = data.get('platform')
-        industry = data.get('industry')
-        
-        if not all([product, audience, platform, industry]):
-            return jsonify({'error': 'Missing required fields'}), 400
-        
-        print(f"Generating campaign for: {product}, {platform}, {industry}")
-        
-        # Generate campaign using AI
-        ai_result = generate_campaign(product, audience, platform, industry)
-        
-        print(f"AI Result status: {ai_result.get('status')}")
+    """Generate marketing campaign; a platforms array generates one campaign per platform"""
+    return _generation_response(generate_campaign_route)
+
+
+@app.route('/api/campaigns/generate/stream', methods=['POST'])
+@jwt_required()
+def stream_campaign_handler():
+    """Generate marketing campaign, streaming tokens and sections over SSE"""
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    product = data.get('product')
+    audience = data.get('audience')
+    platform = data.get('platform')
+    industry = data.get('industry')
+    
+    if not all([product, audience, platform, industry]):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    fresh = is_fresh(data, request.args)
+    
+    def events():
+        yield sse_event('start', {'platform': platform})
+        ai_result = None
+        for event, payload in stream_campaign(product, audience, platform, industry, fresh=fresh):
+            if event == 'result':
+                ai_result = payload
+            else:
+                yield sse_event(event, payload)
         
-        if ai_result['status'] != 'success':
-            print(f"AI Error: {ai_result.get('error')}")
-            return jsonify(ai_result), 500
+        if not ai_result or ai_result['status'] != 'success':
+            yield sse_event('error', ai_result or {'error': 'Campaign generation failed'})
+            return
         
-        # Save to database
+        # Persist once the stream has finished
         campaign_id = save_campaign_to_db(
             ObjectId(user_id),
             product, audience, platform, industry,
             ai_result['campaign']
         )
         
-        return jsonify({
+        yield sse_event('done', {
             'campaign_id': campaign_id,
             'campaign': ai_result['campaign'],
+            'ai_model': ai_result.get('ai_model'),
+            'cached': ai_result.get('cached', False),
             'message': 'Campaign generated successfully'
-        }), 201
-    except Exception as e:
-        print(f"Campaign generation error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        })
+    
+    return _sse_response(events())
 
 
 @app.route('/api/campaigns', methods=['GET'])
 @jwt_required()
 def get_campaigns():
     """Get user's campaigns"""
-    user_id = get_jwt_identity()
-    campaigns = get_user_campaigns(user_id)
-    
-    return jsonify({
-        'campaigns': campaigns,
-        'count': len(campaigns)
-    }), 200
+    return _history_page(get_user_campaigns, 'campaigns', 10)
 
 
 @app.route('/api/campaigns/<campaign_id>', methods=['GET'])
@@ -145,68 +274,81 @@ def get_campaign(campaign_id):
     return jsonify(campaign), 200
 
 
+@app.route('/api/campaigns/<campaign_id>/regenerate', methods=['POST'])
+@jwt_required()
+def regenerate_campaign_section(campaign_id):
+    """Regenerate one section of a campaign"""
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    return _regenerate_section('campaign', get_campaign_by_id(campaign_id), user_id, data, CAMPAIGN_INPUT_FIELDS)
+
+
 # ============= PITCH ROUTES =============
 
 @app.route('/api/pitches/generate', methods=['POST'])
 @jwt_required()
 def generate_pitch_handler():
-    """Generate sales pitch"""
-    try:
-        user_id = get_jwt_identity()
-        data = request.get_json()
-        
-        product = data.get('product')
-        description = data.get('description')
-        persona = data.get('persona')
-        industry = data.get('industry')
-        customer_type = data.get('customer_type')
-        budget_preference = data.get('budget_preference')
-        language = data.get('language', 'English')
-        
-        if not all([product, description, persona, industry, customer_type, budget_preference]):
-            return jsonify({'error': 'Missing required fields'}), 400
-        
-        print(f"Generating pitch for: {product}, {language}")
-        
-        # Generate pitch using AI
-        ai_result = generate_pitch(product, description, persona, industry, customer_type, budget_preference, language)
-        
-        print(f"AI Result status: {ai_result.get('status')}")
+    """Generate sales pitch; variants=N generates N A/B variants, languages=[...] translates it"""
+    return _generation_response(generate_pitch_route)
+
+
+@app.route('/api/pitches/generate/stream', methods=['POST'])
+@jwt_required()
+def stream_pitch_handler():
+    """Generate sales pitch, streaming tokens and sections over SSE"""
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    product = data.get('product')
+    description = data.get('description')
+    persona = data.get('persona')
+    industry = data.get('industry')
+    customer_type = data.get('customer_type')
+    budget_preference = data.get('budget_preference')
+    language = data.get('language', 'English')
+    
+    if not all([product, description, persona, industry, customer_type, budget_preference]):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    fresh = is_fresh(data, request.args)
+    
+    def events():
+        yield sse_event('start', {'language': language})
+        ai_result = None
+        for event, payload in stream_pitch(product, description, persona, industry, customer_type,
+                                           budget_preference, language, fresh=fresh):
+            if event == 'result':
+                ai_result = payload
+            else:
+                yield sse_event(event, payload)
         
-        if ai_result['status'] != 'success':
-            print(f"AI Error: {ai_result.get('error')}")
-            return jsonify(ai_result), 500
+        if not ai_result or ai_result['status'] != 'success':
+            yield sse_event('error', ai_result or {'error': 'Pitch generation failed'})
+            return
         
-        # Save to database
+        # Persist once the stream has finished
         pitch_id = save_pitch_to_db(
             ObjectId(user_id),
             product, description, persona, industry, customer_type, budget_preference,
             ai_result['pitch']
         )
         
-        return jsonify({
+        yield sse_event('done', {
             'pitch_id': pitch_id,
             'pitch': ai_result['pitch'],
+            'ai_model': ai_result.get('ai_model'),
+            'cached': ai_result.get('cached', False),
             'message': 'Pitch generated successfully'
-        }), 201
-    except Exception as e:
-        print(f"Pitch generation error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        })
+    
+    return _sse_response(events())
 
 
 @app.route('/api/pitches', methods=['GET'])
 @jwt_required()
 def get_pitches():
     """Get user's pitches"""
-    user_id = get_jwt_identity()
-    pitches = get_user_pitches(user_id)
-    
-    return jsonify({
-        'pitches': pitches,
-        'count': len(pitches)
-    }), 200
+    return _history_page(get_user_pitches, 'pitches', 10)
 
 
 @app.route('/api/pitches/<pitch_id>', methods=['GET'])
@@ -225,6 +367,15 @@ def get_pitch(pitch_id):
     return jsonify(pitch), 200
 
 
+@app.route('/api/pitches/<pitch_id>/regenerate', methods=['POST'])
+@jwt_required()
+def regenerate_pitch_section(pitch_id):
+    """Regenerate one section of a pitch"""
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    return _regenerate_section('pitch', get_pitch_by_id(pitch_id), user_id, data, PITCH_INPUT_FIELDS)
+
+
 @app.route('/api/pitches/<pitch_id>', methods=['DELETE'])
 @jwt_required()
 def delete_pitch(pitch_id):
@@ -243,49 +394,21 @@ def delete_pitch(pitch_id):
 @jwt_required()
 def score_lead_handler():
     """Score a lead"""
-    user_id = get_jwt_identity()
-    data = request.get_json()
-    
-    budget = data.get('budget')
-    business_need = data.get('business_need')
-    urgency = data.get('urgency')
-    authority = data.get('authority')
-    industry = data.get('industry')
-    
-    if not all([budget, business_need, urgency, authority, industry]):
-        return jsonify({'error': 'Missing required fields'}), 400
-    
-    # Score lead using AI
-    ai_result = score_lead(budget, business_need, urgency, authority, industry)
-    
-    if ai_result['status'] != 'success':
-        return jsonify(ai_result), 500
-    
-    # Save to database
-    lead_id = save_lead_to_db(
-        ObjectId(user_id),
-        budget, business_need, urgency, authority, industry,
-        ai_result['lead_score']
-    )
-    
-    return jsonify({
-        'lead_id': lead_id,
-        'lead_score': ai_result['lead_score'],
-        'message': 'Lead scored successfully'
-    }), 201
+    return _generation_response(score_lead_route)
+
+
+@app.route('/api/leads/score/batch', methods=['POST'])
+@jwt_required()
+def score_leads_batch_handler():
+    """Score a batch of leads"""
+    return _generation_response(score_leads_batch_route)
 
 
 @app.route('/api/leads', methods=['GET'])
 @jwt_required()
 def get_leads():
     """Get user's scored leads"""
-    user_id = get_jwt_identity()
-    leads = get_user_leads(user_id)
-    
-    return jsonify({
-        'leads': leads,
-        'count': len(leads)
-    }), 200
+    return _history_page(get_user_leads, 'leads', 10)
 
 
 @app.route('/api/leads/<lead_id>', methods=['GET'])
@@ -309,7 +432,7 @@ def get_lead(lead_id):
 @app.route('/api/social-media/generate', methods=['POST'])
 @jwt_required()
 def generate_social_post_handler():
-    """Generate post creation content"""
+    """Queue post creation content generation"""
     user_id = get_jwt_identity()
     data = request.get_json()
     
@@ -322,37 +445,67 @@ def generate_social_post_handler():
     if not all([product, dept, description, contact]):
         return jsonify({'error': 'Missing required fields'}), 400
     
-    # Generate social post using AI
-    ai_result = generate_social_post(product, dept, description, contact, others)
+    # Generate the post in the background; clients poll /api/jobs/<job_id>
+    job_id = job_queue.enqueue(ObjectId(user_id), 'social_post', {
+        'product': product,
+        'dept': dept,
+        'description': description,
+        'contact': contact,
+        'others': others,
+        'industry': data.get('industry')
+    })
+    
+    if job_id is None:
+        return jsonify({'error': 'Post generation is busy or the database is unavailable. Please try again.'}), 503
+    
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'message': 'Post generation started'
+    }), 202
+
+
+def _run_social_post_job(job, progress):
+    """Background job handler: generate a social post and persist it"""
+    params = job['params']
+    ai_result = generate_social_post(
+        params['product'], params['dept'], params['description'], params['contact'], params['others'],
+        progress=progress, industry=params.get('industry')
+    )
     
     if ai_result['status'] != 'success':
-        return jsonify(ai_result), 500
+        raise Exception(ai_result.get('message', 'Post generation failed'))
     
-    # Save to database
+    progress(90, 'Saving post')
     post_id = save_social_post_to_db(
-        ObjectId(user_id),
-        product, dept, description, contact, others,
+        job['user_id'],
+        params['product'], params['dept'], params['description'], params['contact'], params['others'],
         ai_result['post']
     )
     
-    return jsonify({
+    # The post was served a pooled background; swap in the product-specific one when ready
+    if ai_result.get('pending_image_prompt') and post_id:
+        refresh_social_post_image(
+            ai_result['pending_image_prompt'],
+            lambda image_url: update_social_post_image(post_id, image_url)
+        )
+    
+    return {
         'post_id': post_id,
-        'post': ai_result['post'],
-        'message': 'Post created successfully'
-    }), 201
+        'post': ai_result['post']
+    }
+
+
+job_queue.register('social_post', _run_social_post_job)
+job_queue.resume_pending()
+start_image_pool_warmer()
 
 
 @app.route('/api/social-media', methods=['GET'])
 @jwt_required()
 def get_social_posts():
     """Get user's created posts"""
-    user_id = get_jwt_identity()
-    posts = get_user_social_posts(user_id)
-    
-    return jsonify({
-        'posts': posts,
-        'count': len(posts)
-    }), 200
+    return _history_page(get_user_social_posts, 'posts', 10)
 
 
 @app.route('/api/social-media/<post_id>', methods=['GET'])
@@ -383,33 +536,109 @@ def delete_social_post(post_id):
     return jsonify({'error': 'Failed to delete post or unauthorized'}), 404
 
 
+# ============= IMAGE ROUTES =============
+
+@app.route('/api/images/<digest>', methods=['GET'])
+def get_image(digest):
+    """Serve a content-addressed image (public so <img> and CSS backgrounds can load it)"""
+    if not DIGEST_PATTERN.match(digest):
+        abort(404)
+    
+    cache_headers = {
+        'ETag': f'"{digest}"',
+        'Cache-Control': 'public, max-age=31536000, immutable'
+    }
+    
+    # Content never changes for a digest, so a matching ETag is always fresh
+    if request.if_none_match.contains(digest):
+        return Response(status=304, headers=cache_headers)
+    
+    # Recently generated images are still in memory
+    data = image_cache.get_bytes(digest)
+    if data is not None:
+        return Response(data, mimetype=sniff_content_type(data), headers=cache_headers)
+    
+    image = get_image_store().open(digest)
+    if image is None:
+        abort(404)
+    
+    chunks, content_type, length = image
+    return Response(chunks, mimetype=content_type, headers=dict(cache_headers, **{'Content-Length': str(length)}))
+
+
+# ============= JOB ROUTES =============
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """Get background job status and progress"""
+    user_id = get_jwt_identity()
+    job = job_queue.get(job_id)
+    
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if str(job['user_id']) != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify({
+        'job_id': str(job['_id']),
+        'type': job['type'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'stage': job['stage'],
+        'result': job.get('result'),
+        'error': job.get('error'),
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    }), 200
+
+
 # ============= FEEDBACK ROUTES =============
 
+def _feedback_from_request(data):
+    """Feedback dict for save_feedback(s)_to_db from a request item, or None if required fields are missing"""
+    if not isinstance(data, dict):
+        return None
+    content_id = data.get('content_id')
+    content_type = data.get('content_type')  # 'campaign', 'pitch', 'lead'
+    is_positive = data.get('is_positive')  # True for Up, False for Down
+    if content_id is None or content_type is None or is_positive is None:
+        return None
+    return {
+        # Canonical lowercase hex, so ids that differ only in case are one item
+        'item_id': str(ObjectId(content_id)) if ObjectId.is_valid(content_id) else content_id,
+        'item_type': content_type,
+        'rating': 1 if is_positive else -1,
+        'reasons': data.get('reasons', []),
+        'details': data.get('details', ''),
+        'variant_id': data.get('variant_id')  # e.g. 'v2' for one variant of a multi-variant pitch
+    }
+
+
 @app.route('/api/feedback', methods=['POST'])
 @jwt_required()
 def submit_feedback():
     """Submit feedback for AI generated content"""
     user_id = get_jwt_identity()
-    data = request.get_json()
-    
-    content_id = data.get('content_id')
-    content_type = data.get('content_type') # 'campaign', 'pitch', 'lead'
-    is_positive = data.get('is_positive') # True for Up, False for Down
-    reasons = data.get('reasons', [])
-    details = data.get('details', '')
+    feedback = _feedback_from_request(request.get_json())
     
-    if content_id is None or content_type is None or is_positive is None:
+    if feedback is None:
         return jsonify({'error': 'Missing required fields'}), 400
     
-    rating = 1 if is_positive else -1
+    variant_id = feedback['variant_id']
+    if variant_id is not None and (feedback['item_type'] != 'pitch' or
+                                   not pitch_has_variant(feedback['item_id'], variant_id)):
+        return jsonify({'error': 'Unknown variant_id for this content'}), 400
     
     feedback_id = save_feedback_to_db(
         ObjectId(user_id),
-        content_id,
-        content_type,
-        rating,
-        reasons,
-        details
+        feedback['item_id'],
+        feedback['item_type'],
+        feedback['rating'],
+        feedback['reasons'],
+        feedback['details'],
+        variant_id
     )
     
     return jsonify({
@@ -418,21 +647,124 @@ def submit_feedback():
     }), 201
 
 
+@app.route('/api/feedback/batch', methods=['POST'])
+@jwt_required()
+def submit_feedback_batch():
+    """Submit many ratings at once (e.g. queued while offline) with one bulk write"""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True)
+    
+    items = data.get('feedback') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'feedback must be a non-empty array'}), 400
+    
+    if len(items) > MAX_FEEDBACK_BATCH:
+        return jsonify({'error': f'At most {MAX_FEEDBACK_BATCH} ratings per batch'}), 400
+    
+    feedbacks = [_feedback_from_request(item) for item in items]
+    invalid = [i for i, feedback in enumerate(feedbacks)
+               if feedback is None or not ObjectId.is_valid(feedback['item_id'])]
+    if invalid:
+        return jsonify({'error': 'Missing required fields', 'invalid_indexes': invalid}), 400
+    
+    variants = pitch_variant_ids([feedback['item_id'] for feedback in feedbacks
+                                  if feedback['variant_id'] is not None and feedback['item_type'] == 'pitch'])
+    invalid = [i for i, feedback in enumerate(feedbacks)
+               if feedback['variant_id'] is not None and
+               feedback['variant_id'] not in variants.get(feedback['item_id'], ())]
+    if invalid:
+        return jsonify({'error': 'Unknown variant_id for this content', 'invalid_indexes': invalid}), 400
+    
+    inserted, updated = save_feedbacks_to_db(ObjectId(user_id), feedbacks)
+    
+    return jsonify({
+        'inserted': inserted,
+        'updated': updated,
+        'count': len(feedbacks),
+        'message': 'Feedback submitted successfully'
+    }), 201
+
+
+@app.route('/api/feedback/stats', methods=['GET'])
+@jwt_required()
+def get_feedback_stats_handler():
+    """
+    Thumbs up/down on the user's content per item_type, industry and platform (?scope= to pick some),
+    or for one of their items with ?item_id=; read from the feedback rollups rather than aggregated
+    from raw feedback
+    """
+    user_id = get_jwt_identity()
+    item_id = request.args.get('item_id')
+    
+    if item_id:
+        stats = get_item_feedback_stats(item_id)
+        if stats is None:
+            return jsonify({'error': 'No feedback for this item'}), 404
+        if str(stats.pop('user_id')) != user_id:
+            return jsonify({'error': 'Unauthorized'}), 403
+        return jsonify(stats), 200
+    
+    scopes = request.args.getlist('scope') or list(FEEDBACK_ROLLUP_SCOPES)
+    unknown = [scope for scope in scopes if scope not in FEEDBACK_ROLLUP_SCOPES]
+    if unknown:
+        return jsonify({'error': f"scope must be one of: {', '.join(FEEDBACK_ROLLUP_SCOPES)}"}), 400
+    
+    stats = get_feedback_stats(user_id, scopes)
+    if stats is None:
+        return jsonify({'error': 'Database not connected'}), 503
+    return jsonify(stats), 200
+
+
 # ============= ACTIVITY ROUTES =============
 
 @app.route('/api/activity', methods=['GET'])
 @jwt_required()
 def get_activity():
     """Get user's activity log"""
-    user_id = get_jwt_identity()
-    activities = get_user_activity(user_id)
-    
+    return _history_page(get_user_activity, 'activities', 20, projections=False)
+
+
+# ============= ENGINE ROUTES =============
+
+@app.route('/api/engine/stats', methods=['GET'])
+@jwt_required()
+def get_engine_stats():
+    """Get AI engine cache and coalescing counters per generator, image cache/pool and activity log writer state"""
     return jsonify({
-        'activities': activities,
-        'count': len(activities)
+        'cache': generation_cache.stats(),
+        'single_flight': single_flight.stats(),
+        'image_cache': image_cache.stats(),
+        'image_pool': image_pool.stats(),
+        'activity_log': activity_log_writer.stats()
     }), 200
 
 
+@app.route('/api/engine/usage', methods=['GET'])
+@jwt_required()
+def get_engine_usage():
+    """Get LLM call counts, outcomes, latency and token percentiles per generator"""
+    try:
+        hours = float(request.args.get('hours', 24))
+    except ValueError:
+        return jsonify({'error': 'hours must be a number'}), 400
+    
+    # Also rejects nan and inf, which compare false
+    if not 0 < hours <= MAX_USAGE_HOURS:
+        return jsonify({'error': f'hours must be greater than 0 and at most {MAX_USAGE_HOURS:g}'}), 400
+    
+    summary = llm_usage.summary(hours)
+    if summary is None:
+        return jsonify({'error': 'Database not connected'}), 503
+    return jsonify(summary), 200
+
+
+@app.route('/api/providers/status', methods=['GET'])
+@jwt_required()
+def get_provider_status():
+    """Get the circuit breaker state of each external AI provider and the LLM routing statistics"""
+    return jsonify({'providers': breaker_status(), 'routing': router_status()}), 200
+
+
 # ============= STATIC PAGES =============
 
 @app.route('/')
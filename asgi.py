@@ -0,0 +1,94 @@
+# ASGI entry point: uvicorn asgi:application --workers 2
+#
+# The generation endpoints are served natively async, so one worker process keeps
+# hundreds of LLM calls in flight instead of one per WSGI thread. Every other route
+# (auth, history, jobs, images, pages, streaming) is passed through to the Flask app.
+import json
+import traceback
+from urllib.parse import parse_qs
+from asgiref.wsgi import WsgiToAsgi
+from flask_jwt_extended import decode_token
+
+from app import app
+from generation_routes import GENERATION_ROUTES
+
+flask_application = WsgiToAsgi(app)
+
+
+def _authenticate(headers):
+    """Return the user id from a valid Bearer access token, or None"""
+    authorization = headers.get(b'authorization', b'').decode('latin-1')
+    if not authorization.startswith('Bearer '):
+        return None
+    try:
+        with app.app_context():
+            token = decode_token(authorization[len('Bearer '):])
+    except Exception:
+        return None
+    if token.get('type') != 'access':
+        return None
+    return token.get(app.config.get('JWT_IDENTITY_CLAIM', 'sub'))
+
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload, default=str).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'access-control-allow-origin', b'*')
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def application(scope, receive, send):
+    """Serve the async generation routes; hand everything else to Flask"""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    handler = GENERATION_ROUTES.get(scope.get('path')) if scope['type'] == 'http' else None
+    if handler is None or scope['method'] != 'POST':
+        await flask_application(scope, receive, send)
+        return
+
+    headers = dict(scope.get('headers', []))
+    user_id = _authenticate(headers)
+    if user_id is None:
+        await _send_json(send, 401, {'msg': 'Missing or invalid Authorization Header'})
+        return
+
+    try:
+        data = json.loads(await _read_body(receive) or b'{}')
+    except ValueError:
+        await _send_json(send, 400, {'error': 'Invalid JSON body'})
+        return
+    if not isinstance(data, dict):
+        await _send_json(send, 400, {'error': 'Invalid JSON body'})
+        return
+
+    try:
+        args = {name: values[0] for name, values in parse_qs(scope.get('query_string', b'').decode()).items()}
+        status, payload = await handler(user_id, data, args)
+    except Exception as e:
+        print(f"[ERROR] {scope['path']} failed: {e}")
+        traceback.print_exc()
+        status, payload = 500, {'error': str(e)}
+    await _send_json(send, status, payload)
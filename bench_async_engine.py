@@ -0,0 +1,149 @@
+import asyncio
+import io
+import json
+import os
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+CALLS = 200
+WSGI_THREADS = 8
+PROVIDER_LATENCY = 0.25
+
+# A complete reply: every CAMPAIGN_SCHEMA section filled in, so no call needs a follow-up or fallback
+CAMPAIGN = {
+    "campaign_ideas": [{"title": f"Idea {i}", "description": "A campaign idea"} for i in range(1, 6)],
+    "cta_suggestions": [{"cta_text": f"CTA {i}", "description": "When to use it"} for i in range(1, 6)],
+    "content_calendar": [
+        {"day": day, "post_type": "Educational", "content_idea": "A post idea", "best_time": "9 AM"}
+        for day in range(1, 8)
+    ],
+    "competitor_analysis": {
+        "common_strategies": ["Pricing"], "gaps_opportunities": ["Support"], "differentiation_tactics": ["Focus"]
+    }
+}
+COMPLETION = json.dumps({
+    'id': 'chatcmpl-bench', 'object': 'chat.completion', 'created': 0, 'model': 'bench',
+    'choices': [{'index': 0, 'finish_reason': 'stop',
+                 'message': {'role': 'assistant', 'content': json.dumps(CAMPAIGN)}}],
+    'usage': {'prompt_tokens': 100, 'completion_tokens': 100, 'total_tokens': 200}
+}).encode()
+
+
+class _FallbackCounter(io.TextIOBase):
+    """stdout wrapper counting [FALLBACK] lines printed by the engine while still echoing them"""
+    def __init__(self, stream):
+        self.stream = stream
+        self.fallbacks = 0
+
+    def write(self, text):
+        self.fallbacks += text.count('[FALLBACK]')
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+async def _serve_fake_groq(reader, writer, in_flight, peak, requests):
+    """One keep-alive connection to the stand-in Groq API; every completion answers after PROVIDER_LATENCY"""
+    try:
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+
+            with requests.get_lock():
+                requests.value += 1
+            with in_flight.get_lock():
+                in_flight.value += 1
+                peak.value = max(peak.value, in_flight.value)
+            await asyncio.sleep(PROVIDER_LATENCY)
+            with in_flight.get_lock():
+                in_flight.value -= 1
+
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                         b'Content-Length: %d\r\n\r\n%s' % (len(COMPLETION), COMPLETION))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+
+
+def _run_fake_groq(port, in_flight, peak, requests):
+    async def main():
+        server = await asyncio.start_server(
+            lambda r, w: _serve_fake_groq(r, w, in_flight, peak, requests), '127.0.0.1', 0, backlog=1024
+        )
+        port.value = server.sockets[0].getsockname()[1]
+        await server.serve_forever()
+    asyncio.run(main())
+
+
+def _report(label, elapsed, peak):
+    print(f"{label}: {CALLS} calls in {elapsed:.2f}s "
+          f"({CALLS / elapsed:.0f} calls/s, peak {peak.value} in flight at the provider)")
+    peak.value = 0
+
+
+def bench_async_engine():
+    # The stand-in provider runs in its own process so it does not compete with the engine for the GIL
+    port = multiprocessing.Value('i', 0)
+    in_flight = multiprocessing.Value('i', 0)
+    peak = multiprocessing.Value('i', 0)
+    requests = multiprocessing.Value('i', 0)
+    provider = multiprocessing.Process(target=_run_fake_groq, args=(port, in_flight, peak, requests), daemon=True)
+    provider.start()
+    while not port.value:
+        time.sleep(0.05)
+
+    # The Groq clients read these when ai_engine is imported
+    os.environ['GROQ_API_KEY'] = 'bench'
+    os.environ['GROQ_BASE_URL'] = f"http://127.0.0.1:{port.value}"
+    import ai_engine
+
+    print(f"Provider latency {PROVIDER_LATENCY * 1000:.0f}ms, one process")
+    counter = _FallbackCounter(sys.stdout)
+    sys.stdout = counter
+
+    # Blocking wrappers, one call per WSGI thread
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WSGI_THREADS) as executor:
+        results = list(executor.map(
+            lambda i: ai_engine.generate_campaign(f"sync product {i}", 'SMBs', 'LinkedIn', 'SaaS', fresh=True),
+            range(CALLS)
+        ))
+    sync_elapsed = time.perf_counter() - start
+    _report(f"Sync, {WSGI_THREADS} threads", sync_elapsed, peak)
+
+    async def run_async():
+        return await asyncio.gather(*[
+            ai_engine.agenerate_campaign(f"async product {i}", 'SMBs', 'LinkedIn', 'SaaS', fresh=True)
+            for i in range(CALLS)
+        ])
+
+    start = time.perf_counter()
+    results += asyncio.run(run_async())
+    async_elapsed = time.perf_counter() - start
+    _report("Async, 1 event loop", async_elapsed, peak)
+
+    sys.stdout = counter.stream
+
+    # Every call must be answered by exactly one provider request with the complete fixture
+    failed = sum(1 for result in results
+                 if result.get('ai_model') != ai_engine.MODEL or result.get('campaign') != CAMPAIGN)
+    if failed:
+        print(f"FAIL: {failed} calls fell back or used fallback sections instead of the provider reply")
+    elif counter.fallbacks:
+        print(f"FAIL: {counter.fallbacks} [FALLBACK] path(s) ran")
+    elif requests.value != 2 * CALLS:
+        print(f"FAIL: {requests.value} provider requests for {2 * CALLS} calls (follow-up section requests?)")
+    else:
+        print(f"SUCCESS: {sync_elapsed / async_elapsed:.1f}x more throughput per process on the async path")
+    provider.terminate()
+
+
+if __name__ == "__main__":
+    bench_async_engine()
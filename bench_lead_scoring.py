@@ -0,0 +1,49 @@
+import itertools
+import time
+
+from ai_engine import (
+    LEAD_SCORE_TABLE, LEAD_BUDGET_OPTIONS, LEAD_URGENCY_OPTIONS, LEAD_AUTHORITY_OPTIONS, LEAD_INDUSTRY_OPTIONS,
+    _compute_fallback_lead_score
+)
+
+BUSINESS_NEEDS = [
+    "CRM",
+    "Need a marketing automation platform for the sales team",
+    "Inventory management system with analytics"
+]
+ROUNDS = 20
+
+
+def _time(fn, leads):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for lead in leads:
+            fn(**lead)
+    return time.perf_counter() - start
+
+
+def bench_lead_scoring():
+    leads = [
+        {'budget': b, 'business_need': n, 'urgency': u, 'authority': a, 'industry': i}
+        for b, u, a, i, n in itertools.product(LEAD_BUDGET_OPTIONS, LEAD_URGENCY_OPTIONS, LEAD_AUTHORITY_OPTIONS,
+                                               LEAD_INDUSTRY_OPTIONS, BUSINESS_NEEDS)
+    ]
+    print(f"Lookup table entries: {len(LEAD_SCORE_TABLE)}")
+    print(f"Scoring {len(leads)} canonical leads x {ROUNDS} rounds")
+
+    mismatches = sum(1 for lead in leads if LEAD_SCORE_TABLE.lookup(**lead) != _compute_fallback_lead_score(**lead))
+    if mismatches:
+        print(f"FAIL: {mismatches} leads scored differently by the lookup table")
+        return
+
+    rules_time = _time(_compute_fallback_lead_score, leads)
+    table_time = _time(LEAD_SCORE_TABLE.lookup, leads)
+    total = len(leads) * ROUNDS
+
+    print(f"Rule-based scoring: {rules_time * 1e6 / total:.2f} us/lead")
+    print(f"Lookup table:       {table_time * 1e6 / total:.2f} us/lead")
+    print(f"SUCCESS: {rules_time / table_time:.1f}x faster, identical output")
+
+
+if __name__ == "__main__":
+    bench_lead_scoring()
@@ -0,0 +1,61 @@
+import itertools
+import time
+
+from output_parser import validate_sections, CAMPAIGN_SCHEMA, PITCH_SCHEMA
+from template_tier import (
+    render_campaign, render_pitch, TEMPLATE_INDUSTRIES, TEMPLATE_PLATFORMS, TEMPLATE_LANGUAGES
+)
+
+PRODUCTS = [
+    "Cloud CRM for small sales teams with a built-in AI assistant",
+    "Telehealth scheduling app",
+    "Inventory analytics for multi-store retail chains"
+]
+# Industries outside the known set skip the per-industry pitch text; platforms are always filled in
+EXTRA_INDUSTRIES = ['Gaming']
+EXTRA_PLATFORMS = ['Mastodon']
+ITEMS = 100000
+
+
+def _throughput(render, jobs):
+    start = time.perf_counter()
+    for args in itertools.islice(itertools.cycle(jobs), ITEMS):
+        render(*args)
+    elapsed = time.perf_counter() - start
+    return ITEMS / elapsed, elapsed * 1e6 / ITEMS
+
+
+def bench_template_tier():
+    campaigns = [
+        (product, 'Founders and sales leaders', platform, industry)
+        for product, industry, platform in itertools.product(
+            PRODUCTS, TEMPLATE_INDUSTRIES + EXTRA_INDUSTRIES, TEMPLATE_PLATFORMS + EXTRA_PLATFORMS)
+    ]
+    pitches = [
+        ('MarketAI', product, 'Head of Sales', industry, 'Medium Company', 'Mid Range', language)
+        for product, industry, language in itertools.product(
+            PRODUCTS, TEMPLATE_INDUSTRIES + EXTRA_INDUSTRIES, TEMPLATE_LANGUAGES + ['Tamil'])
+    ]
+
+    invalid = [args for args in campaigns if validate_sections(render_campaign(*args), CAMPAIGN_SCHEMA)]
+    invalid += [args for args in pitches if validate_sections(render_pitch(*args), PITCH_SCHEMA)]
+    if invalid:
+        print(f"FAIL: {len(invalid)} rendered documents do not match the LLM tier schema")
+        return
+
+    first, second = render_campaign(*campaigns[0]), render_campaign(*campaigns[0])
+    first['campaign_ideas'][0]['title'] = 'changed'
+    if second['campaign_ideas'][0]['title'] == 'changed':
+        print("FAIL: rendered documents share containers")
+        return
+
+    print(f"Rendering {ITEMS} items over {len(campaigns)} campaign and {len(pitches)} pitch input combinations")
+    campaign_rate, campaign_us = _throughput(render_campaign, campaigns)
+    pitch_rate, pitch_us = _throughput(render_pitch, pitches)
+    print(f"Campaigns: {campaign_rate:,.0f} items/s ({campaign_us:.2f} us/item)")
+    print(f"Pitches:   {pitch_rate:,.0f} items/s ({pitch_us:.2f} us/item)")
+    print("SUCCESS: every rendered document matches the LLM tier schema")
+
+
+if __name__ == "__main__":
+    bench_template_tier()
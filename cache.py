@@ -0,0 +1,143 @@
+import os
+import copy
+import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+from db import get_db
+
+load_dotenv()
+
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '512'))
+CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', '86400'))
+
+
+def _normalize(value):
+    """Normalize an input value so trivially different submissions share a key"""
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return ' '.join(str(value).split()).lower()
+
+
+def make_cache_key(generator, model, *inputs):
+    """Build a stable SHA-256 key from the generator, model and normalized inputs"""
+    payload = json.dumps([generator, model or '', [_normalize(v) for v in inputs]], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """
+    Two-tier cache for AI generation results.
+    Tier 1 is an in-process LRU with TTL and a maximum entry count.
+    Tier 2 is the shared MongoDB 'generation_cache' collection so all workers benefit.
+    """
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl_seconds=CACHE_TTL_SECONDS,
+                 collection_name='generation_cache'):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.collection_name = collection_name
+        self._entries = OrderedDict()  # key -> (expires_at_monotonic, value)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, generator, field):
+        with self._lock:
+            counters = self._stats.setdefault(generator, {
+                'memory_hits': 0, 'mongo_hits': 0, 'misses': 0, 'bypassed': 0, 'stores': 0
+            })
+            counters[field] += 1
+
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _memory_set(self, key, value, ttl_seconds):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, generator, key):
+        """Look up a cached result, checking memory first and then MongoDB"""
+        value = self._memory_get(key)
+        if value is not None:
+            self._count(generator, 'memory_hits')
+            return copy.deepcopy(value)
+
+        db = get_db()
+        if db is not None:
+            try:
+                doc = db[self.collection_name].find_one({'_id': key})
+                if doc and doc.get('expires_at') and doc['expires_at'] > datetime.utcnow():
+                    remaining = (doc['expires_at'] - datetime.utcnow()).total_seconds()
+                    self._memory_set(key, doc['value'], remaining)
+                    self._count(generator, 'mongo_hits')
+                    return copy.deepcopy(doc['value'])
+            except Exception as e:
+                print(f"[WARNING] Cache lookup failed: {e}")
+
+        self._count(generator, 'misses')
+        return None
+
+    def set(self, generator, key, value, ttl_seconds=None):
+        """Store a result in both tiers"""
+        ttl_seconds = ttl_seconds or self.ttl_seconds
+        value = copy.deepcopy(value)
+        self._memory_set(key, value, ttl_seconds)
+        self._count(generator, 'stores')
+
+        db = get_db()
+        if db is None:
+            return
+        try:
+            now = datetime.utcnow()
+            db[self.collection_name].replace_one(
+                {'_id': key},
+                {
+                    '_id': key,
+                    'generator': generator,
+                    'value': value,
+                    'created_at': now,
+                    'expires_at': now + timedelta(seconds=ttl_seconds)
+                },
+                upsert=True
+            )
+        except Exception as e:
+            print(f"[WARNING] Cache store failed: {e}")
+
+    def record_bypass(self, generator):
+        """Count a request that skipped the cache with fresh=true"""
+        self._count(generator, 'bypassed')
+
+    def stats(self):
+        """Return per-generator hit/miss counters and the memory tier size"""
+        with self._lock:
+            generators = {}
+            for generator, counters in self._stats.items():
+                lookups = counters['memory_hits'] + counters['mongo_hits'] + counters['misses']
+                hits = counters['memory_hits'] + counters['mongo_hits']
+                generators[generator] = dict(counters, hit_rate=round(hits / lookups, 3) if lookups else 0.0)
+            return {
+                'memory_entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'generators': generators
+            }
+
+
+generation_cache = GenerationCache()
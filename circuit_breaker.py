@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from collections import deque
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CIRCUIT_WINDOW_SECONDS = float(os.getenv('CIRCUIT_WINDOW_SECONDS', '60'))
+CIRCUIT_MIN_CALLS = int(os.getenv('CIRCUIT_MIN_CALLS', '5'))
+CIRCUIT_FAILURE_RATE = float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5'))
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', '30'))
+# Per-provider slow-call thresholds; each defaults to at least the provider's request timeout so a call
+# that succeeds within its timeout is never counted as slow (HuggingFace images may take HF_IMAGE_TIMEOUT)
+CIRCUIT_SLOW_CALL_SECONDS_GROQ = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS_GROQ', str(CIRCUIT_SLOW_CALL_SECONDS)))
+CIRCUIT_SLOW_CALL_SECONDS_POLLINATIONS = float(os.getenv(
+    'CIRCUIT_SLOW_CALL_SECONDS_POLLINATIONS',
+    str(max(CIRCUIT_SLOW_CALL_SECONDS, float(os.getenv('POLLINATIONS_TEXT_TIMEOUT', '30'))))
+))
+CIRCUIT_SLOW_CALL_SECONDS_HUGGINGFACE = float(os.getenv(
+    'CIRCUIT_SLOW_CALL_SECONDS_HUGGINGFACE',
+    str(max(CIRCUIT_SLOW_CALL_SECONDS, float(os.getenv('HF_IMAGE_TIMEOUT', '60'))))
+))
+CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', '30'))
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv('CIRCUIT_HALF_OPEN_PROBES', '2'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+    pass
+
+
+class _Call:
+    """Handle for one guarded call; failed() marks a bad response that did not raise"""
+    def __init__(self):
+        self.ok = True
+
+    def failed(self):
+        self.ok = False
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+    Counts failed and slow calls over a rolling time window and opens once they reach
+    failure_rate of at least min_calls calls. While open, calls fail fast with CircuitOpenError.
+    After open_seconds it goes half-open and lets half_open_probes calls through:
+    if they all succeed the circuit closes, any failure opens it again.
+    """
+    def __init__(self, name, window_seconds=CIRCUIT_WINDOW_SECONDS, min_calls=CIRCUIT_MIN_CALLS,
+                 failure_rate=CIRCUIT_FAILURE_RATE, slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS,
+                 open_seconds=CIRCUIT_OPEN_SECONDS, half_open_probes=CIRCUIT_HALF_OPEN_PROBES):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self._calls = deque()  # (finished_at, failed, latency)
+        self._opened_at = None
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow(self):
+        """Return True if a call may go to the provider now"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self.state = HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+                print(f"[WARNING] Circuit '{self.name}' half-open, probing provider")
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    self.rejected += 1
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def is_open(self):
+        """True while calls are rejected outright; unlike allow() this does not take a probe slot"""
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self._opened_at < self.open_seconds
+
+    def record(self, ok, latency):
+        """Record the outcome of an allowed call"""
+        failed = not ok or latency >= self.slow_call_seconds
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed:
+                    self._open(now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_probes:
+                        self.state = CLOSED
+                        self._calls.clear()
+                        print(f"[OK] Circuit '{self.name}' closed")
+                return
+            if self.state == OPEN:
+                return  # Late result from a call started before the circuit opened
+
+            self._calls.append((now, failed, latency))
+            self._trim(now)
+            failures = sum(1 for _, f, _ in self._calls if f)
+            if len(self._calls) >= self.min_calls and failures / len(self._calls) >= self.failure_rate:
+                self._open(now)
+
+    def release(self):
+        """Give back a probe slot for a call that ended without an outcome (e.g. client disconnect or cancellation)"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def guard(self):
+        """
+        Context manager around one provider call:
+            with breaker.guard() as call:
+                response = ...
+                if bad(response):
+                    call.failed()
+        Raises CircuitOpenError on entry while the circuit is open.
+        """
+        return _Guard(self)
+
+    def _open(self, now):
+        self.state = OPEN
+        self._opened_at = now
+        self._calls.clear()
+        self.times_opened += 1
+        print(f"[WARNING] Circuit '{self.name}' opened for {self.open_seconds:.0f}s")
+
+    def _trim(self, now):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def status(self):
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            calls = len(self._calls)
+            failures = sum(1 for _, f, _ in self._calls if f)
+            latencies = [latency for _, _, latency in self._calls]
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0, self.open_seconds - (now - self._opened_at)), 1)
+            return {
+                'state': self.state,
+                'window_calls': calls,
+                'window_failures': failures,
+                'failure_rate': round(failures / calls, 3) if calls else 0.0,
+                'avg_latency_ms': round(1000 * sum(latencies) / calls) if calls else None,
+                'retry_in_seconds': retry_in,
+                'rejected': self.rejected,
+                'times_opened': self.times_opened
+            }
+
+
+class _Guard:
+    def __init__(self, breaker):
+        self.breaker = breaker
+
+    def __enter__(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit '{self.breaker.name}' is open")
+        self.call = _Call()
+        self.started = time.monotonic()
+        return self.call
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and not issubclass(exc_type, Exception):
+            # A streaming consumer went away or an awaiting caller was cancelled;
+            # that says nothing about the provider
+            self.breaker.release()
+            return False
+        self.breaker.record(exc_type is None and self.call.ok, time.monotonic() - self.started)
+        return False
+
+
+groq_breaker = CircuitBreaker('groq', slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS_GROQ)
+pollinations_breaker = CircuitBreaker('pollinations', slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS_POLLINATIONS)
+huggingface_breaker = CircuitBreaker('huggingface', slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS_HUGGINGFACE)
+
+breakers = {b.name: b for b in (groq_breaker, pollinations_breaker, huggingface_breaker)}
+
+
+def breaker_status():
+    """State of every provider circuit, keyed by provider name"""
+    return {name: breaker.status() for name, breaker in breakers.items()}
@@ -8,6 +8,7 @@ load_dotenv()
 # MongoDB Connection
 MONGO_URI = os.getenv('MONGODB_URI')
 DB_NAME = os.getenv('MONGODB_DB', 'marketai_suite')
+LLM_CALLS_CAP_BYTES = int(os.getenv('LLM_CALLS_CAP_BYTES', str(64 * 1024 * 1024)))
 
 try:
     client = MongoClient(MONGO_URI, server_api=ServerApi('1'))
@@ -21,6 +22,35 @@ except Exception as e:
     db = None
 
 
+# History lists page on (created_at, _id) newest first; this index serves both the filter and the sort
+HISTORY_INDEX = [('user_id', 1), ('created_at', -1), ('_id', -1)]
+# Key of the feedback upsert; unique so concurrent ratings of one item cannot create two documents
+FEEDBACK_INDEX = [('user_id', 1), ('item_id', 1), ('variant_id', 1)]
+
+
+def _create_history_index(collection):
+    """Create the history paging index and drop the (user_id, created_at) index it supersedes"""
+    collection.create_index(HISTORY_INDEX)
+    if 'user_id_1_created_at_-1' in collection.index_information():
+        collection.drop_index('user_id_1_created_at_-1')
+
+
+def _create_feedback_index(collection):
+    """
+    Create the unique (user_id, item_id, variant_id) index behind feedback upserts and drop the
+    (item_id, user_id) index it supersedes. Fails while duplicates from the old find-then-insert
+    path remain; python dedupe_feedbacks.py removes them. Errors are reported here so the rest of
+    init_db() still runs.
+    """
+    try:
+        collection.create_index(FEEDBACK_INDEX, unique=True)
+    except Exception as e:
+        print(f"[ERROR] Unique feedback index not created (run python dedupe_feedbacks.py): {e}")
+        return
+    if 'item_id_1_user_id_1' in collection.index_information():
+        collection.drop_index('item_id_1_user_id_1')
+
+
 def init_db():
     """Initialize database collections with indexes"""
     if db is None:
@@ -38,27 +68,60 @@ def init_db():
         # Campaigns collection
         if 'campaigns' not in db.list_collection_names():
             db.create_collection('campaigns')
-        db.campaigns.create_index([('user_id', 1), ('created_at', -1)])
+        _create_history_index(db.campaigns)
         
         # Pitches collection
         if 'pitches' not in db.list_collection_names():
             db.create_collection('pitches')
-        db.pitches.create_index([('user_id', 1), ('created_at', -1)])
+        _create_history_index(db.pitches)
         
         # Leads collection
         if 'leads' not in db.list_collection_names():
             db.create_collection('leads')
-        db.leads.create_index([('user_id', 1), ('created_at', -1)])
+        _create_history_index(db.leads)
+        
+        # Social posts collection
+        if 'social_posts' not in db.list_collection_names():
+            db.create_collection('social_posts')
+        _create_history_index(db.social_posts)
         
         # Feedbacks collection
         if 'feedbacks' not in db.list_collection_names():
             db.create_collection('feedbacks')
-        db.feedbacks.create_index([('item_id', 1), ('user_id', 1)])
+        _create_feedback_index(db.feedbacks)
+        
+        # Feedback counts per item, item_type, industry and platform, keyed by "<scope>:<key>"
+        # overall and "user:<user_id>:<scope>:<key>" per content owner
+        if 'feedback_rollups' not in db.list_collection_names():
+            db.create_collection('feedback_rollups')
+        db.feedback_rollups.create_index([('user_id', 1), ('scope', 1)])
+        if 'scope_1' in db.feedback_rollups.index_information():
+            db.feedback_rollups.drop_index('scope_1')
         
         # Activity logs collection
         if 'activity_logs' not in db.list_collection_names():
             db.create_collection('activity_logs')
-        db.activity_logs.create_index([('user_id', 1), ('created_at', -1)])
+        _create_history_index(db.activity_logs)
+        
+        # Background jobs collection
+        if 'jobs' not in db.list_collection_names():
+            db.create_collection('jobs')
+        db.jobs.create_index([('status', 1), ('updated_at', 1)])
+        
+        # Pre-warmed background image pool
+        if 'image_pool' not in db.list_collection_names():
+            db.create_collection('image_pool')
+        db.image_pool.create_index('industry')
+        
+        # Generation cache collection (shared tier of the AI result cache)
+        if 'generation_cache' not in db.list_collection_names():
+            db.create_collection('generation_cache')
+        db.generation_cache.create_index('expires_at', expireAfterSeconds=0)
+        
+        # LLM call accounting; capped so the oldest records roll off
+        if 'llm_calls' not in db.list_collection_names():
+            db.create_collection('llm_calls', capped=True, size=LLM_CALLS_CAP_BYTES)
+        db.llm_calls.create_index('created_at')
         
         print("[OK] Database collections initialized")
     except Exception as e:
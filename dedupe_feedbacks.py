@@ -0,0 +1,41 @@
+from db import get_db, FEEDBACK_INDEX
+
+BATCH_SIZE = 500
+
+
+def dedupe_feedbacks():
+    """
+    Remove duplicate feedback left by the old find-then-insert path, keeping the latest rating of
+    each (user_id, item_id, variant_id), then create the unique index init_db() expects.
+    Run once before deploying the unique feedback index, then python rebuild_feedback_rollups.py.
+    """
+    db = get_db()
+    if db is None:
+        print("FAIL: Database not connected")
+        return
+
+    # A missing variant_id and null are the same key to the unique index, so they are grouped together
+    key = {'user_id': '$user_id', 'item_id': '$item_id', 'variant_id': {'$ifNull': ['$variant_id', None]}}
+    duplicates = db.feedbacks.aggregate([
+        {'$sort': {'created_at': -1}},
+        {'$group': {'_id': key, 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}}
+    ], allowDiskUse=True)
+
+    removed = 0
+    stale = []
+    for group in duplicates:
+        stale.extend(group['ids'][1:])
+        if len(stale) >= BATCH_SIZE:
+            removed += db.feedbacks.delete_many({'_id': {'$in': stale}}).deleted_count
+            stale = []
+    if stale:
+        removed += db.feedbacks.delete_many({'_id': {'$in': stale}}).deleted_count
+    print(f"Removed {removed} duplicate feedback document(s)")
+
+    db.feedbacks.create_index(FEEDBACK_INDEX, unique=True)
+    print("Created the unique feedback index")
+
+
+if __name__ == "__main__":
+    dedupe_feedbacks()
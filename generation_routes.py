@@ -0,0 +1,363 @@
+import os
+import asyncio
+from bson.objectid import ObjectId
+from dotenv import load_dotenv
+
+from ai_engine import (agenerate_campaign, agenerate_campaigns, agenerate_pitch, agenerate_pitch_variants,
+                       agenerate_pitch_languages, ascore_lead, ascore_leads_batch)
+from template_tier import (generate_campaign_template, generate_campaigns_template, generate_pitch_template,
+                           generate_pitch_languages_template)
+from utils import save_campaign_to_db, save_campaigns_to_db, save_pitch_to_db, save_lead_to_db, save_leads_to_db
+
+load_dotenv()
+
+# Generation endpoints shared by both entry points. Each handler validates the request, generates and
+# persists, and returns (status, payload); asgi.py awaits it and app.py runs it on the engine loop,
+# so the two only adapt the request and response.
+#
+# Handlers take the user id, the JSON body and the query parameters as a mapping of single values
+# (Flask's request.args, or the first value of each parse_qs list).
+
+LEAD_FIELDS = ('budget', 'business_need', 'urgency', 'authority', 'industry')
+MAX_LEAD_BATCH = int(os.getenv('MAX_LEAD_BATCH', '500'))
+MAX_CAMPAIGN_PLATFORMS = int(os.getenv('MAX_CAMPAIGN_PLATFORMS', '6'))
+MAX_PITCH_VARIANTS = int(os.getenv('MAX_PITCH_VARIANTS', '5'))
+MAX_PITCH_LANGUAGES = int(os.getenv('MAX_PITCH_LANGUAGES', '6'))
+# 'llm' generates with the provider router; 'template' renders the deterministic templates without any LLM call
+GENERATION_TIERS = ('llm', 'template')
+
+
+def is_fresh(data, args):
+    """Read the fresh=true cache-bypass flag from the JSON body or query string"""
+    value = data.get('fresh', args.get('fresh', False))
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+def is_valid_lead(lead):
+    """A lead has every LEAD_FIELDS value as a non-empty string (the scorers work on text)"""
+    return isinstance(lead, dict) and all(
+        isinstance(lead.get(field), str) and lead[field].strip() for field in LEAD_FIELDS
+    )
+
+
+def normalize_tier(tier):
+    """Validate the tier of a generation request; returns (tier, error)"""
+    if tier is None:
+        return 'llm', None
+    tier = str(tier).strip().lower()
+    if tier not in GENERATION_TIERS:
+        return None, f"tier must be one of: {', '.join(GENERATION_TIERS)}"
+    return tier, None
+
+
+def normalize_platforms(platforms):
+    """Validate the platforms list of a multi-platform campaign request; returns (platforms, error)"""
+    if not isinstance(platforms, list) or not platforms or \
+            not all(isinstance(platform, str) and platform.strip() for platform in platforms):
+        return None, 'platforms must be a non-empty array of platform names'
+    platforms = list(dict.fromkeys(platform.strip() for platform in platforms))
+    if len(platforms) > MAX_CAMPAIGN_PLATFORMS:
+        return None, f'At most {MAX_CAMPAIGN_PLATFORMS} platforms per request'
+    return platforms, None
+
+
+def normalize_variants(variants):
+    """Validate the variants count of a pitch request; returns (count, error), count 1 meaning a single pitch"""
+    if variants is None:
+        return 1, None
+    try:
+        count = int(variants)
+    except (TypeError, ValueError):
+        return None, 'variants must be a number'
+    if isinstance(variants, bool) or not 1 <= count <= MAX_PITCH_VARIANTS:
+        return None, f'variants must be between 1 and {MAX_PITCH_VARIANTS}'
+    return count, None
+
+
+def normalize_languages(languages):
+    """Validate the languages list of a multi-language pitch request; returns (languages, error)"""
+    if not isinstance(languages, list) or not languages or \
+            not all(isinstance(language, str) and language.strip() for language in languages):
+        return None, 'languages must be a non-empty array of language names'
+    languages = list(dict.fromkeys(language.strip() for language in languages))
+    if len(languages) > MAX_PITCH_LANGUAGES:
+        return None, f'At most {MAX_PITCH_LANGUAGES} languages per request'
+    return languages, None
+
+
+# ============= CAMPAIGNS =============
+
+async def generate_campaign_route(user_id, data, args):
+    """Generate marketing campaign; a platforms array generates one campaign per platform"""
+    product = data.get('product')
+    audience = data.get('audience')
+    platform = data.get('platform')
+    industry = data.get('industry')
+
+    tier, error = normalize_tier(data.get('tier', args.get('tier')))
+    if error:
+        return 400, {'error': error}
+
+    if data.get('platforms') is not None:
+        return await _generate_campaigns(user_id, data, args, product, audience, industry, tier)
+
+    if not all([product, audience, platform, industry]):
+        return 400, {'error': 'Missing required fields'}
+
+    print(f"Generating campaign for: {product}, {platform}, {industry}")
+
+    if tier == 'template':
+        ai_result = generate_campaign_template(product, audience, platform, industry)
+    else:
+        ai_result = await agenerate_campaign(product, audience, platform, industry, fresh=is_fresh(data, args))
+
+    if ai_result['status'] != 'success':
+        print(f"AI Error: {ai_result.get('error')}")
+        return 500, ai_result
+
+    campaign_id = await asyncio.to_thread(
+        save_campaign_to_db, ObjectId(user_id), product, audience, platform, industry, ai_result['campaign']
+    )
+
+    return 201, {
+        'campaign_id': campaign_id,
+        'campaign': ai_result['campaign'],
+        'cached': ai_result.get('cached', False),
+        'message': 'Campaign generated successfully'
+    }
+
+
+async def _generate_campaigns(user_id, data, args, product, audience, industry, tier):
+    """Generate campaigns for several platforms in one request"""
+    platforms, error = normalize_platforms(data.get('platforms'))
+    if error:
+        return 400, {'error': error}
+
+    if not all([product, audience, industry]):
+        return 400, {'error': 'Missing required fields'}
+
+    print(f"Generating campaigns for: {product}, {', '.join(platforms)}, {industry}")
+
+    if tier == 'template':
+        ai_result = generate_campaigns_template(product, audience, platforms, industry)
+    else:
+        # Shared product analysis, then the platform plans in parallel
+        ai_result = await agenerate_campaigns(product, audience, platforms, industry, fresh=is_fresh(data, args))
+
+    if ai_result['status'] != 'success':
+        return 500, ai_result
+
+    campaign_ids = await asyncio.to_thread(
+        save_campaigns_to_db, ObjectId(user_id), product, audience, platforms, industry,
+        [result['campaign'] for result in ai_result['results']]
+    )
+
+    return 201, {
+        'campaigns': [
+            {
+                'campaign_id': campaign_id,
+                'platform': result['platform'],
+                'campaign': result['campaign'],
+                'cached': result['cached']
+            }
+            for campaign_id, result in zip(campaign_ids, ai_result['results'])
+        ],
+        'count': len(campaign_ids),
+        'message': 'Campaigns generated successfully'
+    }
+
+
+# ============= PITCHES =============
+
+async def generate_pitch_route(user_id, data, args):
+    """Generate sales pitch; variants=N generates N A/B variants, languages=[...] translates it"""
+    product = data.get('product')
+    description = data.get('description')
+    persona = data.get('persona')
+    industry = data.get('industry')
+    customer_type = data.get('customer_type')
+    budget_preference = data.get('budget_preference')
+    language = data.get('language', 'English')
+
+    if not all([product, description, persona, industry, customer_type, budget_preference]):
+        return 400, {'error': 'Missing required fields'}
+
+    variants, error = normalize_variants(data.get('variants'))
+    if error:
+        return 400, {'error': error}
+    tier, error = normalize_tier(data.get('tier', args.get('tier')))
+    if error:
+        return 400, {'error': error}
+    if data.get('languages') is not None:
+        if variants > 1:
+            return 400, {'error': 'variants and languages cannot be combined'}
+        return await _generate_pitch_languages(user_id, data, args, tier)
+    if variants > 1:
+        if tier == 'template':
+            return 400, {'error': 'variants need tier=llm'}
+        return await _generate_pitch_variants(user_id, data, args, variants)
+
+    print(f"Generating pitch for: {product}, {language}")
+
+    if tier == 'template':
+        ai_result = generate_pitch_template(product, description, persona, industry, customer_type,
+                                            budget_preference, language)
+    else:
+        ai_result = await agenerate_pitch(product, description, persona, industry, customer_type, budget_preference,
+                                          language, fresh=is_fresh(data, args))
+
+    if ai_result['status'] != 'success':
+        print(f"AI Error: {ai_result.get('error')}")
+        return 500, ai_result
+
+    pitch_id = await asyncio.to_thread(
+        save_pitch_to_db, ObjectId(user_id), product, description, persona, industry, customer_type,
+        budget_preference, ai_result['pitch']
+    )
+
+    return 201, {
+        'pitch_id': pitch_id,
+        'pitch': ai_result['pitch'],
+        'cached': ai_result.get('cached', False),
+        'message': 'Pitch generated successfully'
+    }
+
+
+async def _generate_pitch_variants(user_id, data, args, count):
+    """Generate count A/B variants of a pitch in one LLM round trip and store them in one pitch"""
+    product = data.get('product')
+    description = data.get('description')
+    persona = data.get('persona')
+    industry = data.get('industry')
+    customer_type = data.get('customer_type')
+    budget_preference = data.get('budget_preference')
+    language = data.get('language', 'English')
+
+    print(f"Generating {count} pitch variants for: {product}, {language}")
+
+    ai_result = await agenerate_pitch_variants(product, description, persona, industry, customer_type,
+                                               budget_preference, count, language, fresh=is_fresh(data, args))
+
+    if ai_result['status'] != 'success':
+        return 500, ai_result
+
+    variants = ai_result['variants']
+    pitch_id = await asyncio.to_thread(
+        save_pitch_to_db, ObjectId(user_id), product, description, persona, industry, customer_type,
+        budget_preference, variants[0]['pitch'], variants
+    )
+
+    return 201, {
+        'pitch_id': pitch_id,
+        'pitch': variants[0]['pitch'],
+        'variants': variants,
+        'count': len(variants),
+        'cached': ai_result.get('cached', False),
+        'message': 'Pitch variants generated successfully'
+    }
+
+
+async def _generate_pitch_languages(user_id, data, args, tier):
+    """Generate a pitch once and translate it into the other requested languages in parallel"""
+    languages, error = normalize_languages(data.get('languages'))
+    if error:
+        return 400, {'error': error}
+
+    product = data.get('product')
+    description = data.get('description')
+    persona = data.get('persona')
+    industry = data.get('industry')
+    customer_type = data.get('customer_type')
+    budget_preference = data.get('budget_preference')
+
+    print(f"Generating pitch for: {product}, {', '.join(languages)}")
+
+    if tier == 'template':
+        ai_result = generate_pitch_languages_template(product, description, persona, industry, customer_type,
+                                                      budget_preference, languages)
+    else:
+        ai_result = await agenerate_pitch_languages(product, description, persona, industry, customer_type,
+                                                    budget_preference, languages, fresh=is_fresh(data, args))
+
+    if ai_result['status'] != 'success':
+        return 500, ai_result
+
+    pitch_id = await asyncio.to_thread(
+        save_pitch_to_db, ObjectId(user_id), product, description, persona, industry, customer_type,
+        budget_preference, ai_result['pitch'], language=ai_result['language'], translations=ai_result['translations']
+    )
+
+    return 201, {
+        'pitch_id': pitch_id,
+        'pitch': ai_result['pitch'],
+        'language': ai_result['language'],
+        'translations': ai_result['translations'],
+        'untranslated': ai_result['untranslated'],
+        'cached': ai_result.get('cached', False),
+        'message': 'Pitch generated successfully'
+    }
+
+
+# ============= LEADS =============
+
+async def score_lead_route(user_id, data, args):
+    """Score a lead"""
+    if not is_valid_lead(data):
+        return 400, {'error': 'Missing required fields'}
+
+    lead = [data[field] for field in LEAD_FIELDS]
+    ai_result = await ascore_lead(*lead)
+
+    if ai_result['status'] != 'success':
+        return 500, ai_result
+
+    lead_id = await asyncio.to_thread(save_lead_to_db, ObjectId(user_id), *lead, ai_result['lead_score'])
+
+    return 201, {
+        'lead_id': lead_id,
+        'lead_score': ai_result['lead_score'],
+        'message': 'Lead scored successfully'
+    }
+
+
+async def score_leads_batch_route(user_id, data, args):
+    """Score a batch of leads (batched prompts, vectorized fallback) and save them in one bulk write"""
+    leads = data.get('leads')
+    if not isinstance(leads, list) or not leads:
+        return 400, {'error': 'leads must be a non-empty array'}
+
+    if len(leads) > MAX_LEAD_BATCH:
+        return 400, {'error': f'At most {MAX_LEAD_BATCH} leads per batch'}
+
+    invalid = [i for i, lead in enumerate(leads) if not is_valid_lead(lead)]
+    if invalid:
+        return 400, {'error': 'Missing required fields', 'invalid_indexes': invalid}
+
+    leads = [{field: lead[field] for field in LEAD_FIELDS} for lead in leads]
+    ai_result = await ascore_leads_batch(leads)
+
+    if ai_result['status'] != 'success':
+        return 500, ai_result
+
+    lead_scores = [result['lead_score'] for result in ai_result['results']]
+    lead_ids = await asyncio.to_thread(save_leads_to_db, ObjectId(user_id), leads, lead_scores)
+
+    return 201, {
+        'results': [
+            {'lead_id': lead_id, 'lead_score': lead_score}
+            for lead_id, lead_score in zip(lead_ids, lead_scores)
+        ],
+        'count': len(lead_scores),
+        'message': 'Leads scored successfully'
+    }
+
+
+# POST routes served by the handlers above, on both entry points
+GENERATION_ROUTES = {
+    '/api/campaigns/generate': generate_campaign_route,
+    '/api/pitches/generate': generate_pitch_route,
+    '/api/leads/score': score_lead_route,
+    '/api/leads/score/batch': score_leads_batch_route
+}
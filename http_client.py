@@ -0,0 +1,172 @@
+import os
+import random
+import threading
+import time
+import asyncio
+import urllib.parse
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '2'))
+HTTP_BACKOFF_BASE = float(os.getenv('HTTP_BACKOFF_BASE', '0.5'))
+HTTP_BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', '8'))
+HTTP_ASYNC_MAX_CONNECTIONS = int(os.getenv('HTTP_ASYNC_MAX_CONNECTIONS', '200'))
+
+# Provider responses worth retrying: rate limited or temporarily unavailable
+RETRY_STATUSES = {429, 503}
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, honoring a numeric Retry-After header"""
+    if retry_after:
+        try:
+            return min(HTTP_BACKOFF_MAX, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+class ProviderHTTP:
+    """
+    Shared HTTP layer for external providers.
+    Keeps one pooled keep-alive Session per host, applies connect/read timeouts to every call
+    and retries 429/503 responses and connection failures with jittered exponential backoff.
+    """
+    def __init__(self, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=HTTP_MAX_RETRIES,
+                 connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT):
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """Get (or create) the pooled session for the URL's scheme and host"""
+        parts = urllib.parse.urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0)
+                session.mount(origin, adapter)
+                self._sessions[origin] = session
+            return session
+
+    def _timeout(self, timeout):
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        if isinstance(timeout, (int, float)):
+            return (self.connect_timeout, timeout)
+        return timeout
+
+    def request(self, method, url, timeout=None, retries=None, **kwargs):
+        """Send a request through the pooled session, retrying transient failures"""
+        session = self.session_for(url)
+        timeout = self._timeout(timeout)
+        retries = self.max_retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.ConnectionError:
+                # Includes connect timeouts; read timeouts are not retried
+                if attempt == retries:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+
+            delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+            print(f"[WARNING] {method} {urllib.parse.urlsplit(url).netloc} returned {response.status_code}, "
+                  f"retrying in {delay:.1f}s")
+            response.close()
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+class AsyncProviderHTTP:
+    """
+    Async counterpart of ProviderHTTP for the engine event loop.
+    One pooled httpx.AsyncClient keeps up to max_connections provider calls in flight,
+    with the same timeouts and retry policy as the sync layer.
+    """
+    def __init__(self, max_connections=HTTP_ASYNC_MAX_CONNECTIONS, max_retries=HTTP_MAX_RETRIES,
+                 connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT):
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._client = None
+
+    def _get_client(self):
+        # Created on first use so the client binds to the loop that uses it
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return self._client
+
+    def _timeout(self, timeout):
+        read = self.read_timeout if timeout is None else timeout
+        return httpx.Timeout(read, connect=self.connect_timeout)
+
+    async def request(self, method, url, timeout=None, retries=None, **kwargs):
+        """Send a request through the pooled client, retrying transient failures"""
+        client = self._get_client()
+        timeout = self._timeout(timeout)
+        retries = self.max_retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            try:
+                response = await client.request(method, url, timeout=timeout, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+
+            delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+            print(f"[WARNING] {method} {urllib.parse.urlsplit(url).netloc} returned {response.status_code}, "
+                  f"retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+provider_http = ProviderHTTP()
+async_provider_http = AsyncProviderHTTP()
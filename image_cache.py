@@ -0,0 +1,163 @@
+import os
+import re
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from dotenv import load_dotenv
+
+from db import get_db
+
+load_dotenv()
+
+IMAGE_CACHE_MAX_BYTES = int(os.getenv('IMAGE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+IMAGE_POOL_ENABLED = os.getenv('IMAGE_POOL_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+IMAGE_POOL_SIZE = int(os.getenv('IMAGE_POOL_SIZE', '3'))
+IMAGE_POOL_REFRESH_SECONDS = int(os.getenv('IMAGE_POOL_REFRESH_SECONDS', '3600'))
+
+
+def normalize_image_prompt(prompt):
+    """Normalize a prompt so near-identical prompts share a cache entry"""
+    words = re.sub(r'[^\w\s]', ' ', (prompt or '').lower()).split()
+    return ' '.join(words)
+
+
+class ImageCache:
+    """
+    In-process LRU of generated images keyed by normalized prompt.
+    Holds the image bytes (so /api/images can serve hot images without a store read)
+    and evicts least recently used entries once their total size exceeds max_bytes.
+    """
+    def __init__(self, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # prompt key -> (digest, data)
+        self._by_digest = {}  # digest -> prompt key
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, prompt):
+        """Return the digest cached for a prompt, or None"""
+        key = normalize_image_prompt(prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_bytes(self, digest):
+        """Return cached image bytes by digest, or None"""
+        with self._lock:
+            key = self._by_digest.get(digest)
+            if key is None:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key][1]
+
+    def put(self, prompt, digest, data):
+        key = normalize_image_prompt(prompt)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if len(data) > self.max_bytes:
+                return
+            self._entries[key] = (digest, data)
+            self._by_digest[digest] = key
+            self._total_bytes += len(data)
+            while self._total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        digest, data = self._entries.pop(key)
+        self._total_bytes -= len(data)
+        if self._by_digest.get(digest) == key:
+            del self._by_digest[digest]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+class ImagePool:
+    """
+    Pre-warmed pool of generic backgrounds per industry, persisted in the 'image_pool'
+    collection and topped up by a background thread. Lets a post be served immediately
+    while its product-specific image is generated lazily.
+    """
+    def __init__(self, pool_size=IMAGE_POOL_SIZE, refresh_seconds=IMAGE_POOL_REFRESH_SECONDS):
+        self.pool_size = pool_size
+        self.refresh_seconds = refresh_seconds
+        self._digests = {}  # industry -> [digest, ...]
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def pick(self, industry):
+        """Return a random pooled background digest for the industry, or None"""
+        with self._lock:
+            digests = self._digests.get(industry)
+            return random.choice(digests) if digests else None
+
+    def add(self, industry, digest):
+        with self._lock:
+            self._digests.setdefault(industry, []).append(digest)
+        db = get_db()
+        if db is not None:
+            db.image_pool.insert_one({'industry': industry, 'digest': digest, 'created_at': datetime.utcnow()})
+
+    def load(self):
+        """Load pooled backgrounds generated by previous runs or other workers"""
+        db = get_db()
+        if db is None:
+            return
+        digests = {}
+        for doc in db.image_pool.find({}, {'industry': 1, 'digest': 1}):
+            digests.setdefault(doc['industry'], []).append(doc['digest'])
+        with self._lock:
+            self._digests = digests
+
+    def fill(self, industries, generate):
+        """Top up every industry to pool_size using generate(industry, variant) -> digest or None"""
+        self.load()
+        for industry in industries:
+            with self._lock:
+                existing = len(self._digests.get(industry, []))
+            for variant in range(existing, self.pool_size):
+                digest = generate(industry, variant)
+                if digest is None:
+                    break
+                self.add(industry, digest)
+
+    def start(self, industries, generate):
+        """Start the background thread that keeps the pool filled"""
+        if self._thread is not None:
+            return
+
+        def run():
+            while True:
+                try:
+                    self.fill(industries, generate)
+                except Exception as e:
+                    print(f"[ERROR] Image pool refill failed: {e}")
+                time.sleep(self.refresh_seconds)
+
+        self._thread = threading.Thread(target=run, name='image-pool-warmer', daemon=True)
+        self._thread.start()
+
+    def stats(self):
+        with self._lock:
+            return {industry: len(digests) for industry, digests in self._digests.items()}
+
+
+image_cache = ImageCache()
+image_pool = ImagePool()
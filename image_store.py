@@ -0,0 +1,159 @@
+import os
+import re
+import base64
+import hashlib
+import tempfile
+from abc import ABC, abstractmethod
+import gridfs
+from pymongo.errors import DuplicateKeyError
+from dotenv import load_dotenv
+
+from db import get_db
+
+load_dotenv()
+
+# 'gridfs' stores images in MongoDB; 'local' stores them under IMAGE_STORE_DIR
+IMAGE_STORE_BACKEND = os.getenv('IMAGE_STORE_BACKEND', 'gridfs')
+IMAGE_STORE_DIR = os.getenv('IMAGE_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'image_store'))
+IMAGE_URL_PREFIX = '/api/images/'
+
+DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+DATA_URL_PATTERN = re.compile(r'^data:(?P<content_type>[\w/+.-]+);base64,(?P<data>.+)$', re.DOTALL)
+
+
+def image_digest(data):
+    """SHA-256 content address of an image"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def image_url_for(digest):
+    """Public URL that serves a stored image"""
+    return f"{IMAGE_URL_PREFIX}{digest}"
+
+
+def sniff_content_type(data):
+    """Detect the image type from its magic bytes"""
+    if data.startswith(b'\x89PNG'):
+        return 'image/png'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    if data.startswith(b'GIF8'):
+        return 'image/gif'
+    return 'image/jpeg'
+
+
+def decode_data_url(url):
+    """Decode a base64 data URL into (bytes, content_type), or None if it is not one"""
+    match = DATA_URL_PATTERN.match(url or '')
+    if not match:
+        return None
+    return base64.b64decode(match.group('data')), match.group('content_type')
+
+
+class ImageStore(ABC):
+    """Content-addressed image storage keyed by SHA-256 digest"""
+
+    @abstractmethod
+    def put(self, data):
+        """Store image bytes once and return their digest"""
+
+    @abstractmethod
+    def open(self, digest):
+        """Return (chunk iterator, content_type, length) for a stored image, or None"""
+
+    @abstractmethod
+    def exists(self, digest):
+        """Return True if an image with this digest is stored"""
+
+
+class GridFSImageStore(ImageStore):
+    """Images stored in the MongoDB 'images' GridFS bucket, with the digest as file id"""
+
+    def __init__(self, db, bucket_name='images'):
+        self.bucket = gridfs.GridFSBucket(db, bucket_name=bucket_name)
+        self.files = db[f'{bucket_name}.files']
+
+    def put(self, data):
+        digest = image_digest(data)
+        if self.exists(digest):
+            return digest
+        try:
+            self.bucket.upload_from_stream_with_id(
+                digest, digest, data, metadata={'content_type': sniff_content_type(data)}
+            )
+        except (DuplicateKeyError, gridfs.errors.FileExists):
+            pass  # Stored concurrently by another request; content is identical
+        return digest
+
+    def open(self, digest):
+        try:
+            stream = self.bucket.open_download_stream(digest)
+        except gridfs.errors.NoFile:
+            return None
+        content_type = (stream.metadata or {}).get('content_type', 'image/jpeg')
+
+        def chunks():
+            try:
+                yield from iter(stream.readchunk, b'')
+            finally:
+                stream.close()
+
+        return chunks(), content_type, stream.length
+
+    def exists(self, digest):
+        return self.files.find_one({'_id': digest}, {'_id': 1}) is not None
+
+
+class LocalImageStore(ImageStore):
+    """Images stored as files under a directory, sharded by the first two digest characters"""
+
+    def __init__(self, directory=IMAGE_STORE_DIR, chunk_size=64 * 1024):
+        self.directory = directory
+        self.chunk_size = chunk_size
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def put(self, data):
+        digest = image_digest(data)
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return digest
+
+    def open(self, digest):
+        path = self._path(digest)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            head = f.read(12)
+
+        def chunks():
+            with open(path, 'rb') as f:
+                yield from iter(lambda: f.read(self.chunk_size), b'')
+
+        return chunks(), sniff_content_type(head), os.path.getsize(path)
+
+    def exists(self, digest):
+        return os.path.exists(self._path(digest))
+
+
+_image_store = None
+
+
+def get_image_store():
+    """Get the configured image store (GridFS when MongoDB is available, otherwise local files)"""
+    global _image_store
+    if _image_store is None:
+        db = get_db()
+        if IMAGE_STORE_BACKEND == 'gridfs' and db is not None:
+            _image_store = GridFSImageStore(db)
+        else:
+            _image_store = LocalImageStore()
+    return _image_store
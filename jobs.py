@@ -0,0 +1,147 @@
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+from dotenv import load_dotenv
+
+from db import get_db
+from models import Job
+
+load_dotenv()
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_MAX_PENDING = int(os.getenv('JOB_MAX_PENDING', '100'))
+JOB_STALE_SECONDS = int(os.getenv('JOB_STALE_SECONDS', '600'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+
+
+class JobQueue:
+    """
+    Bounded worker pool for slow generation work.
+    Job state lives in the Mongo 'jobs' collection so it survives a worker restart:
+    queued jobs, and running jobs whose worker stopped updating them, are picked up again on startup.
+    """
+    def __init__(self, max_workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-worker')
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._handlers = {}
+
+    def register(self, job_type, handler):
+        """Register handler(job, progress) -> result dict for a job type"""
+        self._handlers[job_type] = handler
+
+    def enqueue(self, user_id, job_type, params):
+        """Persist a new job and schedule it. Returns the job id, or None if the queue is full."""
+        db = get_db()
+        if db is None:
+            return None
+        if not self._pending.acquire(blocking=False):
+            return None
+
+        try:
+            job = Job(user_id, job_type, params)
+            result = db.jobs.insert_one(job.to_dict())
+            self._executor.submit(self._run, result.inserted_id)
+        except Exception:
+            self._pending.release()
+            raise
+        return str(result.inserted_id)
+
+    def get(self, job_id):
+        """Get job state by ID"""
+        db = get_db()
+        if db is None:
+            return None
+        return db.jobs.find_one({'_id': ObjectId(job_id)}, {'params': 0})
+
+    def resume_pending(self):
+        """Reschedule queued jobs and stale running jobs left behind by a previous worker"""
+        db = get_db()
+        if db is None:
+            return 0
+        # Running jobs whose worker died on their last allowed attempt can never be claimed again
+        abandoned = db.jobs.update_many(
+            {
+                'status': 'running',
+                'updated_at': {'$lt': self._stale_before()},
+                'attempts': {'$gte': JOB_MAX_ATTEMPTS}
+            },
+            {'$set': {
+                'status': 'failed', 'stage': 'Failed',
+                'error': 'The worker stopped during the last allowed attempt',
+                'updated_at': datetime.utcnow(), 'finished_at': datetime.utcnow()
+            }}
+        ).modified_count
+        if abandoned:
+            print(f"[WARNING] Marked {abandoned} abandoned background job(s) as failed")
+        resumed = 0
+        for job in db.jobs.find(self._claimable_filter(), {'_id': 1}):
+            if not self._pending.acquire(blocking=False):
+                break
+            self._executor.submit(self._run, job['_id'])
+            resumed += 1
+        if resumed:
+            print(f"[OK] Resumed {resumed} background job(s)")
+        return resumed
+
+    def _stale_before(self):
+        return datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+
+    def _claimable_filter(self):
+        stale_before = self._stale_before()
+        return {
+            'attempts': {'$lt': JOB_MAX_ATTEMPTS},
+            '$or': [
+                {'status': 'queued'},
+                {'status': 'running', 'updated_at': {'$lt': stale_before}}
+            ]
+        }
+
+    def _update(self, job_id, fields):
+        fields['updated_at'] = datetime.utcnow()
+        get_db().jobs.update_one({'_id': job_id}, {'$set': fields})
+
+    def _run(self, job_id):
+        try:
+            db = get_db()
+            # Atomically claim the job so two workers never run it at once
+            job = db.jobs.find_one_and_update(
+                dict(self._claimable_filter(), _id=job_id),
+                {
+                    '$set': {'status': 'running', 'stage': 'Starting', 'updated_at': datetime.utcnow()},
+                    '$inc': {'attempts': 1}
+                },
+                return_document=ReturnDocument.AFTER
+            )
+            if job is None:
+                return
+
+            handler = self._handlers.get(job['type'])
+            if handler is None:
+                self._update(job_id, {'status': 'failed', 'error': f"Unknown job type: {job['type']}"})
+                return
+
+            def progress(percent, stage):
+                self._update(job_id, {'progress': percent, 'stage': stage})
+
+            try:
+                result = handler(job, progress)
+                self._update(job_id, {
+                    'status': 'succeeded', 'progress': 100, 'stage': 'Done',
+                    'result': result, 'finished_at': datetime.utcnow()
+                })
+            except Exception as e:
+                print(f"[ERROR] Job {job_id} failed: {e}")
+                traceback.print_exc()
+                self._update(job_id, {
+                    'status': 'failed', 'stage': 'Failed',
+                    'error': str(e), 'finished_at': datetime.utcnow()
+                })
+        finally:
+            self._pending.release()
+
+
+job_queue = JobQueue()
@@ -0,0 +1,50 @@
+from pymongo import UpdateOne
+
+from db import get_db
+from image_store import get_image_store, decode_data_url, image_url_for
+
+BATCH_SIZE = 100
+
+
+def _migrate(collection, field):
+    """Move base64 data URLs in `field` into the image store, replacing them with image URLs"""
+    store = get_image_store()
+    migrated = 0
+    updates = []
+
+    cursor = collection.find({field: {'$regex': '^data:'}}, {field: 1})
+    for doc in cursor:
+        value = doc
+        for part in field.split('.'):
+            value = (value or {}).get(part)
+
+        decoded = decode_data_url(value)
+        if decoded is None:
+            continue
+
+        digest = store.put(decoded[0])
+        updates.append(UpdateOne({'_id': doc['_id']}, {'$set': {field: image_url_for(digest)}}))
+        if len(updates) >= BATCH_SIZE:
+            migrated += collection.bulk_write(updates, ordered=False).modified_count
+            updates = []
+
+    if updates:
+        migrated += collection.bulk_write(updates, ordered=False).modified_count
+    return migrated
+
+
+def migrate_images():
+    db = get_db()
+    if db is None:
+        print("FAIL: Database not connected")
+        return
+
+    posts = _migrate(db.social_posts, 'ai_output.image_url')
+    print(f"Migrated {posts} social post image(s)")
+
+    jobs = _migrate(db.jobs, 'result.post.image_url')
+    print(f"Migrated {jobs} job result image(s)")
+
+
+if __name__ == "__main__":
+    migrate_images()
@@ -43,7 +43,7 @@ class Campaign:
 class Pitch:
     """Sales pitch AI output model"""
     def __init__(self, user_id, product, description, persona, industry, customer_type,
-                 budget_preference, ai_output, created_at=None):
+                 budget_preference, ai_output, variants=None, language=None, translations=None, created_at=None):
         self.user_id = user_id
         self.product = product
         self.description = description
@@ -52,6 +52,9 @@ class Pitch:
         self.customer_type = customer_type
         self.budget_preference = budget_preference
         self.ai_output = ai_output  # JSON with pitch details
+        self.variants = variants  # A/B variants [{variant_id, angle, pitch}]; ai_output is variant v1
+        self.language = language  # Language of ai_output
+        self.translations = translations  # {language: translated pitch} of a multi-language pitch
         self.created_at = created_at or datetime.utcnow()
     
     def to_dict(self):
@@ -64,6 +67,9 @@ class Pitch:
             'customer_type': self.customer_type,
             'budget_preference': self.budget_preference,
             'ai_output': self.ai_output,
+            'variants': self.variants,
+            'language': self.language,
+            'translations': self.translations,
             'created_at': self.created_at
         }
 
@@ -109,13 +115,15 @@ class Lead:
 
 class Feedback:
     """User feedback model for AI generations"""
-    def __init__(self, user_id, item_id, item_type, rating, reasons=None, details=None, created_at=None):
+    def __init__(self, user_id, item_id, item_type, rating, reasons=None, details=None, variant_id=None,
+                 created_at=None):
         self.user_id = user_id
         self.item_id = item_id  # ID of the campaign, pitch, or lead
         self.item_type = item_type  # 'campaign', 'pitch', or 'lead'
         self.rating = rating  # 1 for thumbs up, -1 for thumbs down
         self.reasons = reasons or [] # List of reasons for negative feedback
         self.details = details # Optional detailed feedback
+        self.variant_id = variant_id  # Pitch variant rated, for multi-variant pitches
         self.created_at = created_at or datetime.utcnow()
     
     def to_dict(self):
@@ -126,6 +134,7 @@ class Feedback:
             'rating': self.rating,
             'reasons': self.reasons,
             'details': self.details,
+            'variant_id': self.variant_id,
             'created_at': self.created_at
         }
 
@@ -171,3 +180,30 @@ class SocialPost:
             'ai_output': self.ai_output,
             'created_at': self.created_at
         }
+
+
+class Job:
+    """Background job model (state survives worker restarts)"""
+    def __init__(self, user_id, job_type, params, created_at=None):
+        self.user_id = user_id
+        self.job_type = job_type  # 'social_post'
+        self.params = params  # Inputs needed to (re)run the job
+        self.status = 'queued'  # 'queued', 'running', 'succeeded', 'failed'
+        self.progress = 0  # 0-100
+        self.stage = 'Queued'
+        self.created_at = created_at or datetime.utcnow()
+    
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'type': self.job_type,
+            'params': self.params,
+            'status': self.status,
+            'progress': self.progress,
+            'stage': self.stage,
+            'result': None,
+            'error': None,
+            'attempts': 0,
+            'created_at': self.created_at,
+            'updated_at': self.created_at
+        }
@@ -0,0 +1,203 @@
+import json
+
+# Expected top-level sections of each generator's JSON reply and their types.
+# Integer sections also accept numeric strings ("75"), which are converted.
+CAMPAIGN_SCHEMA = {
+    'campaign_ideas': list,
+    'cta_suggestions': list,
+    'content_calendar': list,
+    'competitor_analysis': dict
+}
+
+# Multi-platform campaigns: one shared product analysis, then the platform-specific sections
+CAMPAIGN_ANALYSIS_SCHEMA = {
+    'product_analysis': dict,
+    'competitor_analysis': dict
+}
+
+CAMPAIGN_PLATFORM_SCHEMA = {
+    'campaign_ideas': list,
+    'cta_suggestions': list,
+    'content_calendar': list
+}
+
+PITCH_SCHEMA = {
+    'elevator_pitch': str,
+    'value_proposition': str,
+    'key_differentiators': list,
+    'personalized_cta': str,
+    'deal_confidence_score': int,
+    'confidence_breakdown': dict,
+    'reasoning': dict,
+    'recommended_next_actions': list
+}
+
+# A/B pitch variants: each entry is a pitch (PITCH_SCHEMA) plus its "angle"
+PITCH_VARIANTS_SCHEMA = {
+    'variants': list
+}
+
+LEAD_SCORE_SCHEMA = {
+    'lead_score': int,
+    'lead_category': str,
+    'conversion_probability': int,
+    'detailed_reasoning': dict,
+    'score_breakdown': dict,
+    'priority_recommendation': str,
+    'next_actions': list,
+    'risk_factors': list
+}
+
+LEAD_BATCH_SCHEMA = {
+    'leads': list
+}
+
+SOCIAL_POST_SCHEMA = {
+    'tagline': str,
+    'captions': dict
+}
+
+_CLOSERS = {'{': '}', '[': ']'}
+_STRING_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+def parse_json_object(text):
+    """
+    Parse the outermost JSON object in an LLM reply.
+    Surrounding prose and markdown code fences are ignored; trailing commas, raw newlines
+    and unescaped quotes inside strings are repaired, and a reply cut off mid-document is
+    closed after its last complete element. Raises ValueError if no object can be recovered.
+    """
+    text = text.strip()
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data
+    except ValueError:
+        pass
+
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("No JSON object in response")
+
+    data = json.loads(_repair(text[start:]))
+    if not isinstance(data, dict):
+        raise ValueError("Response JSON is not an object")
+    return data
+
+
+def _next_significant(text, i):
+    """The next non-whitespace character after position i, or None at the end"""
+    for ch in text[i + 1:]:
+        if not ch.isspace():
+            return ch
+    return None
+
+
+def _drop_trailing_comma(out):
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ',':
+        out.pop()
+
+
+def _repair(text):
+    """Rewrite JSON text starting at its opening brace into parseable JSON"""
+    out = []
+    stack = []
+    in_string = False
+    escape = False
+    # Where the document can be cut if it is truncated: after an opening bracket
+    # or before a separating comma, with the brackets still open at that point
+    cut = None
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+                out.append(ch)
+            elif ch == '\\':
+                escape = True
+                out.append(ch)
+            elif ch == '"':
+                # A quote only closes the string when JSON structure follows it
+                if _next_significant(text, i) in (',', ':', '}', ']', None):
+                    in_string = False
+                    out.append(ch)
+                else:
+                    out.append('\\"')
+            else:
+                out.append(_STRING_ESCAPES.get(ch, ch))
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in _CLOSERS:
+            # An unfinished array element is dropped whole rather than kept as an empty {} or []
+            element = bool(stack) and stack[-1] == '['
+            stack.append(ch)
+            out.append(ch)
+            if not element:
+                cut = (len(out), list(stack))
+        elif ch in '}]':
+            _drop_trailing_comma(out)
+            if stack:
+                out.append(_CLOSERS[stack.pop()])
+            if not stack:
+                return ''.join(out)
+        elif ch == ',':
+            cut = (len(out), list(stack))
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    # Truncated: keep everything up to the last complete element and close what is open
+    if not in_string:
+        _drop_trailing_comma(out)
+        closed = ''.join(out) + ''.join(_CLOSERS[bracket] for bracket in reversed(stack))
+        try:
+            json.loads(closed)
+            return closed
+        except ValueError:
+            pass
+    if cut is None:
+        raise ValueError("Truncated JSON object")
+    length, stack = cut
+    out = out[:length]
+    _drop_trailing_comma(out)
+    return ''.join(out) + ''.join(_CLOSERS[bracket] for bracket in reversed(stack))
+
+
+def validate_sections(data, schema):
+    """
+    Check a parsed reply against a generator schema, converting numeric strings for
+    integer sections in place. Returns the sections that are missing, empty or of the wrong type.
+    """
+    missing = []
+    for key, expected in schema.items():
+        value = data.get(key)
+        if expected is int and isinstance(value, str):
+            try:
+                value = data[key] = int(float(value.strip().rstrip('%')))
+            except ValueError:
+                pass
+        if expected is int and isinstance(value, float):
+            value = data[key] = int(value)
+        if not isinstance(value, expected) or isinstance(value, bool) or (value in ('', [], {})):
+            missing.append(key)
+    return missing
+
+
+def get_section(document, path):
+    """
+    Return the value at a dotted section path such as 'reasoning.objection_handling'
+    or 'campaign_ideas.2' (list positions are numbers). Raises KeyError if it does not exist.
+    """
+    value = document
+    for part in path.split('.'):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            raise KeyError(path)
+    return value
@@ -0,0 +1,322 @@
+import os
+import asyncio
+import itertools
+import random
+import threading
+import time
+from collections import deque
+import numpy as np
+from dotenv import load_dotenv
+
+from http_client import async_provider_http
+from circuit_breaker import groq_breaker, pollinations_breaker, CircuitOpenError
+
+load_dotenv()
+
+POLLINATIONS_CHAT_URL = "https://text.pollinations.ai/"
+POLLINATIONS_TEXT_TIMEOUT = float(os.getenv('POLLINATIONS_TEXT_TIMEOUT', '30'))
+
+# Latency samples kept per backend and generator, and how many are needed before
+# the router trusts them for ranking and hedging
+ROUTER_LATENCY_WINDOW = int(os.getenv('ROUTER_LATENCY_WINDOW', '200'))
+ROUTER_MIN_SAMPLES = int(os.getenv('ROUTER_MIN_SAMPLES', '20'))
+# A hedged request goes to the next backend once the primary passes this percentile of its latency
+HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '95'))
+HEDGE_ENABLED = os.getenv('HEDGE_ENABLED', 'true').lower() == 'true'
+# Share of calls sent first to another healthy backend, so its latency stays measured
+ROUTER_EXPLORE_RATE = float(os.getenv('ROUTER_EXPLORE_RATE', '0.05'))
+
+
+class LLMReply:
+    """Text of one chat completion and the backend that produced it (a stream's last item)"""
+    def __init__(self, backend, text, usage=None, finish_reason=None):
+        self.backend = backend
+        self.text = text
+        self.usage = usage
+        self.finish_reason = finish_reason
+
+
+class GroqBackend:
+    """One Groq model, called through the shared async Groq clients in turn"""
+    provider = 'groq'
+
+    def __init__(self, model, clients):
+        self.model = model
+        self.name = f"groq/{model}"
+        self.breaker = groq_breaker
+        self.clients = clients
+        self._turn = itertools.count()
+
+    async def complete(self, messages, **params):
+        client = self.clients[next(self._turn) % len(self.clients)]
+        with self.breaker.guard():
+            message = await client.chat.completions.create(model=self.model, messages=messages, **params)
+        choice = message.choices[0]
+        return LLMReply(self.name, choice.message.content, message.usage, choice.finish_reason)
+
+    async def stream(self, messages, **params):
+        """Yield the text deltas of a streamed completion, then its LLMReply"""
+        client = self.clients[next(self._turn) % len(self.clients)]
+        chunks = []
+        usage = None
+        finish_reason = None
+        # The whole stream counts as one call for the breaker, so mid-stream failures are recorded too
+        with self.breaker.guard():
+            stream = await client.chat.completions.create(model=self.model, messages=messages, stream=True, **params)
+            async for chunk in stream:
+                # Groq reports token usage on the final chunk
+                x_groq = getattr(chunk, 'x_groq', None)
+                if x_groq is not None and getattr(x_groq, 'usage', None) is not None:
+                    usage = x_groq.usage
+                if chunk.choices and chunk.choices[0].finish_reason:
+                    finish_reason = chunk.choices[0].finish_reason
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+        yield LLMReply(self.name, ''.join(chunks), usage, finish_reason)
+
+
+class PollinationsBackend:
+    """
+    Pollinations text chat API; free, and reports no token usage.
+    model None leaves the choice to the service ("pollinations:" in a backend spec), which keeps
+    answering when one named model is down.
+    """
+    provider = 'pollinations'
+
+    def __init__(self, model='openai'):
+        self.model = model
+        self.name = f"pollinations/{model or 'default'}"
+        self.breaker = pollinations_breaker
+
+    async def complete(self, messages, **params):
+        body = {'messages': messages, 'jsonMode': True}
+        if self.model:
+            body['model'] = self.model
+        if params.get('temperature') is not None:
+            body['temperature'] = params['temperature']
+        with self.breaker.guard() as call:
+            response = await async_provider_http.post(POLLINATIONS_CHAT_URL, json=body, timeout=POLLINATIONS_TEXT_TIMEOUT)
+            if response.status_code >= 500 or response.status_code == 429:
+                call.failed()
+        if response.status_code != 200:
+            raise Exception(f"Pollinations returned HTTP {response.status_code}")
+        return LLMReply(self.name, response.text)
+
+    async def stream(self, messages, **params):
+        """The chat API used here does not stream; the whole reply arrives as one delta"""
+        reply = await self.complete(messages, **params)
+        yield reply.text
+        yield reply
+
+
+def parse_backend_spec(spec):
+    """Parse 'groq:model-a,pollinations:openai' into [('groq', 'model-a'), ('pollinations', 'openai')]"""
+    backends = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        provider, _, model = item.partition(':')
+        backends.append((provider.strip().lower(), model.strip()))
+    return backends
+
+
+class _LatencyStats:
+    """Rolling latency samples (seconds) for one backend serving one generator"""
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.calls = 0
+        self.wins = 0
+        self.hedges = 0
+        self.failovers = 0
+
+    def percentile(self, q):
+        if len(self.samples) < ROUTER_MIN_SAMPLES:
+            return None
+        return float(np.percentile(self.samples, q))
+
+
+class ProviderRouter:
+    """
+    Sends each generator's LLM calls to one of its configured backends.
+    Healthy backends (circuit not open) are ranked by their moving p50 latency for that
+    generator; backends without enough samples yet rank after measured ones, in configured
+    order. ROUTER_EXPLORE_RATE of calls go first to another healthy backend so a backend
+    that got faster is noticed. If the primary has not answered by its HEDGE_PERCENTILE
+    latency, the same request goes to the next backend and whichever answers first wins;
+    the other is cancelled. A primary that fails outright fails over to the next backend.
+    """
+    def __init__(self, routes, latency_window=ROUTER_LATENCY_WINDOW, hedge_enabled=HEDGE_ENABLED,
+                 explore_rate=ROUTER_EXPLORE_RATE):
+        self.routes = routes  # generator -> [backend]; '*' is the default route
+        self.latency_window = latency_window
+        self.hedge_enabled = hedge_enabled
+        self.explore_rate = explore_rate
+        self._stats = {}  # (backend name, generator) -> _LatencyStats
+        self._lock = threading.Lock()  # status() is read from request threads
+
+    def _stats_for(self, backend, generator):
+        with self._lock:
+            key = (backend.name, generator)
+            if key not in self._stats:
+                self._stats[key] = _LatencyStats(self.latency_window)
+            return self._stats[key]
+
+    def ranked(self, generator):
+        """Healthy backends for a generator, preferred first"""
+        backends = self.routes.get(generator, self.routes.get('*', []))
+        healthy = [(i, b) for i, b in enumerate(backends) if not b.breaker.is_open()]
+
+        def rank(entry):
+            i, backend = entry
+            p50 = self._stats_for(backend, generator).percentile(50)
+            return (p50 is None, p50 or 0, i)
+        return [backend for _, backend in sorted(healthy, key=rank)]
+
+    async def _timed(self, backend, generator, messages, params):
+        stats = self._stats_for(backend, generator)
+        started = time.monotonic()
+        with self._lock:
+            stats.calls += 1
+        try:
+            reply = await backend.complete(messages, **params)
+        except asyncio.CancelledError:
+            # A cancelled hedge loser took at least this long; keeping the sample stops a
+            # backend that always loses from keeping a stale, optimistic latency
+            with self._lock:
+                stats.samples.append(time.monotonic() - started)
+            raise
+        with self._lock:
+            stats.samples.append(time.monotonic() - started)
+        return reply
+
+    async def complete(self, generator, route, messages, **params):
+        """
+        Return the LLMReply of the first backend to answer.
+        route is filled in with the routing decision (primary, hedged, failover, winner)
+        whether or not the call succeeds, so it can be recorded with the call.
+        """
+        candidates = self.ranked(generator)
+        if not candidates:
+            if self.routes.get(generator, self.routes.get('*')):
+                raise CircuitOpenError(f"Every backend for {generator} has an open circuit")
+            raise Exception(f"No LLM backend configured for {generator}")
+
+        explored = len(candidates) > 1 and random.random() < self.explore_rate
+        if explored:
+            candidates.insert(0, candidates.pop(random.randrange(1, len(candidates))))
+        primary = candidates[0]
+        secondary = candidates[1] if len(candidates) > 1 else None
+        hedge_after = None
+        if self.hedge_enabled and secondary is not None:
+            hedge_after = self._stats_for(primary, generator).percentile(HEDGE_PERCENTILE)
+        route.update({'primary': primary.name, 'explored': explored, 'hedged': False, 'failover': False, 'winner': None,
+                      'hedge_after_ms': round(hedge_after * 1000) if hedge_after is not None else None})
+
+        loop = asyncio.get_running_loop()
+        tasks = {loop.create_task(self._timed(primary, generator, messages, params)): primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                route['hedged'] = True
+                route['secondary'] = secondary.name
+                stats = self._stats_for(primary, generator)
+                with self._lock:
+                    stats.hedges += 1
+                print(f"[HEDGE] {generator}: {primary.name} passed p{HEDGE_PERCENTILE:.0f} "
+                      f"({route['hedge_after_ms']}ms), also sending to {secondary.name}")
+                tasks[loop.create_task(self._timed(secondary, generator, messages, params))] = secondary
+
+            error = None
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    backend = tasks.pop(task)
+                    if task.exception() is None:
+                        route['winner'] = backend.name
+                        stats = self._stats_for(backend, generator)
+                        with self._lock:
+                            stats.wins += 1
+                        return task.result()
+                    error = task.exception()
+                    if backend is primary and secondary is not None and not route['hedged']:
+                        route['failover'] = True
+                        route['secondary'] = secondary.name
+                        stats = self._stats_for(primary, generator)
+                        with self._lock:
+                            stats.failovers += 1
+                        print(f"[FAILOVER] {generator}: {primary.name} failed ({error}), trying {secondary.name}")
+                        tasks[loop.create_task(self._timed(secondary, generator, messages, params))] = secondary
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream(self, generator, route, messages, **params):
+        """
+        Stream a completion from the preferred backend: yields text deltas, then its LLMReply.
+        A primary that fails before its first delta fails over to the next backend, as in
+        complete(); once text has been yielded the stream cannot switch, so later errors are
+        raised. Streams are not hedged, since the caller is already consuming the primary's text.
+        """
+        candidates = self.ranked(generator)
+        if not candidates:
+            if self.routes.get(generator, self.routes.get('*')):
+                raise CircuitOpenError(f"Every backend for {generator} has an open circuit")
+            raise Exception(f"No LLM backend configured for {generator}")
+
+        primary = candidates[0]
+        route.update({'primary': primary.name, 'explored': False, 'hedged': False, 'failover': False, 'winner': None,
+                      'hedge_after_ms': None, 'streamed': True})
+        for backend in candidates[:2]:
+            stats = self._stats_for(backend, generator)
+            started = time.monotonic()
+            with self._lock:
+                stats.calls += 1
+            streaming = False
+            try:
+                async for item in backend.stream(messages, **params):
+                    streaming = True
+                    yield item
+            except Exception as e:
+                if streaming or backend is not primary or len(candidates) < 2:
+                    raise
+                route['failover'] = True
+                route['secondary'] = candidates[1].name
+                with self._lock:
+                    stats.failovers += 1
+                print(f"[FAILOVER] {generator}: {primary.name} failed ({e}), trying {candidates[1].name}")
+                continue
+            with self._lock:
+                stats.samples.append(time.monotonic() - started)
+                stats.wins += 1
+            route['winner'] = backend.name
+            return
+
+    def status(self):
+        """Latency percentiles and routing counters per backend and generator"""
+        with self._lock:
+            items = [(key, stats, list(stats.samples)) for key, stats in self._stats.items()]
+        backends = {}
+        for (name, generator), stats, samples in items:
+            if samples:
+                p50, p95 = np.percentile(samples, [50, HEDGE_PERCENTILE])
+                latency = {'p50': round(float(p50) * 1000), 'p95': round(float(p95) * 1000)}
+            else:
+                latency = {'p50': None, 'p95': None}
+            backends.setdefault(name, {})[generator] = {
+                'calls': stats.calls,
+                'wins': stats.wins,
+                'hedges': stats.hedges,
+                'failovers': stats.failovers,
+                'samples': len(samples),
+                'latency_ms': latency
+            }
+        return {
+            'routes': {generator: [b.name for b in backends_] for generator, backends_ in self.routes.items()},
+            'hedge_enabled': self.hedge_enabled,
+            'hedge_percentile': HEDGE_PERCENTILE,
+            'backends': backends
+        }
@@ -0,0 +1,42 @@
+from db import get_db
+from utils import feedback_rollup_updates
+
+BATCH_SIZE = 500
+
+
+def _write(db, changes):
+    updates = feedback_rollup_updates(db, changes)
+    if updates:
+        db.feedback_rollups.bulk_write(updates, ordered=False)
+    return len(changes)
+
+
+def rebuild_feedback_rollups():
+    """
+    Recompute feedback_rollups from the raw feedbacks collection.
+    Backfills feedback saved before rollups existed and repairs counts if a rollup write ever
+    failed; run it while feedback is not being submitted, since live updates during the rebuild
+    are counted twice.
+    """
+    db = get_db()
+    if db is None:
+        print("FAIL: Database not connected")
+        return
+
+    db.feedback_rollups.delete_many({})
+    rebuilt = 0
+    changes = []
+
+    cursor = db.feedbacks.find({}, {'item_id': 1, 'item_type': 1, 'variant_id': 1, 'rating': 1})
+    for doc in cursor:
+        changes.append((doc['item_id'], doc.get('item_type'), doc.get('variant_id'), None, doc.get('rating')))
+        if len(changes) >= BATCH_SIZE:
+            rebuilt += _write(db, changes)
+            changes = []
+
+    rebuilt += _write(db, changes)
+    print(f"Rolled up {rebuilt} feedback document(s) into {db.feedback_rollups.count_documents({})} rollup(s)")
+
+
+if __name__ == "__main__":
+    rebuild_feedback_rollups()
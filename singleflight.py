@@ -0,0 +1,49 @@
+import asyncio
+import copy
+import threading
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight generation calls on the engine event loop.
+    The first caller for a key starts the upstream call as a task; callers arriving with the
+    same key while it is running await that task instead of starting their own. Every caller
+    gets its own deep copy of the result, so each can persist or modify it independently.
+    """
+    def __init__(self):
+        self._flights = {}  # (generator, key) -> asyncio.Task
+        self._counters = {}  # generator -> {'upstream_calls', 'saved_calls'}
+        self._lock = threading.Lock()  # stats() is read from request threads
+
+    async def do(self, generator, key, fn):
+        """Return a copy of await fn()'s result, sharing one call among concurrent callers with the same key"""
+        flight_key = (generator, key)
+        with self._lock:
+            counters = self._counters.setdefault(generator, {'upstream_calls': 0, 'saved_calls': 0})
+            task = self._flights.get(flight_key)
+            if task is None:
+                task = asyncio.get_running_loop().create_task(fn())
+                self._flights[flight_key] = task
+                task.add_done_callback(lambda _: self._forget(flight_key))
+                counters['upstream_calls'] += 1
+            else:
+                counters['saved_calls'] += 1
+
+        # Shielded so one caller going away does not cancel the call for the others
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    def _forget(self, flight_key):
+        with self._lock:
+            self._flights.pop(flight_key, None)
+
+    def stats(self):
+        """Upstream and saved call counts per generator, plus calls currently in flight"""
+        with self._lock:
+            return {
+                'generators': {generator: dict(counters) for generator, counters in self._counters.items()},
+                'in_flight': len(self._flights)
+            }
+
+
+single_flight = SingleFlight()
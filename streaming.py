@@ -0,0 +1,71 @@
+import json
+
+
+def sse_event(event, data):
+    """Format a Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class JsonSectionScanner:
+    """
+    Incrementally scans streamed JSON text and returns each top-level
+    section (key/value pair) as soon as its value is complete.
+    """
+    def __init__(self):
+        self.buffer = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._key = None
+        self._value_start = None
+
+    def feed(self, text):
+        """Consume a chunk of text and return a list of completed (key, value) sections"""
+        self.buffer += text
+        sections = []
+
+        while self._pos < len(self.buffer):
+            ch = self.buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    # A string closing at depth 1 before a ':' is a top-level key
+                    if self._depth == 1 and self._value_start is None:
+                        try:
+                            self._key = json.loads(self.buffer[self._string_start:self._pos + 1])
+                        except ValueError:
+                            self._key = None
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(self._pos, sections)
+            elif ch == ':' and self._depth == 1 and self._key is not None and self._value_start is None:
+                self._value_start = self._pos + 1
+            elif ch == ',' and self._depth == 1:
+                self._emit(self._pos, sections)
+
+            self._pos += 1
+
+        return sections
+
+    def _emit(self, end, sections):
+        if self._key is not None and self._value_start is not None:
+            raw = self.buffer[self._value_start:end].strip()
+            try:
+                sections.append((self._key, json.loads(raw)))
+            except ValueError:
+                pass
+        self._key = None
+        self._value_start = None
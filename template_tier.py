@@ -0,0 +1,161 @@
+# Template tier: deterministic campaigns and pitches with the same schema as the LLM tier,
+# for bulk jobs, load tests and as the fallback when no LLM backend answers.
+# Each render is one dict display filled with f-strings (and str.format_map for the per-language
+# pitch text), so every call returns fresh containers and no code is generated at import.
+TEMPLATE_PLATFORMS = ['LinkedIn', 'Facebook', 'Twitter', 'Instagram', 'Email', 'TikTok', 'Multi-channel']
+TEMPLATE_INDUSTRIES = ['SaaS', 'Healthcare', 'EdTech', 'Retail', 'FinTech', 'Other']
+TEMPLATE_LANGUAGES = ['English', 'Hindi', 'Telugu']
+
+TEMPLATE_MODEL = 'Template Tier'
+
+
+def render_campaign(product_desc, audience, platform, industry):
+    """Campaign document in the LLM tier's campaign schema"""
+    product_20 = product_desc[:20]
+    return {
+        "campaign_ideas": [
+            {"title": f"{industry} Growth Accelerator", "description": f"A data-driven campaign targeting {audience} on {platform} focusing on the unique benefits of {product_desc[:30]}..."},
+            {"title": "Problem-Solver Spotlight", "description": "Showcase how your solution directly addresses the core pain points of the industry."},
+            {"title": "Customer Success Stories", "description": "Highlight transformations achieved by similar companies in the sector."},
+            {"title": "Expert Insights Series", "description": "Educational content providing value and establishing authority."},
+            {"title": "Limited-Time Offer Launch", "description": f"Urgency-based campaign for {platform} users."}
+        ],
+        "cta_suggestions": [
+            {"cta_text": "Start Your Free Trial", "description": "Best for educational content to lower barrier to entry."},
+            {"cta_text": "Download the Whitepaper", "description": "Perfect for B2B lead generation and authority building."},
+            {"cta_text": "Schedule a Demo", "description": "Used for high-intent prospects nearing decision phase."},
+            {"cta_text": "Get a Custom Quote", "description": "Effective for personalized/enterprise solutions."},
+            {"cta_text": "Learn More", "description": "Generalized CTA for awareness-stage content."}
+        ],
+        "content_calendar": [
+            {"day": 1, "post_type": "Educational", "content_idea": f"The future of {industry} and why {product_20} matters.", "best_time": "9 AM"},
+            {"day": 2, "post_type": "Engagement", "content_idea": "Poll: What is your biggest challenge in this industry?", "best_time": "12 PM"},
+            {"day": 3, "post_type": "Promotional", "content_idea": f"Deep dive into a key feature of {product_20}.", "best_time": "3 PM"},
+            {"day": 4, "post_type": "Educational", "content_idea": "3 pitfalls to avoid in current market conditions.", "best_time": "10 AM"},
+            {"day": 5, "post_type": "Social Proof", "content_idea": "Client testimonial and ROI results.", "best_time": "1 PM"},
+            {"day": 6, "post_type": "Educational", "content_idea": "How-to guide for optimizing your current workflow.", "best_time": "11 AM"},
+            {"day": 7, "post_type": "Promotional", "content_idea": "Last call for the weekly specialized session.", "best_time": "2 PM"}
+        ],
+        "competitor_analysis": {
+            "common_strategies": ["Heavy emphasis on pricing", "Generic feature-based marketing", "Broad audience targeting"],
+            "gaps_opportunities": ["Lack of personalized support", "Unclear ROI metrics", "Missing specific integration features"],
+            "differentiation_tactics": ["Emphasize explainable AI", "Focus on niche expertise", "Provide superior implementation support"]
+        }
+    }
+
+
+# Elevator pitch, value proposition and CTA per language as str.format templates; other languages use English
+_PITCH_TEXT = {
+    'English': (
+        "We help {persona} in the {industry} sector achieve better results through {product}. In a market where {description_40}... is critical, our solution ensures you stand out by addressing your specific {customer_type} needs while respecting your {budget_preference} requirements.",
+        "The most efficient way for {industry} professionals to scale operations without complexity.",
+        "Would you like to see how {product} can transform your {industry} strategy?"
+    ),
+    'Hindi': (
+        "हम {industry} क्षेत्र में {persona} को {product} के माध्यम से अपने लक्ष्यों को प्राप्त करने में मदद करते हैं। एक ऐसे बाजार में जहां {description_30}... महत्वपूर्ण है, हमारा समाधान आपकी विशिष्ट आवश्यकताओं को पूरा करता है।",
+        "बेहतर व्यवसाय विकास के लिए एआई-संचालित समाधान।",
+        "आज ही अपना डेमो बुक करें।"
+    ),
+    'Telugu': (
+        "మేము {industry} రంగంలో {persona} కి {product} ద్వారా మెరుగైన ఫలితాలను సాధించడంలో సహాయపడతాము. {description_30}... కీలకమైన ఈ మార్కెట్‌లో, మా పరిష్కారం మీ అవసరాలను తీరుస్తుంది.",
+        "మీ వ్యాపారాన్ని AI తో వృద్ధి చేద్దాం.",
+        "మరిన్ని వివరాల కోసం ఈరోజే సంప్రదించండి."
+    )
+}
+
+
+# Pitch text with each known industry already filled in, keyed by (language, industry)
+_PITCH_TEXT_BY_INDUSTRY = {
+    (language, industry): tuple(text.replace('{industry}', industry) for text in texts)
+    for language, texts in _PITCH_TEXT.items() for industry in TEMPLATE_INDUSTRIES
+}
+
+
+def render_pitch(product, description, persona, industry, customer_type, budget_preference, language):
+    """Pitch document in the LLM tier's pitch schema"""
+    if language not in _PITCH_TEXT:
+        language = 'English'
+    elevator_pitch, value_proposition, personalized_cta = _PITCH_TEXT_BY_INDUSTRY.get(
+        (language, industry), _PITCH_TEXT[language])
+    fill = dict(product=product, persona=persona, industry=industry, customer_type=customer_type,
+                budget_preference=budget_preference, description_40=description[:40],
+                description_30=description[:30])
+    return {
+        "elevator_pitch": elevator_pitch.format_map(fill),
+        "value_proposition": value_proposition.format_map(fill),
+        "key_differentiators": [
+            "Proprietary AI Engine optimized for results",
+            f"Deep {industry} expertise built-in",
+            "Zero-friction implementation process"
+        ],
+        "personalized_cta": personalized_cta.format_map(fill),
+        "deal_confidence_score": 80,
+        "confidence_breakdown": {
+            "budget_alignment": "Strong fit for specified range",
+            "pain_point_fit": "Directly addresses core needs",
+            "authority_match": f"Tailored for {persona}",
+            "timeline_fit": "High readiness detected"
+        },
+        "reasoning": {
+            "why_this_pitch": "Focuses on value over features",
+            "industry_nuances": f"Addresses {industry} challenges",
+            "size_considerations": f"Scaled for {customer_type}",
+            "objection_handling": "Pre-emptively addresses ROI concerns"
+        },
+        "recommended_next_actions": [
+            "Send personalized proposal",
+            "Book a 15-minute discovery call",
+            "Share relevant case studies"
+        ]
+    }
+
+
+def generate_campaign_template(product_desc, audience, platform, industry):
+    """Template-tier campaign, in the same response shape as generate_campaign"""
+    return {
+        'status': 'success',
+        'campaign': render_campaign(product_desc, audience, platform, industry),
+        'ai_model': TEMPLATE_MODEL
+    }
+
+
+def generate_pitch_template(product, description, persona, industry, customer_type, budget_preference,
+                            language='English'):
+    """Template-tier pitch, in the same response shape as generate_pitch"""
+    return {
+        'status': 'success',
+        'pitch': render_pitch(product, description, persona, industry, customer_type, budget_preference, language),
+        'ai_model': TEMPLATE_MODEL
+    }
+
+
+def generate_campaigns_template(product_desc, audience, platforms, industry):
+    """Template-tier campaigns for several platforms, in the same response shape as generate_campaigns"""
+    return {
+        'status': 'success',
+        'results': [
+            {
+                'platform': platform,
+                'campaign': render_campaign(product_desc, audience, platform, industry),
+                'ai_model': TEMPLATE_MODEL,
+                'cached': False
+            }
+            for platform in platforms
+        ]
+    }
+
+
+def generate_pitch_languages_template(product, description, persona, industry, customer_type, budget_preference,
+                                      languages):
+    """Template-tier pitch in several languages, in the same response shape as generate_pitch_languages"""
+    return {
+        'status': 'success',
+        'pitch': render_pitch(product, description, persona, industry, customer_type, budget_preference, languages[0]),
+        'language': languages[0],
+        'translations': {
+            language: render_pitch(product, description, persona, industry, customer_type, budget_preference, language)
+            for language in languages[1:]
+        },
+        'untranslated': {},
+        'ai_model': TEMPLATE_MODEL
+    }
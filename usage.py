@@ -0,0 +1,174 @@
+import os
+import atexit
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+import numpy as np
+from dotenv import load_dotenv
+
+from db import get_db
+
+load_dotenv()
+
+USAGE_FLUSH_SECONDS = float(os.getenv('USAGE_FLUSH_SECONDS', '5'))
+USAGE_BUFFER_SIZE = int(os.getenv('USAGE_BUFFER_SIZE', '10000'))
+# Optional price list (USD per 1K tokens) used for the cost estimate in usage summaries
+LLM_COST_PER_1K_PROMPT_TOKENS = float(os.getenv('LLM_COST_PER_1K_PROMPT_TOKENS', '0'))
+LLM_COST_PER_1K_COMPLETION_TOKENS = float(os.getenv('LLM_COST_PER_1K_COMPLETION_TOKENS', '0'))
+
+# Call outcomes: the model answered with usable JSON, answered with JSON missing some sections,
+# answered with JSON we could not parse, or was not reached / failed so the generator fell back
+# to its intelligent fallback
+SUCCESS = 'success'
+PARTIAL = 'partial'
+PARSE_ERROR = 'parse_error'
+FALLBACK = 'fallback'
+
+
+class LLMCall:
+    """One LLM call being timed; finish() records it"""
+    def __init__(self, log, generator, model, max_tokens):
+        self.log = log
+        self.generator = generator
+        self.model = model
+        self.max_tokens = max_tokens
+        self.started = time.monotonic()
+        self.usage = None
+        self.finish_reason = None
+        self.route = None
+        self.finished = False
+
+    def set_route(self, route):
+        """Attach the provider router's decision dict; it may still be filled in until finish()"""
+        self.route = route
+
+    def set_response(self, usage, finish_reason=None):
+        """Attach the provider's token usage (any object with *_tokens attributes) and finish reason"""
+        self.usage = usage
+        self.finish_reason = finish_reason
+
+    def finish(self, outcome, error=None):
+        if self.finished:
+            return
+        self.finished = True
+        usage = self.usage
+        prompt_tokens = getattr(usage, 'prompt_tokens', None)
+        completion_tokens = getattr(usage, 'completion_tokens', None)
+        route = self.route or {}
+        self.log.record({
+            'generator': self.generator,
+            'model': self.model or route.get('winner') or route.get('primary'),
+            'outcome': outcome,
+            'latency_ms': round((time.monotonic() - self.started) * 1000),
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': getattr(usage, 'total_tokens', None),
+            'max_tokens': self.max_tokens,
+            'finish_reason': self.finish_reason,
+            'cost_usd': _cost(prompt_tokens, completion_tokens),
+            'error': str(error)[:500] if error else None,
+            'route': self.route,
+            'created_at': datetime.utcnow()
+        })
+
+
+def _cost(prompt_tokens, completion_tokens):
+    if prompt_tokens is None and completion_tokens is None:
+        return None
+    return round((prompt_tokens or 0) / 1000 * LLM_COST_PER_1K_PROMPT_TOKENS +
+                 (completion_tokens or 0) / 1000 * LLM_COST_PER_1K_COMPLETION_TOKENS, 6)
+
+
+def _percentiles(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return {'p50': None, 'p95': None, 'max': None}
+    p50, p95 = np.percentile(values, [50, 95])
+    return {'p50': round(float(p50), 1), 'p95': round(float(p95), 1), 'max': max(values)}
+
+
+class LLMUsageLog:
+    """
+    Records every LLM call (tokens, latency, model, outcome) in the capped 'llm_calls' collection.
+    Records are buffered in memory and written by a background thread with insert_many,
+    so recording never blocks a generator on MongoDB.
+    """
+    def __init__(self, flush_seconds=USAGE_FLUSH_SECONDS, buffer_size=USAGE_BUFFER_SIZE):
+        self.flush_seconds = flush_seconds
+        self._buffer = deque(maxlen=buffer_size)  # Oldest records are dropped if MongoDB falls behind
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, generator, model, max_tokens=None):
+        """Start timing a call; call finish(outcome) on the returned LLMCall"""
+        return LLMCall(self, generator, model, max_tokens)
+
+    def record(self, doc):
+        with self._lock:
+            self._buffer.append(doc)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='llm-usage-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        """Write buffered records to MongoDB"""
+        with self._lock:
+            docs = list(self._buffer)
+            self._buffer.clear()
+        if not docs:
+            return
+        db = get_db()
+        if db is None:
+            return
+        try:
+            db.llm_calls.insert_many(docs, ordered=False)
+        except Exception as e:
+            print(f"[ERROR] Failed to write LLM usage records: {e}")
+
+    def summary(self, hours=24):
+        """Per-generator call counts, outcomes, latency and token percentiles over the last hours"""
+        db = get_db()
+        if db is None:
+            return None
+        self.flush()
+
+        since = datetime.utcnow() - timedelta(hours=hours)
+        calls = {}
+        projection = {'_id': 0, 'generator': 1, 'model': 1, 'outcome': 1, 'latency_ms': 1, 'prompt_tokens': 1,
+                      'completion_tokens': 1, 'total_tokens': 1, 'max_tokens': 1, 'finish_reason': 1, 'cost_usd': 1,
+                      'route': 1}
+        for doc in db.llm_calls.find({'created_at': {'$gte': since}}, projection):
+            calls.setdefault(doc['generator'], []).append(doc)
+
+        generators = {}
+        for generator, docs in calls.items():
+            outcomes = {}
+            for doc in docs:
+                outcomes[doc['outcome']] = outcomes.get(doc['outcome'], 0) + 1
+            answered = [doc for doc in docs if doc['outcome'] != FALLBACK]
+            generators[generator] = {
+                'calls': len(docs),
+                'outcomes': outcomes,
+                'models': sorted({doc['model'] for doc in docs if doc.get('model')}),
+                'latency_ms': _percentiles([doc['latency_ms'] for doc in answered]),
+                'prompt_tokens': _percentiles([doc.get('prompt_tokens') for doc in answered]),
+                'completion_tokens': _percentiles([doc.get('completion_tokens') for doc in answered]),
+                'max_tokens': max((doc.get('max_tokens') or 0 for doc in docs), default=None) or None,
+                # Completions cut off by max_tokens; these usually fail to parse
+                'truncated': sum(1 for doc in docs if doc.get('finish_reason') == 'length'),
+                'hedged': sum(1 for doc in docs if (doc.get('route') or {}).get('hedged')),
+                'failovers': sum(1 for doc in docs if (doc.get('route') or {}).get('failover')),
+                'total_tokens': sum(doc.get('total_tokens') or 0 for doc in docs),
+                'cost_usd': round(sum(doc.get('cost_usd') or 0 for doc in docs), 4)
+            }
+        return {'hours': hours, 'generators': generators}
+
+
+llm_usage = LLMUsageLog()
+atexit.register(llm_usage.flush)
@@ -1,16 +1,27 @@
+import os
+import json
+import base64
 from datetime import datetime
 from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from db import get_db
 from models import ActivityLog
+from activity_log import activity_log_writer
+
+# Previous section values kept per campaign or pitch; older ones are dropped
+MAX_SECTION_VERSIONS = int(os.getenv('MAX_SECTION_VERSIONS', '20'))
 
 
 def log_activity(user_id, action, details):
-    """Log user activity to database"""
-    db = get_db()
-    if db is None:
-        return
-    activity = ActivityLog(user_id, action, details)
-    db.activity_logs.insert_one(activity.to_dict())
+    """Queue a user activity for the background activity log writer"""
+    activity_log_writer.record(ActivityLog(user_id, action, details).to_dict())
+
+
+def log_activities(user_id, action, details_list):
+    """Queue several activities of the same kind; they are written in the writer's next insert_many"""
+    activity_log_writer.record_many([ActivityLog(user_id, action, details).to_dict() for details in details_list])
 
 
 def save_campaign_to_db(user_id, product, audience, platform, industry, ai_output):
@@ -33,21 +44,55 @@ def save_campaign_to_db(user_id, product, audience, platform, industry, ai_outpu
     return str(result.inserted_id)
 
 
-def save_pitch_to_db(user_id, product, description, persona, industry, customer_type, budget_preference, ai_output):
-    """Save pitch to MongoDB"""
+def save_campaigns_to_db(user_id, product, audience, platforms, industry, ai_outputs):
+    """Save one campaign per platform with one insert_many and one bulk activity write"""
+    from models import Campaign
+    db = get_db()
+    if db is None:
+        return [None] * len(platforms)
+
+    documents = [
+        Campaign(user_id, product, audience, platform, industry, ai_output).to_dict()
+        for platform, ai_output in zip(platforms, ai_outputs)
+    ]
+    result = db.campaigns.insert_many(documents)
+
+    log_activities(user_id, 'campaign_created', [
+        {
+            'product': product,
+            'audience': audience,
+            'platform': platform,
+            'industry': industry,
+            'multi_platform': True
+        }
+        for platform in platforms
+    ])
+
+    return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+
+def save_pitch_to_db(user_id, product, description, persona, industry, customer_type, budget_preference, ai_output,
+                     variants=None, language=None, translations=None):
+    """Save pitch to MongoDB; A/B variants and translations are stored in the same document"""
     from models import Pitch
     db = get_db()
     if db is None:
         return None
     
-    pitch = Pitch(user_id, product, description, persona, industry, customer_type, budget_preference, ai_output)
+    pitch = Pitch(user_id, product, description, persona, industry, customer_type, budget_preference, ai_output,
+                  variants, language, translations)
     result = db.pitches.insert_one(pitch.to_dict())
     
-    log_activity(user_id, 'pitch_created', {
+    details = {
         'product': product,
         'industry': industry,
         'customer_type': customer_type
-    })
+    }
+    if variants:
+        details['variants'] = len(variants)
+    if translations:
+        details['languages'] = [language] + list(translations)
+    log_activity(user_id, 'pitch_created', details)
     
     return str(result.inserted_id)
 
@@ -74,6 +119,36 @@ def save_lead_to_db(user_id, budget, business_need, urgency, authority, industry
     return str(result.inserted_id)
 
 
+def save_leads_to_db(user_id, leads, ai_outputs):
+    """Save a batch of lead scores with one insert_many and one bulk activity write"""
+    from models import Lead
+    db = get_db()
+    if db is None:
+        return [None] * len(leads)
+    
+    documents = [
+        Lead(user_id, lead['budget'], lead['business_need'], lead['urgency'], lead['authority'],
+             lead['industry'], ai_output).to_dict()
+        for lead, ai_output in zip(leads, ai_outputs)
+    ]
+    result = db.leads.insert_many(documents)
+    
+    log_activities(user_id, 'lead_scored', [
+        {
+            'budget': lead['budget'],
+            'business_need': lead['business_need'],
+            'urgency': lead['urgency'],
+            'authority': lead['authority'],
+            'industry': lead['industry'],
+            'lead_score': ai_output.get('lead_score', 0),
+            'batch': True
+        }
+        for lead, ai_output in zip(leads, ai_outputs)
+    ])
+    
+    return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+
 def save_social_post_to_db(user_id, product, dept, description, contact, others, ai_output):
     """Save created post to MongoDB"""
     from models import SocialPost
@@ -90,111 +165,457 @@ def save_social_post_to_db(user_id, product, dept, description, contact, others,
     return str(result.inserted_id)
 
 
-def save_feedback_to_db(user_id, item_id, item_type, rating, reasons=None, details=None):
-    """Save feedback to MongoDB"""
-    from models import Feedback
+def update_social_post_image(post_id, image_url):
+    """Replace a post's background once its product-specific image is ready"""
     db = get_db()
-    
-    # Check if feedback already exists for this item by this user
-    existing = db.feedbacks.find_one({
-        'user_id': ObjectId(user_id),
-        'item_id': ObjectId(item_id)
-    })
-    
-    update_data = {
-        'rating': rating,
-        'reasons': reasons or [],
-        'details': details,
-        'created_at': datetime.utcnow()
+    if db is None:
+        return
+    db.social_posts.update_one(
+        {'_id': ObjectId(post_id)},
+        {'$set': {'ai_output.image_url': image_url, 'ai_output.image_pending': False}}
+    )
+
+
+def replace_section_in_db(item_type, item_id, user_id, path, previous, value, ai_model, has_variants=False,
+                          has_translations=False):
+    """
+    Replace one section of a stored campaign or pitch with a targeted $set and push the
+    previous value onto its version history (capped at MAX_SECTION_VERSIONS).
+    For a multi-variant pitch the same section of variant v1 (which ai_output mirrors) is replaced
+    too; for a multi-language pitch the section is added to stale_translations, since its
+    translations still hold the old text.
+    The update only applies if the section still holds previous, so two concurrent
+    regenerations cannot silently overwrite each other; returns False in that case.
+    """
+    db = get_db()
+    if db is None:
+        return False
+    collection = {'campaign': db.campaigns, 'pitch': db.pitches}[item_type]
+    now = datetime.utcnow()
+    fields = {f'ai_output.{path}': value, 'updated_at': now}
+    if has_variants:
+        fields[f'variants.0.pitch.{path}'] = value
+    update = {
+        '$set': fields,
+        '$inc': {'revision': 1},
+        '$push': {'versions': {
+            '$each': [{'path': path, 'value': previous, 'replaced_at': now, 'ai_model': ai_model}],
+            '$slice': -MAX_SECTION_VERSIONS
+        }}
     }
-    
-    if existing:
-        db.feedbacks.update_one(
-            {'_id': existing['_id']},
-            {'$set': update_data}
-        )
-        return str(existing['_id'])
-    
-    feedback = Feedback(ObjectId(user_id), ObjectId(item_id), item_type, rating, reasons, details)
-    result = db.feedbacks.insert_one(feedback.to_dict())
-    
-    log_activity(ObjectId(user_id), 'feedback_submitted', {
+    if has_translations:
+        update['$addToSet'] = {'stale_translations': path}
+    result = collection.update_one(
+        {'_id': ObjectId(item_id), 'user_id': ObjectId(user_id), f'ai_output.{path}': previous},
+        update
+    )
+    if result.modified_count == 0:
+        return False
+    
+    log_activity(ObjectId(user_id), f"{item_type}_section_regenerated", {
+        'item_id': item_id,
+        'section': path
+    })
+    return True
+
+
+def pitch_has_variant(pitch_id, variant_id):
+    """Check that a pitch was generated with the given A/B variant id"""
+    db = get_db()
+    if db is None:
+        return False
+    return db.pitches.count_documents({'_id': ObjectId(pitch_id), 'variants.variant_id': variant_id}, limit=1) > 0
+
+
+# One feedback per (user, item, variant), enforced by a unique index; a repeat rating
+# replaces the mutable fields and keeps the original _id and item_type
+FEEDBACK_KEY = ('user_id', 'item_id', 'variant_id')
+FEEDBACK_MUTABLE_FIELDS = ('rating', 'reasons', 'details', 'created_at')
+DUPLICATE_KEY_ERROR = 11000
+# Rounds of bulk_write for a feedback batch whose ratings keep changing concurrently
+FEEDBACK_WRITE_ATTEMPTS = 3
+
+
+def _feedback_upsert(user_id, item_id, item_type, rating, reasons=None, details=None, variant_id=None):
+    """Filter and update document for an atomic feedback upsert"""
+    from models import Feedback
+    doc = Feedback(ObjectId(user_id), ObjectId(item_id), item_type, rating, reasons, details, variant_id).to_dict()
+    doc['_id'] = ObjectId()
+    return (
+        {field: doc[field] for field in FEEDBACK_KEY},
+        {
+            '$set': {field: doc[field] for field in FEEDBACK_MUTABLE_FIELDS},
+            '$setOnInsert': {field: value for field, value in doc.items()
+                             if field not in FEEDBACK_KEY and field not in FEEDBACK_MUTABLE_FIELDS}
+        }
+    )
+
+
+def _feedback_activity(item_id, item_type, rating, reasons=None, details=None, variant_id=None):
+    return {
         'item_id': item_id,
         'item_type': item_type,
+        'variant_id': variant_id,
         'rating': rating,
         'reasons': reasons,
         'details': details
-    })
-    
-    return str(result.inserted_id)
+    }
 
 
-def get_user_campaigns(user_id, limit=10):
-    """Get user's campaigns from database"""
+def save_feedback_to_db(user_id, item_id, item_type, rating, reasons=None, details=None, variant_id=None):
+    """Save feedback with a single atomic upsert; variant_id targets one variant of a multi-variant pitch"""
     db = get_db()
     if db is None:
-        return []
-    campaigns = list(db.campaigns.find(
-        {'user_id': ObjectId(user_id)}
-    ).sort('created_at', -1).limit(limit))
+        return None
     
-    # Convert ObjectId to string
-    for campaign in campaigns:
-        campaign['_id'] = str(campaign['_id'])
-        campaign['user_id'] = str(campaign['user_id'])
+    query, update = _feedback_upsert(user_id, item_id, item_type, rating, reasons, details, variant_id)
+    projection = {'_id': 1, 'rating': 1}
+    try:
+        previous = db.feedbacks.find_one_and_update(
+            query, update, projection=projection, upsert=True, return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        # A concurrent click inserted the same feedback first; this update now matches it
+        previous = db.feedbacks.find_one_and_update(
+            query, update, projection=projection, return_document=ReturnDocument.BEFORE
+        )
     
-    return campaigns
+    # The document before the upsert says whether this is a new rating or a flip of an earlier one
+    update_feedback_rollups([(item_id, item_type, variant_id, previous and previous.get('rating'), rating)])
+    
+    if previous is not None:
+        return str(previous['_id'])
+    
+    log_activity(ObjectId(user_id), 'feedback_submitted',
+                 _feedback_activity(item_id, item_type, rating, reasons, details, variant_id))
+    return str(update['$setOnInsert']['_id'])
+
+
+def _bulk_write_feedbacks(db, operations):
+    """
+    Run one round of feedback upserts with bulk_write.
+    Returns ({operation index: inserted _id}, [indexes of operations that hit a duplicate key]);
+    every other operation matched an existing document.
+    """
+    try:
+        result = db.feedbacks.bulk_write(operations, ordered=False)
+        return dict(result.upserted_ids), []
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors') or []
+        if e.details.get('writeConcernErrors') or any(error['code'] != DUPLICATE_KEY_ERROR for error in errors):
+            raise
+        return ({upsert['index']: upsert['_id'] for upsert in e.details['upserted']},
+                [error['index'] for error in errors])
+
+
+def _read_feedback_ratings(db, user_id, keys):
+    """Current rating per (item_id, variant_id) key of a user's feedback, with one query"""
+    return {
+        (str(doc['item_id']), doc.get('variant_id')): doc.get('rating')
+        for doc in db.feedbacks.find(
+            {'user_id': ObjectId(user_id), '$or': [
+                {'item_id': ObjectId(item_id), 'variant_id': variant_id} for item_id, variant_id in keys
+            ]},
+            {'item_id': 1, 'variant_id': 1, 'rating': 1}
+        )
+    }
 
 
-def get_user_pitches(user_id, limit=10):
-    """Get user's pitches from database"""
+def save_feedbacks_to_db(user_id, feedbacks):
+    """
+    Save a batch of feedback dicts (item_id, item_type, rating, reasons, details, variant_id)
+    with one bulk_write of upserts. Returns (inserted, updated) counts.
+    Each upsert only applies if the feedback still has the rating read beforehand (or still does
+    not exist), so the rollups are updated from the rating it actually replaced; an upsert that
+    finds something else hits the unique index and is retried with a fresh read.
+    """
     db = get_db()
     if db is None:
+        return 0, 0
+    
+    # Keys use the canonical lowercase hex id, which is how ratings read back from MongoDB are keyed.
+    # Unordered upserts of the same key would race each other; the last rating in the batch wins
+    feedbacks = [dict(feedback, item_id=str(ObjectId(feedback['item_id']))) for feedback in feedbacks]
+    feedbacks = list({(feedback['item_id'], feedback.get('variant_id')): feedback for feedback in feedbacks}.values())
+    keys = [(feedback['item_id'], feedback.get('variant_id')) for feedback in feedbacks]
+    
+    replaced = {}  # feedback index -> rating it replaced, None for new feedback
+    inserted = []
+    pending = list(range(len(feedbacks)))
+    for attempt in range(FEEDBACK_WRITE_ATTEMPTS):
+        ratings = _read_feedback_ratings(db, user_id, [keys[index] for index in pending])
+        operations = []
+        for index in pending:
+            feedback = feedbacks[index]
+            query, update = _feedback_upsert(user_id, feedback['item_id'], feedback['item_type'], feedback['rating'],
+                                             feedback.get('reasons'), feedback.get('details'),
+                                             feedback.get('variant_id'))
+            expected = ratings.get(keys[index])
+            query['rating'] = expected if expected is not None else {'$exists': False}
+            operations.append(UpdateOne(query, update, upsert=True))
+        
+        upserted, conflicts = _bulk_write_feedbacks(db, operations)
+        for position, index in enumerate(pending):
+            if position in upserted:
+                replaced[index] = None
+                inserted.append(index)
+            elif position not in conflicts:
+                replaced[index] = ratings.get(keys[index])
+        pending = [pending[position] for position in conflicts]
+        if not pending:
+            break
+    
+    if pending:
+        print(f"[ERROR] {len(pending)} feedback rating(s) kept changing concurrently and were not saved")
+    
+    log_activities(ObjectId(user_id), 'feedback_submitted', [
+        _feedback_activity(feedbacks[index]['item_id'], feedbacks[index]['item_type'], feedbacks[index]['rating'],
+                           feedbacks[index].get('reasons'), feedbacks[index].get('details'),
+                           feedbacks[index].get('variant_id'))
+        for index in sorted(inserted)
+    ])
+    
+    update_feedback_rollups([
+        (feedbacks[index]['item_id'], feedbacks[index]['item_type'], feedbacks[index].get('variant_id'),
+         previous, feedbacks[index]['rating'])
+        for index, previous in replaced.items()
+    ])
+    
+    return len(inserted), len(replaced) - len(inserted)
+
+
+# Rated content by item_type: its collection and the fields it is rolled up by besides item and item_type
+FEEDBACK_ITEM_COLLECTIONS = {'campaign': 'campaigns', 'pitch': 'pitches', 'lead': 'leads',
+                             'social_post': 'social_posts'}
+FEEDBACK_ROLLUP_FIELDS = ('industry', 'platform')
+FEEDBACK_ROLLUP_SCOPES = ('item_type',) + FEEDBACK_ROLLUP_FIELDS
+_RATING_COUNTS = {1: 'up', -1: 'down'}
+
+
+def _rating_change(previous, rating):
+    """$inc for the up/down counts when a rating goes from previous (None if new) to rating"""
+    if previous == rating:
+        return {}
+    change = {}
+    if previous in _RATING_COUNTS:
+        change[_RATING_COUNTS[previous]] = -1
+    if rating in _RATING_COUNTS:
+        change[_RATING_COUNTS[rating]] = change.get(_RATING_COUNTS[rating], 0) + 1
+    return change
+
+
+def _rated_item_fields(db, items):
+    """Map item id -> {user_id, industry, platform} for (item_id, item_type) pairs, one query per collection"""
+    ids_by_type = {}
+    for item_id, item_type in items:
+        if item_type in FEEDBACK_ITEM_COLLECTIONS and ObjectId.is_valid(item_id):
+            ids_by_type.setdefault(item_type, set()).add(ObjectId(item_id))
+    fields = {}
+    projection = dict.fromkeys(('user_id',) + FEEDBACK_ROLLUP_FIELDS, 1)
+    for item_type, ids in ids_by_type.items():
+        for doc in db[FEEDBACK_ITEM_COLLECTIONS[item_type]].find({'_id': {'$in': list(ids)}}, projection):
+            fields[str(doc['_id'])] = doc
+    return fields
+
+
+def feedback_rollup_updates(db, changes):
+    """
+    UpdateOne upserts that apply rating changes to the feedback_rollups documents.
+    changes are (item_id, item_type, variant_id, previous_rating, rating) tuples. There is one rollup
+    per item, and per item_type and industry/platform of the rated content both overall and for the
+    content's owner (what /api/feedback/stats shows a user). Counts are merged first so every
+    rollup document gets a single $inc.
+    """
+    changes = [(str(item_id), item_type, variant_id, _rating_change(previous, rating))
+               for item_id, item_type, variant_id, previous, rating in changes]
+    changes = [change for change in changes if change[3]]
+    if not changes:
         return []
-    pitches = list(db.pitches.find(
-        {'user_id': ObjectId(user_id)}
-    ).sort('created_at', -1).limit(limit))
-    
-    # Convert ObjectId to string
-    for pitch in pitches:
-        pitch['_id'] = str(pitch['_id'])
-        pitch['user_id'] = str(pitch['user_id'])
     
-    return pitches
+    item_fields = _rated_item_fields(db, {(item_id, item_type) for item_id, item_type, _, _ in changes})
+    rollups = {}
+    for item_id, item_type, variant_id, change in changes:
+        fields = item_fields.get(item_id, {})
+        owner = fields.get('user_id')
+        keys = [('item_type', item_type)]
+        keys += [(scope, fields[scope]) for scope in FEEDBACK_ROLLUP_FIELDS if fields.get(scope)]
+        rollup_keys = [(f"item:{item_id}", 'item', item_id, owner)]
+        rollup_keys += [(f"{scope}:{key}", scope, key, None) for scope, key in keys]
+        if owner is not None:
+            rollup_keys += [(f"user:{owner}:{scope}:{key}", scope, key, owner) for scope, key in keys]
+        for rollup_id, scope, key, user_id in rollup_keys:
+            rollup = rollups.setdefault(rollup_id, {'scope': scope, 'key': key, 'inc': {}})
+            if user_id is not None:
+                rollup['user_id'] = user_id
+            counts = dict(change)
+            if scope == 'item':
+                rollup['item_type'] = item_type
+                if variant_id is not None:
+                    counts.update({f"variants.{variant_id}.{count}": n for count, n in change.items()})
+            for count, n in counts.items():
+                rollup['inc'][count] = rollup['inc'].get(count, 0) + n
+    
+    now = datetime.utcnow()
+    return [
+        UpdateOne(
+            {'_id': rollup_id},
+            {
+                '$inc': rollup.pop('inc'),
+                '$set': {'updated_at': now},
+                '$setOnInsert': rollup
+            },
+            upsert=True
+        )
+        for rollup_id, rollup in rollups.items()
+    ]
 
 
-def get_user_leads(user_id, limit=10):
-    """Get user's scored leads from database"""
+def update_feedback_rollups(changes):
+    """Apply rating changes to the feedback rollups with one bulk_write"""
     db = get_db()
     if db is None:
-        return []
-    leads = list(db.leads.find(
-        {'user_id': ObjectId(user_id)}
-    ).sort('created_at', -1).limit(limit))
-    
-    # Convert ObjectId to string
-    for lead in leads:
-        lead['_id'] = str(lead['_id'])
-        lead['user_id'] = str(lead['user_id'])
-    
-    return leads
+        return
+    try:
+        updates = feedback_rollup_updates(db, changes)
+        if updates:
+            db.feedback_rollups.bulk_write(updates, ordered=False)
+    except Exception as e:
+        print(f"[ERROR] Failed to update feedback rollups: {e}")
+
+
+def _rollup_counts(rollup):
+    up, down = rollup.get('up', 0), rollup.get('down', 0)
+    return {'up': up, 'down': down, 'total': up + down,
+            'down_rate': round(down / (up + down), 3) if up + down else None}
 
 
-def get_user_activity(user_id, limit=20):
-    """Get user's activity log"""
+def get_feedback_stats(user_id, scopes=FEEDBACK_ROLLUP_SCOPES):
+    """
+    Thumbs up/down on the user's content per item_type, industry and platform from the rollups,
+    most thumbs-down first
+    """
     db = get_db()
     if db is None:
-        return []
-    activities = list(db.activity_logs.find(
-        {'user_id': ObjectId(user_id)}
-    ).sort('created_at', -1).limit(limit))
+        return None
+    stats = {scope: [] for scope in scopes}
+    for rollup in db.feedback_rollups.find({'user_id': ObjectId(user_id), 'scope': {'$in': list(scopes)}}):
+        stats[rollup['scope']].append(dict(key=rollup['key'], **_rollup_counts(rollup)))
+    for rows in stats.values():
+        rows.sort(key=lambda row: (-row['down'], -row['total'], str(row['key'])))
+    return stats
+
+
+def get_item_feedback_stats(item_id):
+    """Thumbs up/down for one rated item (and per variant for multi-variant pitches), or None if unrated"""
+    db = get_db()
+    if db is None:
+        return None
+    rollup = db.feedback_rollups.find_one({'_id': f"item:{item_id}"})
+    if rollup is None:
+        return None
+    stats = dict(item_id=str(item_id), item_type=rollup.get('item_type'), user_id=rollup.get('user_id'),
+                 **_rollup_counts(rollup))
+    if rollup.get('variants'):
+        stats['variants'] = {variant_id: _rollup_counts(counts) for variant_id, counts in rollup['variants'].items()}
+    return stats
+
+
+def pitch_variant_ids(pitch_ids):
+    """Map each pitch id to the set of its A/B variant ids, with one query"""
+    db = get_db()
+    if db is None or not pitch_ids:
+        return {}
+    pitches = db.pitches.find({'_id': {'$in': [ObjectId(pitch_id) for pitch_id in set(pitch_ids)]}},
+                              {'variants.variant_id': 1})
+    return {str(pitch['_id']): {variant['variant_id'] for variant in pitch.get('variants') or []}
+            for pitch in pitches}
+
+
+# Fields of each history list in summary mode (the default for lists): what a table row shows.
+# fields=full returns whole documents; either way the version history stays on the /<id> routes
+SUMMARY_FIELDS = {
+    'campaigns': ['product', 'audience', 'platform', 'industry'],
+    'pitches': ['product', 'persona', 'industry', 'customer_type', 'budget_preference', 'language',
+                'ai_output.deal_confidence_score'],
+    'leads': ['budget', 'business_need', 'urgency', 'authority', 'industry',
+              'ai_output.lead_score', 'ai_output.lead_category'],
+    'social_posts': ['product', 'dept', 'ai_output.tagline']
+}
+
+
+def encode_cursor(document):
+    """Opaque cursor for the position just after document in (created_at, _id) descending order"""
+    position = json.dumps([document['created_at'].isoformat(), str(document['_id'])])
+    return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the (created_at, _id) position of a cursor; raises ValueError if it is not one of ours"""
+    try:
+        created_at, document_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), ObjectId(document_id)
+    except (TypeError, ValueError, InvalidId) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def _get_user_page(collection_name, user_id, limit, cursor, fields='full'):
+    """
+    One page of a user's documents, newest first, and the cursor of the next page (None on the last).
+    Keyset pagination on (created_at, _id): each page continues from the previous page's last
+    position through the (user_id, created_at, _id) index, so page N costs the same as page 1.
+    fields='summary' projects the collection's SUMMARY_FIELDS, so ai_output is neither sent
+    nor decoded.
+    """
+    db = get_db()
+    if db is None:
+        return [], None
+    
+    query = {'user_id': ObjectId(user_id)}
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query['created_at'] = {'$lte': created_at}
+        query['$or'] = [{'created_at': {'$lt': created_at}}, {'_id': {'$lt': last_id}}]
+    
+    if fields == 'summary' and collection_name in SUMMARY_FIELDS:
+        projection = dict.fromkeys(['user_id', 'created_at'] + SUMMARY_FIELDS[collection_name], 1)
+    else:
+        projection = {'versions': 0}
+    
+    # One extra document tells whether another page follows
+    documents = list(db[collection_name].find(query, projection).sort([('created_at', -1), ('_id', -1)])
+                     .limit(limit + 1))
+    next_cursor = encode_cursor(documents[limit - 1]) if len(documents) > limit else None
+    documents = documents[:limit]
     
     # Convert ObjectId to string
-    for activity in activities:
-        activity['_id'] = str(activity['_id'])
-        activity['user_id'] = str(activity['user_id'])
+    for document in documents:
+        document['_id'] = str(document['_id'])
+        document['user_id'] = str(document['user_id'])
     
-    return activities
+    return documents, next_cursor
+
+
+def get_user_campaigns(user_id, limit=10, cursor=None, fields='summary'):
+    """Get a page of the user's campaigns; returns (campaigns, next_cursor)"""
+    return _get_user_page('campaigns', user_id, limit, cursor, fields)
+
+
+def get_user_pitches(user_id, limit=10, cursor=None, fields='summary'):
+    """Get a page of the user's pitches; returns (pitches, next_cursor)"""
+    return _get_user_page('pitches', user_id, limit, cursor, fields)
+
+
+def get_user_leads(user_id, limit=10, cursor=None, fields='summary'):
+    """Get a page of the user's scored leads; returns (leads, next_cursor)"""
+    return _get_user_page('leads', user_id, limit, cursor, fields)
+
+
+def get_user_activity(user_id, limit=20, cursor=None):
+    """Get a page of the user's activity log; returns (activities, next_cursor)"""
+    # Write the user's queued events first so the page includes their latest actions; events
+    # queued after them are left to the background thread
+    activity_log_writer.flush(user_id)
+    return _get_user_page('activity_logs', user_id, limit, cursor)
 
 
 def get_campaign_by_id(campaign_id):
@@ -251,19 +672,9 @@ def get_social_post_by_id(post_id):
     return post
 
 
-def get_user_social_posts(user_id, limit=10):
-    """Get user's created posts from database"""
-    db = get_db()
-    posts = list(db.social_posts.find(
-        {'user_id': ObjectId(user_id)}
-    ).sort('created_at', -1).limit(limit))
-    
-    # Convert ObjectId to string
-    for post in posts:
-        post['_id'] = str(post['_id'])
-        post['user_id'] = str(post['user_id'])
-    
-    return posts
+def get_user_social_posts(user_id, limit=10, cursor=None, fields='summary'):
+    """Get a page of the user's created posts; returns (posts, next_cursor)"""
+    return _get_user_page('social_posts', user_id, limit, cursor, fields)
 
 
 def delete_pitch_from_db(pitch_id, user_id):
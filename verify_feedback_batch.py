@@ -0,0 +1,42 @@
+from bson import ObjectId
+
+from activity_log import activity_log_writer
+from db import get_db
+from utils import save_feedbacks_to_db
+
+# Not a real content type, so the check never touches the rollups of real content
+ITEM_TYPE = 'verify_feedback_batch'
+
+
+def test_mixed_case_item_id():
+    db = get_db()
+    if db is None:
+        print("FAIL: Database not connected")
+        return
+
+    user_id = ObjectId()
+    item_id = str(ObjectId())
+    upper_id = item_id.upper()
+    try:
+        # The same item in upper and lower case is one rating; the last one in the batch wins
+        first = save_feedbacks_to_db(user_id, [
+            {'item_id': upper_id, 'item_type': ITEM_TYPE, 'rating': 1},
+            {'item_id': item_id, 'item_type': ITEM_TYPE, 'rating': -1}
+        ])
+        # Rating it again by the uppercase id replaces the stored rating instead of conflicting
+        second = save_feedbacks_to_db(user_id, [{'item_id': upper_id, 'item_type': ITEM_TYPE, 'rating': 1}])
+
+        ratings = [doc['rating'] for doc in db.feedbacks.find({'user_id': user_id})]
+        if first == (1, 0) and second == (0, 1) and ratings == [1]:
+            print("SUCCESS: mixed-case item ids were saved as one feedback document")
+        else:
+            print(f"FAIL: batches returned {first} and {second}, stored ratings {ratings}")
+    finally:
+        db.feedbacks.delete_many({'user_id': user_id})
+        db.feedback_rollups.delete_many({'_id': {'$in': [f"item:{item_id}", f"item_type:{ITEM_TYPE}"]}})
+        activity_log_writer.flush(user_id)
+        db.activity_logs.delete_many({'user_id': user_id})
+
+
+if __name__ == "__main__":
+    test_mixed_case_item_id()
@@ -1,8 +1,9 @@
 import os
-import requests
 import json
 from dotenv import load_dotenv
 
+from http_client import provider_http
+
 load_dotenv()
 
 HF_API_KEY = os.getenv('HUGGING_FACE_API_KEY')
@@ -20,7 +21,7 @@ def test_hf_generation():
     payload = {"inputs": prompt, "options": {"wait_for_model": True}}
     
     try:
-        response = requests.post(HF_IMAGE_MODEL, headers=headers, json=payload)
+        response = provider_http.post(HF_IMAGE_MODEL, headers=headers, json=payload)
         
         if response.status_code == 200:
             print(f"SUCCESS: Image generated successfully. Buffer size: {len(response.content)} bytes")
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_client import ProviderHTTP, AsyncProviderHTTP
+
+REQUESTS = 20
+
+
+class StandInProvider(BaseHTTPRequestHandler):
+    """Local stand-in for a provider: records client ports and rate-limits the first /flaky call"""
+    protocol_version = 'HTTP/1.1'
+    client_ports = set()
+    flaky_calls = 0
+
+    def do_GET(self):
+        StandInProvider.client_ports.add(self.client_address[1])
+        status = 200
+        if self.path == '/flaky':
+            StandInProvider.flaky_calls += 1
+            if StandInProvider.flaky_calls == 1:
+                status = 429
+
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_stand_in():
+    """Serve a fresh stand-in provider on a free local port; returns (server, base_url)"""
+    StandInProvider.client_ports = set()
+    StandInProvider.flaky_calls = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInProvider)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _report(name, status_code):
+    connections = len(StandInProvider.client_ports)
+    if connections == 1:
+        print(f"SUCCESS: {name}: {REQUESTS} requests reused a single keep-alive connection")
+    else:
+        print(f"FAIL: {name}: {REQUESTS} requests opened {connections} connections")
+
+    if status_code == 200 and StandInProvider.flaky_calls == 2:
+        print(f"SUCCESS: {name}: 429 response was retried and succeeded")
+    else:
+        print(f"FAIL: {name}: /flaky returned {status_code} after {StandInProvider.flaky_calls} call(s)")
+
+
+def test_connection_reuse():
+    """ProviderHTTP, used by verify_hf.py and other blocking callers"""
+    server, base_url = _start_stand_in()
+    http = ProviderHTTP()
+    try:
+        for _ in range(REQUESTS):
+            response = http.get(f"{base_url}/text", timeout=5)
+            assert response.status_code == 200
+
+        response = http.get(f"{base_url}/flaky", timeout=5)
+        _report('ProviderHTTP', response.status_code)
+    finally:
+        http.close()
+        server.shutdown()
+
+
+async def test_async_connection_reuse():
+    """AsyncProviderHTTP, the pool the AI engine sends every provider call through"""
+    server, base_url = _start_stand_in()
+    http = AsyncProviderHTTP()
+    try:
+        for _ in range(REQUESTS):
+            response = await http.get(f"{base_url}/text", timeout=5)
+            assert response.status_code == 200
+
+        response = await http.get(f"{base_url}/flaky", timeout=5)
+        _report('AsyncProviderHTTP', response.status_code)
+    finally:
+        await http.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_connection_reuse()
+    asyncio.run(test_async_connection_reuse())